@@ -0,0 +1,14 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .sessions import cached_user
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend that resolves the signed-in user from the cache.
+
+    Loading the user for every request is the one query AuthenticationMiddleware always
+    runs; the cached copy is dropped whenever the user row is saved or deleted.
+    """
+
+    def get_user(self, user_id):
+        return cached_user(user_id, lambda: super(CachedModelBackend, self).get_user(user_id))
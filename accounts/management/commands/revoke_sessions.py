@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.sessions import revoke_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        "Sign users out everywhere: their current sessions stop being accepted on the next "
+        "request, whichever session engine (SESSION_MODE) is configured, and stored "
+        "sessions are deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help='Users whose sessions are revoked')
+        parser.add_argument('--all', action='store_true', help='Revoke the sessions of every user')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            users = list(User.objects.order_by('id'))
+        elif options['usernames']:
+            users = list(User.objects.filter(username__in=options['usernames']).order_by('id'))
+            missing = set(options['usernames']) - {u.username for u in users}
+            if missing:
+                raise CommandError(f"Unknown user(s): {', '.join(sorted(missing))}")
+        else:
+            raise CommandError('Give one or more usernames, or --all.')
+        deleted = revoke_sessions(*users)
+        for user in users:
+            self.stdout.write(f'{user.username}: sessions revoked ({deleted[user.pk]} stored session(s) deleted)')
+        self.stdout.write(self.style.SUCCESS(f'Revoked the sessions of {len(users)} user(s).'))
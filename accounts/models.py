@@ -0,0 +1,11 @@
+from django.conf import settings
+from django.db import models
+
+
+class SessionRevocation(models.Model):
+    """Sessions of ``user`` that started before ``revoked_at`` are no longer accepted."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='session_revocation')
+    revoked_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user} sessions revoked at {self.revoked_at}"
@@ -0,0 +1,124 @@
+"""Cached user resolution and session revocation.
+
+With the ``cached_db`` or ``signed_cookies`` session engines (settings.SESSION_MODE) an
+authenticated page view does not read ``django_session``; ``CachedModelBackend`` also
+serves the user row from the cache, and the role (groups, employee) comes from the session
+(cases.roles). Two things still need server-side state:
+
+* Forced revocation: ``revoke_sessions`` records a SessionRevocation for the user and
+  deletes their stored sessions (db/cached_db engines). ``SessionRevocationMiddleware``
+  logs out any request whose session started before that moment, which is the only way
+  to end a signed-cookie session before it expires.
+* Logout: the session is flushed as usual. With signed cookies a copied cookie stays
+  valid until it expires; with LOGOUT_REVOKES_SIGNED_SESSIONS logging out also revokes
+  the user's older sessions, which signs them out on every device.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY, logout
+from django.contrib.sessions.models import Session
+from django.core.cache import cache, caches
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import SessionRevocation
+
+LOGIN_AT_SESSION_KEY = '_auth_login_at'
+# Engines that keep sessions in django_session (and can therefore be listed and deleted)
+CACHED_DB_ENGINE = 'django.contrib.sessions.backends.cached_db'
+STORED_SESSION_ENGINES = ('django.contrib.sessions.backends.db', CACHED_DB_ENGINE)
+DELETE_BATCH_SIZE = 500
+
+
+def auth_cache_seconds():
+    return getattr(settings, 'AUTH_USER_CACHE_SECONDS', 300)
+
+
+def _user_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+def _revoked_key(user_id):
+    return f'accounts:sessions-revoked:{user_id}'
+
+
+def cached_user(user_id, load):
+    """Return the user with ``user_id`` from the cache, calling ``load()`` on a miss."""
+    key = _user_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = load()
+        if user is not None:
+            cache.set(key, user, auth_cache_seconds())
+    return user
+
+
+def forget_user(user_id):
+    cache.delete(_user_key(user_id))
+
+
+def revoked_before(user_id):
+    """Epoch seconds before which sessions of ``user_id`` are rejected (0 if never revoked)."""
+    key = _revoked_key(user_id)
+    value = cache.get(key)
+    if value is None:
+        revoked_at = SessionRevocation.objects.filter(user_id=user_id).values_list('revoked_at', flat=True).first()
+        value = revoked_at.timestamp() if revoked_at else 0
+        cache.set(key, value, auth_cache_seconds())
+    return value
+
+
+def delete_stored_sessions(user_ids):
+    """Delete the stored sessions of the users in ``user_ids``; returns {user id: number deleted}.
+
+    One pass over django_session decodes each session once, whatever the number of users.
+    """
+    deleted = dict.fromkeys(user_ids, 0)
+    if settings.SESSION_ENGINE not in STORED_SESSION_ENGINES or not deleted:
+        return deleted
+    wanted = {str(user_id): user_id for user_id in deleted}
+    keys = []
+    for session in Session.objects.filter(expire_date__gt=timezone.now()).iterator():
+        user_id = wanted.get(str(session.get_decoded().get(SESSION_KEY)))
+        if user_id is not None:
+            keys.append(session.session_key)
+            deleted[user_id] += 1
+    store_class = import_string(f'{settings.SESSION_ENGINE}.SessionStore')
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[start:start + DELETE_BATCH_SIZE]
+        Session.objects.filter(session_key__in=batch).delete()
+        if settings.SESSION_ENGINE == CACHED_DB_ENGINE:
+            # cached_db also keeps a copy of each session in the cache
+            caches[settings.SESSION_CACHE_ALIAS].delete_many([store_class(key).cache_key for key in batch])
+    return deleted
+
+
+def revoke_sessions(*users):
+    """End every current session of ``users``; returns {user id: stored sessions deleted}."""
+    now = timezone.now()
+    for user in users:
+        SessionRevocation.objects.update_or_create(user=user, defaults={'revoked_at': now})
+        cache.set(_revoked_key(user.pk), now.timestamp(), auth_cache_seconds())
+    return delete_stored_sessions([user.pk for user in users])
+
+
+def stamp_login(request):
+    request.session[LOGIN_AT_SESSION_KEY] = time.time()
+
+
+class SessionRevocationMiddleware:
+    """Log out requests whose session began before the user's sessions were revoked.
+
+    Place it after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = request.user
+        if user.is_authenticated:
+            if request.session.get(LOGIN_AT_SESSION_KEY, 0) < revoked_before(user.pk):
+                logout(request)
+        return self.get_response(request)
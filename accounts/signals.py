@@ -0,0 +1,33 @@
+"""Signal handlers for the accounts app (connected in AccountsConfig.ready)."""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .sessions import forget_user, revoke_sessions, stamp_login
+
+SIGNED_COOKIES_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(user_logged_in)
+def user_logged_in_stamp(sender, request, user, **kwargs):
+    stamp_login(request)
+
+
+@receiver(user_logged_out)
+def user_logged_out_revoke(sender, request, user, **kwargs):
+    # A signed cookie cannot be deleted server-side; optionally reject the older copies
+    # instead (which ends the user's sessions on every device)
+    if (
+        user is not None
+        and settings.SESSION_ENGINE == SIGNED_COOKIES_ENGINE
+        and getattr(settings, 'LOGOUT_REVOKES_SIGNED_SESSIONS', False)
+    ):
+        revoke_sessions(user)
@@ -1,3 +1,485 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth.models import Group, User
+from django.test import override_settings
+from django.utils import timezone
+
+from Bank.models import Bank
+from cases.events import latest_event_id
+from cases.models import Case, CaseType
+from cases.roles import get_role
+from cases.tests import CacheIsolatedTestCase, create_employee
+from .views import build_admin_stats, build_advocate_dashboard, build_advocate_stats
+
+
+class AdvocateStatsTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bank = Bank.objects.create(name='Test Bank')
+        cls.case_type = CaseType.objects.create(name='LAP')
+        cls.advocates = []
+        for i in range(4):
+            cls.advocates.append(create_employee(f'adv{i}', f'ADV{i}', f'Advocate {i}'))
+        statuses = ['pending', 'draft', 'query', 'positive', 'negative', 'positive_subject_tosearch', 'pending_assignment']
+        n = 0
+        for idx, adv in enumerate(cls.advocates):
+            for status in statuses[: idx + 3]:
+                Case.objects.create(
+                    applicant_name=f'Applicant {n}', case_number=f'TB-{n}', bank=cls.bank,
+                    case_type=cls.case_type, assigned_advocate=adv, status=status,
+                )
+                n += 1
+        # One completed case last updated 10 days ago (counts for 30 days only)
+        old = Case.objects.filter(assigned_advocate=cls.advocates[0], status='pending').first()
+        Case.objects.filter(pk=old.pk).update(status='positive', updated_at=timezone.now() - timedelta(days=10))
+
+    def expected_row(self, adv, today):
+        completed = ['positive', 'negative', 'positive_subject_tosearch', 'draft_positive_subject_tosearch']
+        cases = Case.objects.filter(assigned_advocate=adv)
+        done = cases.filter(status__in=completed)
+        return {
+            'advocate': adv,
+            'total_assigned': cases.count(),
+            'pending_count': cases.filter(status__in=['pending', 'draft', 'on_hold', 'on_query', 'query', 'document_pending']).count(),
+            'completed_today': done.filter(updated_at__date=today).count(),
+            'completed_yesterday': done.filter(updated_at__date=today - timedelta(days=1)).count(),
+            'completed_7days': done.filter(updated_at__date__gte=today - timedelta(days=7)).count(),
+            'completed_30days': done.filter(updated_at__date__gte=today - timedelta(days=30)).count(),
+        }
+
+    def test_matches_per_advocate_counts(self):
+        today = timezone.localdate()
+        rows = build_advocate_stats(today)
+        self.assertEqual(len(rows), len(self.advocates))
+        for row in rows:
+            self.assertEqual(row, self.expected_row(row['advocate'], today))
+        pending = [r['pending_count'] for r in rows]
+        self.assertEqual(pending, sorted(pending, reverse=True))
+
+    def test_single_query_regardless_of_advocate_count(self):
+        today = timezone.localdate()
+        with self.assertNumQueries(1):
+            build_advocate_stats(today)
+        create_employee('adv-extra', 'ADVX', 'Advocate extra')
+        with self.assertNumQueries(1):
+            build_advocate_stats(today)
+
+
+class AdminDashboardQueryCountTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        create_employee('admin', 'ADM1', 'Admin', 'admin', user=self.admin)
+        self.case_type = CaseType.objects.create(name='LAP')
+        self.client.force_login(self.admin)
+        # Cache the user and role up front so every dashboard request below costs the same
+        self.client.get('/cases/api/search/')
+
+    def add_bank_with_advocate(self, n):
+        bank = Bank.objects.create(name=f'Bank {n}')
+        adv = create_employee(f'adv{n}', f'ADV{n}', f'Advocate {n}')
+        for status in ['pending', 'positive', 'negative']:
+            Case.objects.create(
+                applicant_name=f'Applicant {n}', case_number=f'B{n}-{status}', bank=bank,
+                case_type=self.case_type, assigned_advocate=adv, status=status,
+            )
+
+    def count_dashboard_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/accounts/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_banks_and_advocates(self):
+        self.add_bank_with_advocate(1)
+        baseline = self.count_dashboard_queries()
+        for n in range(2, 7):
+            self.add_bank_with_advocate(n)
+        self.assertEqual(self.count_dashboard_queries(), baseline)
+
+    def test_global_counters(self):
+        self.add_bank_with_advocate(1)
+        stats = build_admin_stats(timezone.localdate())
+        self.assertEqual(stats['total_cases'], 3)
+        self.assertEqual(stats['assigned_cases'], 3)
+        self.assertEqual(stats['total_advocates'], 1)
+        self.assertEqual(stats['cases_today'], 3)
+        self.assertEqual(stats['completed_today'], 2)
+        self.assertEqual(stats['completed_30days'], 2)
+
+    def test_cached_render_skips_queries_until_case_data_changes(self):
+        self.add_bank_with_advocate(1)
+        cold = self.count_dashboard_queries()
+        warm = self.count_dashboard_queries()
+        self.assertLess(warm, cold)
+        self.add_bank_with_advocate(2)
+        self.assertEqual(self.count_dashboard_queries(), cold)
+        response = self.client.get('/accounts/dashboard/')
+        self.assertContains(response, 'Bank 2')
+
+    def test_cached_render_follows_bank_renames(self):
+        self.add_bank_with_advocate(1)
+        self.assertContains(self.client.get('/accounts/dashboard/'), 'Bank 1')
+        bank = Bank.objects.get(name='Bank 1')
+        bank.name = 'Renamed Bank'
+        bank.save()
+        self.assertContains(self.client.get('/accounts/dashboard/'), 'Renamed Bank')
+
+
+class AdvocateDashboardTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        bank = Bank.objects.create(name='Test Bank')
+        case_type = CaseType.objects.create(name='LAP')
+        cls.advocate = create_employee('adv', 'ADV', 'Advocate')
+        statuses = ['pending', 'draft', 'on_hold', 'document_pending', 'positive', 'negative',
+                    'positive_subject_tosearch', 'draft_positive_subject_tosearch', 'sro_document_pending']
+        for n, status in enumerate(statuses * 2):
+            parent = Case.objects.create(
+                applicant_name=f'Applicant {n}', case_number=f'TB-{n}', bank=bank,
+                case_type=case_type, assigned_advocate=cls.advocate, status=status,
+            )
+            Case.objects.create(
+                applicant_name=f'Child {n}', case_number=f'TB-{n}-C', bank=bank, case_type=case_type,
+                assigned_advocate=cls.advocate, status=status, parent_case=parent,
+            )
+        Case.objects.filter(case_number='TB-0').update(updated_at=timezone.now() - timedelta(days=3))
+
+    def test_buckets_match_per_status_querysets(self):
+        today = timezone.localdate()
+        with self.assertNumQueries(1):
+            data = build_advocate_dashboard(self.advocate, today)
+        parents = Case.objects.filter(assigned_advocate=self.advocate, parent_case__isnull=True)
+        children = Case.objects.filter(assigned_advocate=self.advocate, parent_case__isnull=False)
+        self.assertEqual(data['total_cases'], parents.count())
+        self.assertEqual(data['pending_cases'], parents.filter(status__in=['pending', 'draft']).count())
+        self.assertEqual(data['doc_pending_count'], 2)
+        self.assertEqual(len(data['hold_query_doc_cases_list']), 4)
+        self.assertEqual([c.case_number for c in data['pending_overall_list']], ['TB-0'])
+        self.assertEqual(len(data['pending_today_list']), 3)
+        for prefix, status in [('positive', 'positive'), ('negative', 'negative'),
+                               ('positive_subject', 'positive_subject_tosearch'),
+                               ('draft_positive_subject', 'draft_positive_subject_tosearch'),
+                               ('sro_document_pending', 'sro_document_pending')]:
+            self.assertEqual(
+                {c.pk for c in data[f'{prefix}_cases']}, set(parents.filter(status=status).values_list('pk', flat=True)))
+            self.assertEqual(
+                {c.pk for c in data[f'{prefix}_child_cases']}, set(children.filter(status=status).values_list('pk', flat=True)))
+            self.assertEqual(data[f'{prefix}_total'], 4)
+
+
+@override_settings(DASHBOARD_SSE_MAX_SECONDS=0)
+class DashboardEventStreamTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.bank = Bank.objects.create(name='Test Bank')
+        cls.case_type = CaseType.objects.create(name='LAP')
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        cls.advocates = []
+        for i in range(2):
+            cls.advocates.append(create_employee(f'adv{i}', f'ADV{i}', f'Advocate {i}'))
+
+    async def read_events(self, user, since):
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get('/accounts/api/events/', {'since': since})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        return [
+            json.loads(line[len('data: '):])
+            for line in body.splitlines() if line.startswith('data: {"')
+        ]
+
+    def make_changes(self):
+        since = latest_event_id()
+        case = Case.objects.create(
+            applicant_name='Applicant', case_number='TB-1', bank=self.bank,
+            case_type=self.case_type, status='pending_assignment',
+        )
+        case.assigned_advocate = self.advocates[0]
+        case.status = 'pending'
+        case.save()
+        case.applicant_name = 'Renamed'
+        case.save()
+        case.assigned_advocate = self.advocates[1]
+        case.save()
+        return since
+
+    async def test_admin_sees_every_status_change(self):
+        since = await sync_to_async(self.make_changes)()
+        events = await self.read_events(self.admin, since)
+        self.assertEqual(
+            [(e['from'], e['to'], e['assigned']) for e in events],
+            [(None, 'pending_assignment', False), ('pending_assignment', 'pending', True), ('pending', 'pending', True)],
+        )
+
+    async def test_advocate_sees_only_own_side_of_changes(self):
+        since = await sync_to_async(self.make_changes)()
+        first = await self.read_events(self.advocates[0].user, since)
+        self.assertEqual([(e['from'], e['to'], e['assigned']) for e in first], [(None, 'pending', True), ('pending', None, False)])
+        second = await self.read_events(self.advocates[1].user, since)
+        self.assertEqual([(e['from'], e['to'], e['assigned']) for e in second], [(None, 'pending', True)])
+
+
+class DashboardTrendsTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def test_rejects_bad_parameters(self):
+        for params, error in [
+            ({'start': '2025-13-01'}, 'dates must be YYYY-MM-DD'),
+            ({'end': 'today'}, 'dates must be YYYY-MM-DD'),
+            ({'start': '2025-02-01', 'end': '2025-01-31'}, 'start must not be after end'),
+            ({'start': '2000-01-01', 'end': '2025-01-01'}, 'range too large (max 3660 days)'),
+            ({'bank': 'sbi'}, 'invalid bank'),
+        ]:
+            response = self.client.get('/accounts/api/trends/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertEqual(response.json(), {'ok': False, 'error': error})
+
+    def test_serves_a_point_per_day(self):
+        response = self.client.get('/accounts/api/trends/', {'start': '2025-01-01', 'end': '2025-01-03'}).json()
+        self.assertTrue(response['ok'])
+        self.assertEqual([point['date'] for point in response['series']], ['2025-01-01', '2025-01-02', '2025-01-03'])
+        self.assertEqual(response['series'][0]['new_cases_by_current_status'], {})
+
+
+class KeysetPaginationTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        cls.bank = Bank.objects.create(name='Test Bank')
+        case_type = CaseType.objects.create(name='LAP')
+        for n in range(60):
+            Case.objects.create(
+                applicant_name=f'Applicant {n}', case_number=f'KS-{n:03d}', bank=cls.bank,
+                case_type=case_type, status='pending',
+            )
+        # Many rows sharing one timestamp must still page without gaps or repeats
+        Case.objects.filter(case_number__lt='KS-030').update(updated_at=timezone.now())
+
+    def test_walks_every_case_once_in_both_directions(self):
+        self.client.force_login(self.admin)
+        url = f'/accounts/cases-by-bank/{self.bank.id}/'
+        response = self.client.get(url, {'per_page': 25})
+        pages = [list(response.context['page'])]
+        while response.context['page'].has_next:
+            response = self.client.get(f"{url}?{response.context['page'].next_query}")
+            pages.append(list(response.context['page']))
+        seen = [case.pk for page in pages for case in page]
+        self.assertEqual([len(page) for page in pages], [25, 25, 10])
+        self.assertEqual(sorted(seen), sorted(Case.objects.values_list('pk', flat=True)))
+        self.assertEqual(response.context['total_count'], 60)
+
+        response = self.client.get(f"{url}?{response.context['page'].previous_query}")
+        self.assertEqual(list(response.context['page']), pages[1])
+
+    def test_view_cases_groups_the_page_by_status(self):
+        self.client.force_login(self.admin)
+        Case.objects.filter(case_number__gte='KS-050').update(status='query')
+        response = self.client.get('/cases/view-cases/', {'per_page': 25})
+        buckets = response.context['case_buckets']
+        page = list(response.context['page'])
+        self.assertEqual(buckets['query'], [c for c in page if c.status == 'query'])
+        self.assertEqual(buckets['pending'], [c for c in page if c.status == 'pending'])
+        self.assertEqual(len(buckets['query']) + len(buckets['pending']), 25)
+        self.assertContains(response, 'No quotation cases')
+
+    def test_view_cases_trays_are_paged_on_their_own_cursors(self):
+        advocate = create_employee('tray-adv', 'TADV', 'Tray Advocate')
+        Case.objects.update(assigned_advocate=advocate)
+        Case.objects.filter(case_number__gte='KS-057').update(status='sro_document_pending')
+        Case.objects.filter(case_number__lt='KS-030').update(updated_at=timezone.now() - timedelta(days=2))
+        self.client.force_login(advocate.user)
+        response = self.client.get('/cases/view-cases/', {'per_page': 25})
+        today, overall = response.context['pending_today'], response.context['pending_overall']
+        self.assertEqual((len(today), len(overall), response.context['pending_total']), (25, 25, 60))
+        self.assertEqual(len(response.context['sro_document_pending_list']), 3)
+        response = self.client.get(f"/cases/view-cases/?{overall.next_query}")
+        self.assertEqual(len(response.context['pending_overall']), 5)
+        self.assertEqual(list(response.context['pending_today']), list(today))
+
+        self.client.force_login(self.admin)
+        response = self.client.get('/cases/view-cases/', {'per_page': 25})
+        self.assertEqual(response.context['sro_document_pending_list'], response.context['case_buckets']['sro_document_pending'])
+
+    def test_list_pages_annotate_child_counts(self):
+        self.client.force_login(self.admin)
+        parent = Case.objects.get(case_number='KS-059')
+        for n in range(2):
+            Case.objects.create(
+                applicant_name=f'Child {n}', case_number=f'KS-059-{n}', bank=self.bank,
+                case_type=parent.case_type, parent_case=parent, status='pending',
+            )
+        url = f'/accounts/cases-by-bank/{self.bank.id}/'
+        self.client.get(url)  # caches the user and the role
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {'per_page': 25})
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {'per_page': 100})
+        counts = {case.case_number: case.child_count for case in response.context['page']}
+        self.assertEqual(counts['KS-059'], 2)
+        self.assertEqual(counts['KS-000'], 0)
+
+    def test_case_grid_walks_both_sort_directions(self):
+        self.client.force_login(self.admin)
+        for sort in ('-updated_at', 'updated_at'):
+            params = {'sort': sort, 'per_page': 25, 'fields': 'id,case_number'}
+            response = self.client.get('/cases/api/cases/grid/', params).json()
+            pages = [response['results']]
+            while response['has_next']:
+                response = self.client.get('/cases/api/cases/grid/', {**params, 'after': response['next_cursor']}).json()
+                pages.append(response['results'])
+            self.assertEqual([len(page) for page in pages], [25, 25, 10])
+            self.assertEqual(set(pages[0][0]), {'id', 'case_number'})
+            seen = [row['id'] for page in pages for row in page]
+            expected = Case.objects.order_by(sort, 'id' if sort[0] != '-' else '-id')
+            self.assertEqual(seen, list(expected.values_list('id', flat=True)))
+            response = self.client.get('/cases/api/cases/grid/', {**params, 'before': response['previous_cursor']}).json()
+            self.assertEqual(response['results'], pages[1])
+
+    def test_case_grid_filters_and_scopes_to_the_advocate(self):
+        advocate = create_employee('grid-adv', 'GADV', 'Grid Advocate')
+        user = advocate.user
+        parent = Case.objects.get(case_number='KS-010')
+        Case.objects.filter(pk=parent.pk).update(assigned_advocate=advocate, status='query')
+        child = Case.objects.create(
+            applicant_name='Grid Child', case_number='KS-010-1', bank=self.bank,
+            case_type=parent.case_type, parent_case=parent, status='query',
+        )
+        self.client.force_login(user)
+        rows = self.client.get('/cases/api/cases/grid/').json()['results']
+        self.assertEqual(sorted(row['id'] for row in rows), sorted([parent.pk, child.pk]))
+        rows = self.client.get('/cases/api/cases/grid/', {'kind': 'child', 'status': 'query'}).json()['results']
+        self.assertEqual([row['parent_id'] for row in rows], [parent.pk])
+
+        self.client.force_login(self.admin)
+        rows = self.client.get('/cases/api/cases/grid/', {'advocate': advocate.pk, 'fields': 'case_number,child_count'}).json()['results']
+        self.assertEqual(rows, [{'case_number': 'KS-010', 'child_count': 1}])
+        self.assertEqual(self.client.get('/cases/api/cases/grid/', {'advocate': 'none', 'status': 'query'}).json()['results'][0]['id'], child.pk)
+        today = timezone.localdate().isoformat()
+        self.assertEqual(len(self.client.get('/cases/api/cases/grid/', {'from': today, 'to': today, 'per_page': 100}).json()['results']), 61)
+        for params in ({'sort': 'applicant_name'}, {'fields': 'mobile'}, {'status': 'bogus'}, {'from': 'yesterday'}):
+            response = self.client.get('/cases/api/cases/grid/', params)
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(response.json()['ok'])
+
+
+class RequestRoleTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.employee = create_employee('role-adv', 'RADV', 'Role Advocate')
+        self.user = self.employee.user
+        self.client.force_login(self.user)
+
+    def role_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        lookups = ('FROM "auth_group"', '"cases_employee"."user_id" =')
+        return response, [q['sql'] for q in ctx.captured_queries if any(t in q['sql'] for t in lookups)]
+
+    def test_role_is_resolved_once_and_kept_in_the_session(self):
+        response, queries = self.role_queries('/cases/view-cases/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 2)  # the group check and the Employee row, once
+        response, queries = self.role_queries('/cases/view-cases/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+    def test_group_and_employee_changes_reach_the_next_request(self):
+        url = '/accounts/cases-by-status/pending/'
+        self.assertEqual(self.client.get(url).status_code, 302)
+        group, _ = Group.objects.get_or_create(name='CO-ADMIN')
+        self.user.groups.add(group)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.user.groups.remove(group)
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.assertEqual(self.client.get('/cases/view-cases/').status_code, 200)
+        self.employee.employee_type = 'sro'
+        self.employee.save()
+        self.assertEqual(self.client.get('/cases/view-cases/').status_code, 302)
+
+    def test_detail_views_are_scoped_like_the_case_list(self):
+        bank = Bank.objects.create(name='Scope Bank')
+        case_type = CaseType.objects.create(name='LAP')
+        other = create_employee('other-adv', 'OADV', 'Other Advocate')
+
+        def make(number, advocate, parent=None):
+            return Case.objects.create(
+                applicant_name=number, case_number=number, bank=bank, case_type=case_type,
+                assigned_advocate=advocate, parent_case=parent, status='pending',
+            )
+        own = make('OWN-1', self.employee)
+        child = make('OWN-1-A', other, parent=own)
+        foreign = make('FOREIGN-1', other)
+        listed = {c.pk for c in self.client.get('/cases/view-cases/').context['cases']}
+        self.assertEqual(listed, {own.pk, child.pk})
+        for case in (own, child, foreign):
+            status = self.client.get(f'/cases/case-detail/{case.pk}/').status_code
+            self.assertEqual(status, 200 if case.pk in listed else 404)
+        self.assertEqual(self.client.get(f'/cases/case-add-work/{foreign.pk}/').status_code, 404)
+        self.assertEqual(set(Case.objects.visible_to(get_role(self.user)).values_list('pk', flat=True)), listed)
+
+
+class SessionModeTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def test_navigation_stays_off_the_session_and_user_tables(self):
+        self.client.force_login(self.admin)
+        self.client.get('/cases/view-cases/')
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get('/cases/view-cases/').status_code, 200)
+        tables = [q['sql'] for q in ctx.captured_queries if '"django_session"' in q['sql'] or 'FROM "auth_user"' in q['sql']]
+        self.assertEqual(tables, [])
+
+    def test_sessions_from_the_plain_model_backend_stay_signed_in(self):
+        self.client.force_login(self.admin, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.client.get('/cases/view-cases/').status_code, 200)
+
+    def test_revoked_sessions_are_signed_out(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.test import Client
+        other = Client()
+        self.client.force_login(self.admin)
+        other.force_login(self.admin)
+        self.assertEqual(self.client.get('/cases/view-cases/').status_code, 200)
+        call_command('revoke_sessions', 'admin', stdout=StringIO())
+        for client in (self.client, other):
+            self.assertRedirects(client.get('/cases/view-cases/'), '/accounts/login/', fetch_redirect_response=False)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get('/cases/view-cases/').status_code, 200)
+
+    def _copied_cookie_client(self):
+        from django.conf import settings
+        from django.test import Client
+        self.client.force_login(self.admin)
+        copy = Client()
+        copy.cookies[settings.SESSION_COOKIE_NAME] = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+        self.assertEqual(copy.get('/cases/view-cases/').status_code, 200)
+        return copy
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_signed_cookie_logout_is_per_device_by_default(self):
+        copy = self._copied_cookie_client()
+        self.client.post('/accounts/logout/')
+        self.assertEqual(copy.get('/cases/view-cases/').status_code, 200)
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies', LOGOUT_REVOKES_SIGNED_SESSIONS=True,
+    )
+    def test_signed_cookie_logout_rejects_copied_cookies_when_enabled(self):
+        copy = self._copied_cookie_client()
+        self.client.post('/accounts/logout/')
+        self.assertRedirects(copy.get('/cases/view-cases/'), '/accounts/login/', fetch_redirect_response=False)
@@ -14,4 +14,6 @@ urlpatterns = [
     path("cases-by-advocate/<int:advocate_id>/", views.cases_by_advocate, name="cases_by_advocate"),
     path("cases-by-bank/<int:bank_id>/", views.cases_by_bank, name="cases_by_bank"),
     path("generate-mis/", views.generate_mis, name="generate_mis"),
+    path("api/trends/", views.dashboard_trends, name="dashboard_trends"),
+    path("api/events/", views.dashboard_events, name="dashboard_events"),
 ]
@@ -1,79 +1,231 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.http import HttpResponse
-from cases.models import Employee, Case
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from asgiref.sync import sync_to_async
+from cases.models import Employee, Case, CaseDailyStat
 from django.utils import timezone
 from django.db.models import Q, Count
+from django.utils.functional import SimpleLazyObject
+from cases.caching import case_data_generation, dashboard_cache_context, lazy_context
+from cases.events import events_since, is_feed_gap, latest_event_id
+from cases.pagination import keyset_paginate
+from cases.queries import SRO_DASHBOARD_KEYS, case_list, split_sro_cases, sro_eligible_cases
+from cases.roles import get_role
+from cases.search import case_search_q
+from datetime import datetime, timedelta
+import asyncio
 import csv
+import json
 
 
-def build_admin_stats():
-    """Utility to gather high level admin statistics for dashboard and statistics page."""
+ADVOCATE_PENDING_STATUSES = ['pending', 'draft', 'on_hold', 'on_query', 'query', 'document_pending']
+COMPLETED_STATUSES = ['positive', 'negative', 'positive_subject_tosearch', 'draft_positive_subject_tosearch']
+
+
+def build_admin_stats(today=None):
+    """Utility to gather high level admin statistics for dashboard and statistics page.
+
+    All case counters come from one aggregate() call. When ``today`` is given the
+    created/completed time-window counters (today, yesterday, 7 and 30 days) are folded
+    into the same query.
+    """
     from cases.models import Case, Employee
-    total_cases = Case.objects.count()
-    pending_cases = Case.objects.filter(status__in=['pending_assignment', 'document_pending']).count()
-    assigned_cases = Case.objects.filter(assigned_advocate__isnull=False).count()
-    total_advocates = Employee.objects.filter(employee_type='advocate', is_active=True).count()
-    return {
-        'total_cases': total_cases,
-        'pending_cases': pending_cases,
-        'assigned_cases': assigned_cases,
-        'total_advocates': total_advocates,
+    counters = {
+        'total_cases': Count('id'),
+        'pending_cases': Count('id', filter=Q(status__in=['pending_assignment', 'document_pending'])),
+        'assigned_cases': Count('id', filter=Q(assigned_advocate__isnull=False)),
     }
+    if today is not None:
+        yesterday = today - timedelta(days=1)
+        last_7_days = today - timedelta(days=7)
+        last_30_days = today - timedelta(days=30)
+        completed = Q(status__in=COMPLETED_STATUSES)
+        counters.update({
+            'cases_today': Count('id', filter=Q(created_at__date=today)),
+            'cases_yesterday': Count('id', filter=Q(created_at__date=yesterday)),
+            'cases_7days': Count('id', filter=Q(created_at__date__gte=last_7_days)),
+            'cases_30days': Count('id', filter=Q(created_at__date__gte=last_30_days)),
+            'completed_today': Count('id', filter=completed & Q(updated_at__date=today)),
+            'completed_yesterday': Count('id', filter=completed & Q(updated_at__date=yesterday)),
+            'completed_7days': Count('id', filter=completed & Q(updated_at__date__gte=last_7_days)),
+            'completed_30days': Count('id', filter=completed & Q(updated_at__date__gte=last_30_days)),
+        })
+    stats = Case.objects.aggregate(**counters)
+    stats['total_advocates'] = Employee.objects.filter(employee_type='advocate', is_active=True).count()
+    return stats
+
+
+def build_bank_stats():
+    """Per-bank case breakdown for the admin dashboard in one grouped query (banks with cases only)."""
+    from Bank.models import Bank
+    banks = Bank.objects.annotate(
+        total_cases=Count('cases'),
+        active_cases=Count('cases', filter=Q(cases__status__in=['pending','draft','on_hold','on_query','query','document_pending','pending_assignment'])),
+        completed_cases=Count('cases', filter=Q(cases__status__in=['positive','negative','positive_subject_tosearch'])),
+        positive_cases=Count('cases', filter=Q(cases__status='positive')),
+        negative_cases=Count('cases', filter=Q(cases__status='negative')),
+        pss_cases=Count('cases', filter=Q(cases__status='positive_subject_tosearch')),
+    ).filter(total_cases__gt=0).order_by('-total_cases', 'id')
+    return [
+        {
+            'bank': bank,
+            'total_cases': bank.total_cases,
+            'active_cases': bank.active_cases,
+            'completed_cases': bank.completed_cases,
+            'positive_cases': bank.positive_cases,
+            'negative_cases': bank.negative_cases,
+            'pss_cases': bank.pss_cases,
+        }
+        for bank in banks
+    ]
+
+
+def build_advocate_stats(today):
+    """Per-advocate workload rows for the admin dashboard, computed in a single query.
+
+    Each row is a dict with the advocate plus total_assigned, pending_count and completed
+    counts for today, yesterday, the last 7 and the last 30 days; busiest advocates first.
+    """
+    yesterday = today - timedelta(days=1)
+    completed = Q(assigned_cases__status__in=COMPLETED_STATUSES)
+    advocates = Employee.objects.filter(employee_type='advocate', is_active=True).annotate(
+        total_assigned=Count('assigned_cases'),
+        pending_count=Count('assigned_cases', filter=Q(assigned_cases__status__in=ADVOCATE_PENDING_STATUSES)),
+        completed_today=Count('assigned_cases', filter=completed & Q(assigned_cases__updated_at__date=today)),
+        completed_yesterday=Count('assigned_cases', filter=completed & Q(assigned_cases__updated_at__date=yesterday)),
+        completed_7days=Count('assigned_cases', filter=completed & Q(assigned_cases__updated_at__date__gte=today - timedelta(days=7))),
+        completed_30days=Count('assigned_cases', filter=completed & Q(assigned_cases__updated_at__date__gte=today - timedelta(days=30))),
+    ).order_by('-pending_count', 'id')
+    return [
+        {
+            'advocate': adv,
+            'total_assigned': adv.total_assigned,
+            'pending_count': adv.pending_count,
+            'completed_today': adv.completed_today,
+            'completed_yesterday': adv.completed_yesterday,
+            'completed_7days': adv.completed_7days,
+            'completed_30days': adv.completed_30days,
+        }
+        for adv in advocates
+    ]
+
+
+ADVOCATE_DASHBOARD_FIELDS = (
+    'id', 'case_number', 'applicant_name', 'legal_reference_number', 'status', 'property_address',
+    'parent_case_id', 'assigned_advocate_id', 'updated_at', 'completed_at',
+    'bank__name', 'case_type__name',
+)
+# (context key, status) pairs bucketed separately for parent and child cases
+ADVOCATE_COMPLETED_BUCKETS = [
+    ('positive', 'positive'),
+    ('positive_subject', 'positive_subject_tosearch'),
+    ('draft_positive_subject', 'draft_positive_subject_tosearch'),
+    ('negative', 'negative'),
+    ('sro_document_pending', 'sro_document_pending'),
+]
+
+
+ADVOCATE_DASHBOARD_KEYS = (
+    'total_cases', 'active_cases', 'pending_cases', 'completed_cases', 'doc_pending_count',
+    'hold_query_doc_cases_list', 'pending_today_list', 'pending_overall_list',
+) + tuple(
+    f'{prefix}_{suffix}'
+    for prefix, _status in ADVOCATE_COMPLETED_BUCKETS
+    for suffix in ('cases', 'child_cases', 'total')
+)
+
+
+def build_advocate_dashboard(employee, today):
+    """Lists and counters for the advocate dashboard from a single projected query.
+
+    Every case assigned to ``employee`` is fetched once (newest update first) and dropped
+    into its buckets in one pass. Completed buckets are re-sorted newest completion first,
+    SRO document pending keeps the updated_at order.
+    """
+    cases = (
+        Case.objects.filter(assigned_advocate=employee)
+        .select_related('bank', 'case_type')
+        .only(*ADVOCATE_DASHBOARD_FIELDS)
+        .order_by('-updated_at')
+    )
+    status_keys = {status: key for key, status in ADVOCATE_COMPLETED_BUCKETS}
+    buckets = {}
+    for key, _status in ADVOCATE_COMPLETED_BUCKETS:
+        buckets[f'{key}_cases'] = []
+        buckets[f'{key}_child_cases'] = []
+    pending_today, pending_overall, hold_query_doc = [], [], []
+    total = active = completed = doc_pending = 0
+
+    for case in cases:
+        status = case.status
+        key = status_keys.get(status)
+        if case.parent_case_id is not None:
+            if key:
+                buckets[f'{key}_child_cases'].append(case)
+            continue
+        total += 1
+        if key:
+            buckets[f'{key}_cases'].append(case)
+        if status in ('draft', 'on_hold', 'on_query', 'query'):
+            active += 1
+        if status in ('positive', 'negative', 'positive_subject_tosearch'):
+            completed += 1
+        if status == 'document_pending':
+            doc_pending += 1
+        if status in ('on_hold', 'on_query', 'query', 'document_pending'):
+            hold_query_doc.append(case)
+        if status in ('pending', 'draft'):
+            if timezone.localtime(case.updated_at).date() == today:
+                pending_today.append(case)
+            else:
+                pending_overall.append(case)
+
+    def newest_completed(case):
+        return (case.completed_at is not None, case.completed_at)
+
+    for key, status in ADVOCATE_COMPLETED_BUCKETS:
+        if status != 'sro_document_pending':
+            buckets[f'{key}_cases'].sort(key=newest_completed, reverse=True)
+            buckets[f'{key}_child_cases'].sort(key=newest_completed, reverse=True)
+        buckets[f'{key}_total'] = len(buckets[f'{key}_cases']) + len(buckets[f'{key}_child_cases'])
+
+    buckets.update({
+        'total_cases': total,
+        'active_cases': active,
+        'pending_cases': len(pending_today) + len(pending_overall),
+        'completed_cases': completed,
+        'doc_pending_count': doc_pending,
+        'hold_query_doc_cases_list': hold_query_doc,
+        'pending_today_list': pending_today,
+        'pending_overall_list': pending_overall,
+    })
+    return buckets
+
 
 @login_required
 def dashboard(request):
     user = request.user
     
     
-    is_admin = user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists() or user.is_superuser
+    is_admin = request.role.is_admin
     
 
     try:
-        employee = Employee.objects.get(user=user)
+        employee = request.role.employee
+        if employee is None:
+            raise Employee.DoesNotExist
         employee_id = employee.employee_id
         employee_type = employee.employee_type
         employee_name = employee.name
         
         
         if employee_type == 'advocate' and not is_admin:
-            # Filter out child cases - only show parent cases
+            # Only parent cases are listed in the main trays; children have their own lists
             assigned_cases = Case.objects.filter(assigned_advocate=employee, parent_case__isnull=True).order_by('-updated_at')
-            # Separate child cases for independent trays
-            assigned_child_cases = Case.objects.filter(assigned_advocate=employee, parent_case__isnull=False).order_by('-updated_at')
-            total_cases = assigned_cases.count()
-            active_cases = assigned_cases.filter(status__in=['draft','on_hold', 'on_query', 'query']).count()
-            pending_cases_qs = assigned_cases.filter(status__in=['pending','draft'])
-            pending_cases = pending_cases_qs.count()
-            completed_cases = assigned_cases.filter(status__in=['positive', 'negative','positive_subject_tosearch']).count()
-            doc_pending_count = assigned_cases.filter(status='document_pending').count()
-
-            # Split pending into today vs overall (based on updated_at date)
             today = timezone.localdate()
-            pending_today_list = pending_cases_qs.filter(updated_at__date=today)
-            pending_overall_list = pending_cases_qs.exclude(id__in=pending_today_list.values('id'))
-
-            # Completed cases categorized - only parent cases
-            positive_cases = assigned_cases.filter(status='positive').order_by('-completed_at')
-            positive_child_cases = assigned_child_cases.filter(status='positive').order_by('-completed_at')
-            positive_subject_cases = assigned_cases.filter(status='positive_subject_tosearch').order_by('-completed_at')
-            positive_subject_child_cases = assigned_child_cases.filter(status='positive_subject_tosearch').order_by('-completed_at')
-            draft_positive_subject_cases = assigned_cases.filter(status='draft_positive_subject_tosearch').order_by('-completed_at')
-            draft_positive_subject_child_cases = assigned_child_cases.filter(status='draft_positive_subject_tosearch').order_by('-completed_at')
-            negative_cases = assigned_cases.filter(status='negative').order_by('-completed_at')
-            negative_child_cases = assigned_child_cases.filter(status='negative').order_by('-completed_at')
-            
-            # SRO document pending cases - only parent cases
-            sro_document_pending_cases = assigned_cases.filter(status='sro_document_pending').order_by('-updated_at')
-            sro_document_pending_child_cases = assigned_child_cases.filter(status='sro_document_pending').order_by('-updated_at')
-            sro_document_pending_total = sro_document_pending_cases.count() + sro_document_pending_child_cases.count()
-            
-            # Compute totals for completed categories (parent + child)
-            positive_total = positive_cases.count() + positive_child_cases.count()
-            positive_subject_total = positive_subject_cases.count() + positive_subject_child_cases.count()
-            draft_positive_subject_total = draft_positive_subject_cases.count() + draft_positive_subject_child_cases.count()
-            negative_total = negative_cases.count() + negative_child_cases.count()
 
             # Completed search (do not show full list by default)
             completed_search = (request.GET.get('completed_search') or '').strip()
@@ -81,13 +233,9 @@ def dashboard(request):
             if completed_search:
                 # Filter to only parent cases in search results too
                 completed_results = assigned_cases.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch']).filter(
-                    Q(applicant_name__icontains=completed_search) |
-                    Q(case_number__icontains=completed_search) |
-                    Q(legal_reference_number__icontains=completed_search)
+                    case_search_q(completed_search)
                 ).order_by('-updated_at')
 
-            hold_query_doc_cases_list = assigned_cases.filter(status__in=['on_hold', 'on_query', 'query', 'document_pending'])
-
             context =  {
                 "username": user.username,
                 "employee_id": employee_id,
@@ -95,36 +243,14 @@ def dashboard(request):
                 "employee_type": employee_type,
                 "employee": employee,
                 "assigned_cases": assigned_cases,
-                "assigned_child_cases": assigned_child_cases,
-                "total_cases": total_cases,
-                "active_cases": active_cases,
-                "pending_cases": pending_cases,
-                "completed_cases": completed_cases,
-                "doc_pending_count": doc_pending_count,
-                # Counters
-                "pending_cases_list": pending_cases_qs,  # kept for header count
-                "hold_query_doc_cases_list": hold_query_doc_cases_list,
-                # New advocate-specific context
-                "pending_today_list": pending_today_list,
-                "pending_overall_list": pending_overall_list,
                 "completed_search_query": completed_search,
                 "completed_results": completed_results,
-                # Completed categories
-                "positive_cases": positive_cases,
-                "positive_child_cases": positive_child_cases,
-                "positive_total": positive_total,
-                "positive_subject_cases": positive_subject_cases,
-                "positive_subject_child_cases": positive_subject_child_cases,
-                "positive_subject_total": positive_subject_total,
-                "draft_positive_subject_cases": draft_positive_subject_cases,
-                "draft_positive_subject_child_cases": draft_positive_subject_child_cases,
-                "draft_positive_subject_total": draft_positive_subject_total,
-                "negative_cases": negative_cases,
-                "negative_child_cases": negative_child_cases,
-                "negative_total": negative_total,
-                "sro_document_pending_cases": sro_document_pending_cases,
-                "sro_document_pending_child_cases": sro_document_pending_child_cases,
-                "sro_document_pending_total": sro_document_pending_total,
+                "today": today,
+                # All lists and counters come from one bucketed query, run only when the
+                # cached dashboard fragment has to be rendered
+                **lazy_context(lambda: build_advocate_dashboard(employee, today), ADVOCATE_DASHBOARD_KEYS),
+                **dashboard_cache_context('advocate'),
+                "case_event_seq": latest_event_id(),
             }
             return render(request, "accounts/employee_dashboard.html", context)
 
@@ -132,22 +258,11 @@ def dashboard(request):
         if employee_type == 'sro' and not is_admin:
             # Get search query from request
             search_query = request.GET.get('search', '').strip()
-            eligible_statuses = ['positive_subject_tosearch', 'negative', 'positive']
             # Independent listing (parents and children). Include PSTS automatically or explicitly forwarded cases.
-            sro_cases = Case.objects.filter(
-                Q(forwarded_to_sro=True) | Q(status='positive_subject_tosearch'),
-                status__in=eligible_statuses
-            ).order_by('-created_at')  # Newest cases first
+            sro_cases = sro_eligible_cases().order_by('-created_at')  # Newest cases first
             # Apply search filter if provided
             if search_query:
-                sro_cases = sro_cases.filter(
-                    Q(applicant_name__icontains=search_query) |
-                    Q(case_number__icontains=search_query) |
-                    Q(legal_reference_number__icontains=search_query)
-                ).distinct()
-            sro_pss_cases = sro_cases.filter(status='positive_subject_tosearch')
-            sro_negative_cases = sro_cases.filter(status='negative')
-            sro_positive_cases = sro_cases.filter(status='positive')
+                sro_cases = sro_cases.filter(case_search_q(search_query))
             
             context = {
                 "username": user.username,
@@ -157,26 +272,24 @@ def dashboard(request):
                 "employee": employee,
                 "is_admin": False,
                 "is_sro": True,
-                "sro_all_cases": sro_cases,
-                "sro_total_cases": sro_cases.count(),
-                "sro_pss_count": sro_pss_cases.count(),
-                "sro_negative_count": sro_negative_cases.count(),
-                "sro_positive_count": sro_positive_cases.count(),
-                "sro_pss_cases": sro_pss_cases,
-                "sro_negative_cases": sro_negative_cases,
-                "sro_positive_cases": sro_positive_cases,
+                **lazy_context(lambda: split_sro_cases(sro_cases), SRO_DASHBOARD_KEYS),
                 "search_query": search_query,
+                **dashboard_cache_context('sro'),
             }
             return render(request, "accounts/sro_dashboard.html", context)
 
-        # Admin dashboard with full statistics
-        from Bank.models import Bank
-        from datetime import timedelta
-        stats = build_admin_stats()
+        # Admin dashboard with full statistics. The heavy sections are wrapped in
+        # {% cache %} blocks keyed by the case data generation, so everything below is
+        # lazy and only queried when a fragment actually has to be re-rendered.
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+        stats = SimpleLazyObject(lambda: build_admin_stats(today))
         
         # Status cards for admin dashboard - all cases (parent and children)
-        status_counts = Case.objects.values('status').annotate(count=Count('id')).order_by()
-        status_dict = {row['status']: row['count'] for row in status_counts}
+        status_dict = SimpleLazyObject(lambda: {
+            row['status']: row['count']
+            for row in Case.objects.values('status').annotate(count=Count('id')).order_by()
+        })
         
         active_cards_def = [
             ('draft','Draft'),
@@ -193,68 +306,24 @@ def dashboard(request):
             ('positive','Positive'),
             ('negative','Negative'),
         ]
-        status_cards_active = [
+        status_cards_active = SimpleLazyObject(lambda: [
             {'key': k, 'label': lbl, 'count': status_dict.get(k, 0)}
             for (k, lbl) in active_cards_def
-        ]
-        status_cards_completed = [
+        ])
+        status_cards_completed = SimpleLazyObject(lambda: [
             {'key': k, 'label': lbl, 'count': status_dict.get(k, 0)}
             for (k, lbl) in completed_cards_def
-        ]
-        
-        # Advocate stats - only parent cases
-        today = timezone.localdate()
-        yesterday = today - timedelta(days=1)
-        last_7_days = today - timedelta(days=7)
-        last_30_days = today - timedelta(days=30)
+        ])
         
-        advocates = Employee.objects.filter(employee_type='advocate', is_active=True)
-        advocate_stats = []
-        for adv in advocates:
-            parent_cases = Case.objects.filter(assigned_advocate=adv)
-            advocate_stats.append({
-                'advocate': adv,
-                'total_assigned': parent_cases.count(),
-                'pending_count': parent_cases.filter(status__in=['pending','draft','on_hold','on_query','query','document_pending']).count(),
-                'completed_today': parent_cases.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch'], updated_at__date=today).count(),
-                'completed_yesterday': parent_cases.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch'], updated_at__date=yesterday).count(),
-                'completed_7days': parent_cases.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch'], updated_at__date__gte=last_7_days).count(),
-                'completed_30days': parent_cases.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch'], updated_at__date__gte=last_30_days).count(),
-            })
-        advocate_stats.sort(key=lambda x: x['pending_count'], reverse=True)
+        # Advocate stats
+        advocate_stats = SimpleLazyObject(lambda: build_advocate_stats(today))
         
-        # Bank stats - only parent cases
-        banks = Bank.objects.all()
-        bank_stats = []
-        for bank in banks:
-            parent_cases = Case.objects.filter(bank=bank)
-            total = parent_cases.count()
-            if total > 0:
-                bank_stats.append({
-                    'bank': bank,
-                    'total_cases': total,
-                    'active_cases': parent_cases.filter(status__in=['pending','draft','on_hold','on_query','query','document_pending','pending_assignment']).count(),
-                    'completed_cases': parent_cases.filter(status__in=['positive','negative','positive_subject_tosearch']).count(),
-                    'positive_cases': parent_cases.filter(status='positive').count(),
-                    'negative_cases': parent_cases.filter(status='negative').count(),
-                    'pss_cases': parent_cases.filter(status='positive_subject_tosearch').count(),
-                })
-        bank_stats.sort(key=lambda x: x['total_cases'], reverse=True)
+        # Bank stats
+        bank_stats = SimpleLazyObject(build_bank_stats)
         
         # Recent activity - only parent cases
         recent_completed = Case.objects.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch']).order_by('-updated_at')[:10]
-        recent_assigned = Case.objects.filter(assigned_advocate__isnull=False).exclude(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch']).order_by('-updated_at')[:10]
-        
-        # Time-based stats - only parent cases
-        cases_today = Case.objects.filter(created_at__date=today).count()
-        cases_yesterday = Case.objects.filter(created_at__date=yesterday).count()
-        cases_7days = Case.objects.filter(created_at__date__gte=last_7_days).count()
-        cases_30days = Case.objects.filter(created_at__date__gte=last_30_days).count()
-        
-        completed_today = Case.objects.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch'], updated_at__date=today).count()
-        completed_yesterday = Case.objects.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch'], updated_at__date=yesterday).count()
-        completed_7days = Case.objects.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch'], updated_at__date__gte=last_7_days).count()
-        completed_30days = Case.objects.filter(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch'], updated_at__date__gte=last_30_days).count()
+        recent_assigned = Case.objects.select_related('assigned_advocate').filter(assigned_advocate__isnull=False).exclude(status__in=['positive','negative','positive_subject_tosearch','draft_positive_subject_tosearch']).order_by('-updated_at')[:10]
         
         context = {
             "username": user.username,
@@ -262,7 +331,7 @@ def dashboard(request):
             "employee_name": employee_name,
             "employee_type": employee_type,
             "employee": employee,
-            **stats,
+            "stats": stats,
             "is_admin": is_admin,
             "status_cards_active": status_cards_active,
             "status_cards_completed": status_cards_completed,
@@ -272,14 +341,8 @@ def dashboard(request):
             "yesterday": yesterday,
             "recent_completed": recent_completed,
             "recent_assigned": recent_assigned,
-            "cases_today": cases_today,
-            "cases_yesterday": cases_yesterday,
-            "cases_7days": cases_7days,
-            "cases_30days": cases_30days,
-            "completed_today": completed_today,
-            "completed_yesterday": completed_yesterday,
-            "completed_7days": completed_7days,
-            "completed_30days": completed_30days,
+            **dashboard_cache_context('admin'),
+            "case_event_seq": latest_event_id(),
         }
         return render(request, "accounts/dashboard.html", context)
         
@@ -334,7 +397,7 @@ def dashboard(request):
             context = {
                 "username": user.username,
                 "employee_id": f"ADMIN-{user.id}",
-                **stats,
+                "stats": stats,
                 "is_admin": is_admin,
                 "status_cards_active": status_cards_active,
                 "status_cards_completed": status_cards_completed,
@@ -342,6 +405,7 @@ def dashboard(request):
                 "bank_case_counts": bank_case_counts,
                 "bank_active_counts": bank_active_counts,
                 "today": today,
+                **dashboard_cache_context('admin-noprofile'),
             }
             return render(request, "accounts/dashboard.html", context)
         else:
@@ -354,10 +418,150 @@ def dashboard(request):
             return render(request, "accounts/dashboard.html", context)
 
 
+
+# Longest span the trend API serves in one request (about ten years of daily points)
+TREND_MAX_DAYS = 3660
+
+
+@login_required
+def dashboard_trends(request):
+    """JSON daily series for dashboard charts, read from the CaseDailyStat rollup.
+
+    Query params: start, end (YYYY-MM-DD, default last 30 days), optional bank (id).
+    The whole range is served by a single indexed range read on the rollup table.
+    Each day's ``new_cases_by_current_status`` splits the cases created that day by the
+    status they have now; it is not a count of status changes on that day.
+    """
+    is_admin = request.role.is_admin
+    if not is_admin:
+        return JsonResponse({'ok': False, 'error': 'forbidden'}, status=403)
+
+    today = timezone.localdate()
+    try:
+        end = datetime.strptime(request.GET['end'], '%Y-%m-%d').date() if request.GET.get('end') else today
+        start = datetime.strptime(request.GET['start'], '%Y-%m-%d').date() if request.GET.get('start') else end - timedelta(days=29)
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'dates must be YYYY-MM-DD'}, status=400)
+    if start > end:
+        return JsonResponse({'ok': False, 'error': 'start must not be after end'}, status=400)
+    if (end - start).days >= TREND_MAX_DAYS:
+        return JsonResponse({'ok': False, 'error': f'range too large (max {TREND_MAX_DAYS} days)'}, status=400)
+
+    rows = CaseDailyStat.objects.filter(date__gte=start, date__lte=end)
+    bank_id = request.GET.get('bank')
+    if bank_id:
+        try:
+            rows = rows.filter(bank_id=int(bank_id))
+        except (TypeError, ValueError):
+            return JsonResponse({'ok': False, 'error': 'invalid bank'}, status=400)
+
+    days = {}
+    banks = {}
+    for day, row_bank_id, status, new_cases, completed_cases in rows.values_list(
+        'date', 'bank_id', 'status', 'new_cases', 'completed_cases'
+    ).order_by():
+        point = days.setdefault(day, {'new_cases': 0, 'completed_cases': 0, 'new_cases_by_current_status': {}})
+        point['new_cases'] += new_cases
+        point['completed_cases'] += completed_cases
+        by_status = point['new_cases_by_current_status']
+        by_status[status] = by_status.get(status, 0) + new_cases
+        bank_totals = banks.setdefault(row_bank_id, {'bank_id': row_bank_id, 'new_cases': 0, 'completed_cases': 0})
+        bank_totals['new_cases'] += new_cases
+        bank_totals['completed_cases'] += completed_cases
+
+    if banks:
+        from Bank.models import Bank
+        for b_id, b_name in Bank.objects.filter(id__in=list(banks)).values_list('id', 'name'):
+            banks[b_id]['bank_name'] = b_name
+
+    series = []
+    day = start
+    while day <= end:
+        point = days.get(day, {'new_cases': 0, 'completed_cases': 0, 'new_cases_by_current_status': {}})
+        series.append({'date': day.isoformat(), **point})
+        day += timedelta(days=1)
+
+    return JsonResponse({
+        'ok': True,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'series': series,
+        'banks': sorted(banks.values(), key=lambda b: b['new_cases'], reverse=True),
+    })
+
+def live_event_scope(user):
+    """Which case events a user's live dashboard follows.
+
+    Returns ``None`` for admins (every case), the advocate's Employee id for advocates,
+    and ``False`` for everyone else.
+    """
+    role = get_role(user)
+    if role.is_admin:
+        return None
+    return role.employee.id if role.is_advocate else False
+
+
+@login_required
+async def dashboard_events(request):
+    """Server-sent events stream of case changes for the live dashboard counters.
+
+    Each ``case`` event carries the status a case left and entered (as seen by this user)
+    and whether it was newly assigned, so the page adjusts its counters in place instead
+    of reloading. The loop only touches the database when the case data generation in
+    the cache moves. Streams end after DASHBOARD_SSE_MAX_SECONDS and the browser resumes
+    from Last-Event-ID; under WSGI the stream returns right away and degrades to polling.
+    """
+    scope = await sync_to_async(live_event_scope)(request.user)
+    if scope is False:
+        return JsonResponse({'ok': False, 'error': 'forbidden'}, status=403)
+
+    # Resume from the last event the browser saw, else from the page's event sequence
+    try:
+        since = int(request.headers.get('Last-Event-ID') or request.GET['since'])
+    except (KeyError, ValueError):
+        since = await sync_to_async(latest_event_id)()
+
+    poll_seconds = getattr(settings, 'DASHBOARD_SSE_POLL_SECONDS', 2)
+    max_seconds = getattr(settings, 'DASHBOARD_SSE_MAX_SECONDS', 300)
+    if not isinstance(request, ASGIRequest):
+        # A sync worker would be pinned for the whole stream
+        max_seconds = 0
+
+    async def stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_seconds
+        next_ping = loop.time() + 15
+        last_id, last_gen = since, None
+        yield 'retry: 5000\n\n'
+        if await sync_to_async(is_feed_gap)(last_id):
+            yield 'event: resync\ndata: {}\n\n'
+            return
+        while True:
+            # Cache-only poll: run it off the worker's shared sync thread, which serves every
+            # sync view; only events_since below touches the database
+            gen = await sync_to_async(case_data_generation, thread_sensitive=False)()
+            if gen != last_gen:
+                last_gen = gen
+                last_id, payloads = await sync_to_async(events_since)(last_id, scope)
+                for payload in payloads:
+                    yield f"id: {payload['id']}\nevent: case\ndata: {json.dumps(payload)}\n\n"
+            now = loop.time()
+            if now >= deadline:
+                return
+            if now >= next_ping:
+                yield ': ping\n\n'
+                next_ping = now + 15
+            await asyncio.sleep(poll_seconds)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
 def admin_statistics(request):
-    user = request.user
-    is_admin = user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists() or user.is_superuser
+    is_admin = request.role.is_admin
     if not is_admin:
         messages.error(request, "You don't have access to the statistics page.")
         return redirect('dashboard')
@@ -431,14 +635,14 @@ def admin_statistics(request):
 @login_required
 def cases_by_status(request, status):
     """View to show all cases for a specific status"""
-    user = request.user
-    is_admin = user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists() or user.is_superuser
+    is_admin = request.role.is_admin
     if not is_admin:
         messages.error(request, "You don't have access to this page.")
         return redirect('dashboard')
     
     # Only show parent cases
-    cases = Case.objects.filter(status=status).select_related('assigned_advocate', 'bank', 'branch').order_by('-updated_at')
+    cases = case_list(Case.objects.filter(status=status), related=('assigned_advocate', 'bank', 'branch'))
+    page = keyset_paginate(request, cases, field='updated_at')
     
     status_labels = {
         'draft': 'Draft',
@@ -457,7 +661,8 @@ def cases_by_status(request, status):
     
     context = {
         'is_admin': True,
-        'cases': cases,
+        'cases': page,
+        'page': page,
         'status': status,
         'status_label': status_labels.get(status, status.replace('_', ' ').title()),
         'total_count': cases.count(),
@@ -468,8 +673,7 @@ def cases_by_status(request, status):
 @login_required
 def cases_by_advocate(request, advocate_id):
     """View to show all cases assigned to a specific advocate"""
-    user = request.user
-    is_admin = user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists() or user.is_superuser
+    is_admin = request.role.is_admin
     if not is_admin:
         messages.error(request, "You don't have access to this page.")
         return redirect('dashboard')
@@ -478,21 +682,28 @@ def cases_by_advocate(request, advocate_id):
     advocate = get_object_or_404(Employee, id=advocate_id, employee_type='advocate')
     
     # Only show parent cases
-    cases = Case.objects.filter(assigned_advocate=advocate).select_related('bank', 'branch').order_by('-updated_at')
+    cases = case_list(Case.objects.filter(assigned_advocate=advocate), related=('bank', 'branch'))
+    pending_statuses = ['pending', 'draft', 'on_hold', 'on_query', 'query', 'document_pending']
+    completed_statuses = ['positive', 'negative', 'positive_subject_tosearch']
+    counts = cases.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status__in=pending_statuses)),
+        completed=Count('id', filter=Q(status__in=completed_statuses)),
+    )
     
-    # Categorize cases
-    pending = cases.filter(status__in=['pending', 'draft', 'on_hold', 'on_query', 'query', 'document_pending'])
-    completed = cases.filter(status__in=['positive', 'negative', 'positive_subject_tosearch'])
+    # One keyset page of cases; the tabs split that page by status
+    page = keyset_paginate(request, cases, field='updated_at')
     
     context = {
         'is_admin': True,
         'advocate': advocate,
-        'all_cases': cases,
-        'pending_cases': pending,
-        'completed_cases': completed,
-        'total_count': cases.count(),
-        'pending_count': pending.count(),
-        'completed_count': completed.count(),
+        'page': page,
+        'all_cases': page,
+        'pending_cases': [c for c in page if c.status in pending_statuses],
+        'completed_cases': [c for c in page if c.status in completed_statuses],
+        'total_count': counts['total'],
+        'pending_count': counts['pending'],
+        'completed_count': counts['completed'],
     }
     return render(request, 'accounts/cases_by_advocate.html', context)
 
@@ -500,8 +711,7 @@ def cases_by_advocate(request, advocate_id):
 @login_required
 def cases_by_bank(request, bank_id):
     """View to show all cases for a specific bank"""
-    user = request.user
-    is_admin = user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists() or user.is_superuser
+    is_admin = request.role.is_admin
     if not is_admin:
         messages.error(request, "You don't have access to this page.")
         return redirect('dashboard')
@@ -511,21 +721,28 @@ def cases_by_bank(request, bank_id):
     bank = get_object_or_404(Bank, id=bank_id)
     
     # Only show parent cases
-    cases = Case.objects.filter(bank=bank).select_related('assigned_advocate', 'branch').order_by('-updated_at')
+    cases = case_list(Case.objects.filter(bank=bank), related=('assigned_advocate', 'branch'))
+    active_statuses = ['pending', 'draft', 'on_hold', 'on_query', 'query', 'document_pending', 'pending_assignment']
+    completed_statuses = ['positive', 'negative', 'positive_subject_tosearch']
+    counts = cases.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status__in=active_statuses)),
+        completed=Count('id', filter=Q(status__in=completed_statuses)),
+    )
     
-    # Categorize cases
-    active = cases.filter(status__in=['pending', 'draft', 'on_hold', 'on_query', 'query', 'document_pending', 'pending_assignment'])
-    completed = cases.filter(status__in=['positive', 'negative', 'positive_subject_tosearch'])
+    # One keyset page of cases; the tabs split that page by status
+    page = keyset_paginate(request, cases, field='updated_at')
     
     context = {
         'is_admin': True,
         'bank': bank,
-        'all_cases': cases,
-        'active_cases': active,
-        'completed_cases': completed,
-        'total_count': cases.count(),
-        'active_count': active.count(),
-        'completed_count': completed.count(),
+        'page': page,
+        'all_cases': page,
+        'active_cases': [c for c in page if c.status in active_statuses],
+        'completed_cases': [c for c in page if c.status in completed_statuses],
+        'total_count': counts['total'],
+        'active_count': counts['active'],
+        'completed_count': counts['completed'],
     }
     return render(request, 'accounts/cases_by_bank.html', context)
 
@@ -533,8 +750,7 @@ def cases_by_bank(request, bank_id):
 @login_required
 def generate_mis(request):
     """Generate MIS report as CSV download - excludes address field"""
-    user = request.user
-    is_admin = user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists() or user.is_superuser
+    is_admin = request.role.is_admin
     
     if not is_admin:
         messages.error(request, "You don't have permission to generate MIS reports.")
@@ -596,7 +812,7 @@ def super_sro_dashboard(request):
     """Super SRO Dashboard for admins - shows ALL cases that are forwarded to SRO or are PSTS."""
     # Check if user is admin
     user = request.user
-    is_admin = user.is_superuser or user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists()
+    is_admin = request.role.is_admin
     
     if not is_admin:
         messages.error(request, "You don't have permission to access the Super SRO Dashboard.")
@@ -607,37 +823,18 @@ def super_sro_dashboard(request):
     
     # Get all SRO-eligible cases (forwarded to SRO or PSTS status)
     # Order by created_at descending to show newest cases first
-    eligible_statuses = ['positive', 'positive_subject_tosearch', 'negative']
-    sro_cases = Case.objects.filter(
-        Q(forwarded_to_sro=True) | Q(status='positive_subject_tosearch'),
-        status__in=eligible_statuses
-    ).order_by('-created_at')  # Newest first
+    sro_cases = sro_eligible_cases().order_by('-created_at')  # Newest first
     
     # Apply search filter if provided
     if search_query:
-        sro_cases = sro_cases.filter(
-            Q(applicant_name__icontains=search_query) |
-            Q(case_number__icontains=search_query) |
-            Q(legal_reference_number__icontains=search_query)
-        ).distinct()
-    
-    # Split by status
-    sro_pss_cases = sro_cases.filter(status='positive_subject_tosearch')
-    sro_negative_cases = sro_cases.filter(status='negative')
-    sro_positive_cases = sro_cases.filter(status='positive')
+        sro_cases = sro_cases.filter(case_search_q(search_query))
     
     context = {
         "username": user.username,
         "is_admin": True,
         "is_sro": True,
-        "sro_all_cases": sro_cases,
-        "sro_total_cases": sro_cases.count(),
-        "sro_pss_count": sro_pss_cases.count(),
-        "sro_negative_count": sro_negative_cases.count(),
-        "sro_positive_count": sro_positive_cases.count(),
-        "sro_pss_cases": sro_pss_cases,
-        "sro_negative_cases": sro_negative_cases,
-        "sro_positive_cases": sro_positive_cases,
+        **lazy_context(lambda: split_sro_cases(sro_cases), SRO_DASHBOARD_KEYS),
         "search_query": search_query,
+        **dashboard_cache_context('super-sro'),
     }
     return render(request, "accounts/sro_dashboard.html", context)
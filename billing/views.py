@@ -7,6 +7,7 @@ from urllib.parse import urlparse
 
 from cases.decorators import admin_required
 from cases.models import Case, Employee, CaseType, State, CaseWork, AdHocFee
+from cases.search import autocomplete_cases, case_search_q
 from Bank.models import Bank, BankBranch, BankStateCaseType
 from .forms import BillingFilterForm
 from django.http import JsonResponse
@@ -129,19 +130,19 @@ def billing_view(request):
             dummy, end_utc = local_span_to_utc_range(opt_to, opt_to)
             qs = qs.filter(updated_at__lte=end_utc)
 
-        # Helper to resolve a State object for a case, preferring branch.state when available,
-        # else matching by name from Case.state (string field)
-        def _resolve_case_state_obj(case):
+        # Helper to resolve the State id for a case, preferring branch.state when available,
+        # else the State the case is linked to (Case.state_ref), else matching by name from
+        # Case.state (string field) for cases whose text is not linked to a State row
+        def _resolve_case_state_id(case):
             try:
-                if getattr(case, 'branch_id', None) and getattr(case, 'branch', None) and getattr(case.branch, 'state_id', None):
-                    return case.branch.state
+                if getattr(case, 'branch_id', None) and getattr(case.branch, 'state_id', None):
+                    return case.branch.state_id
             except Exception:
                 pass
-            try:
-                if case.state:
-                    return State.objects.filter(name__iexact=case.state).first()
-            except Exception:
-                return None
+            if case.state_ref_id:
+                return case.state_ref_id
+            if case.state:
+                return State.objects.filter(name__iexact=case.state).values_list('id', flat=True).first()
             return None
 
         for c in qs.order_by('-updated_at'):
@@ -163,9 +164,9 @@ def billing_view(request):
                     base_fee = float(c.original_custom_fee or 0)
                 else:
                     try:
-                        state_obj = _resolve_case_state_obj(c)
-                        if state_obj is not None:
-                            bct = BankStateCaseType.objects.filter(bank=c.bank, state=state_obj, casetype=c.case_type).first()
+                        state_id = _resolve_case_state_id(c)
+                        if state_id is not None:
+                            bct = BankStateCaseType.objects.filter(bank=c.bank, state_id=state_id, casetype=c.case_type).first()
                         else:
                             bct = BankStateCaseType.objects.filter(bank=c.bank, casetype=c.case_type).first()
                         base_fee = float(bct.fees) if bct else 0.0
@@ -179,9 +180,9 @@ def billing_view(request):
                     amt = float(w.custom_fee or 0)
                 else:
                     try:
-                        state_obj = _resolve_case_state_obj(c)
-                        if state_obj is not None:
-                            wbct = BankStateCaseType.objects.filter(bank=c.bank, state=state_obj, casetype=w.case_type).first()
+                        state_id = _resolve_case_state_id(c)
+                        if state_id is not None:
+                            wbct = BankStateCaseType.objects.filter(bank=c.bank, state_id=state_id, casetype=w.case_type).first()
                         else:
                             wbct = BankStateCaseType.objects.filter(bank=c.bank, casetype=w.case_type).first()
                         amt = float(wbct.fees) if wbct else 0.0
@@ -389,11 +390,7 @@ def mis_view(request):
     if status:
         qs = qs.filter(status=status)
     if search:
-        qs = qs.filter(
-            Q(case_number__icontains=search)
-            | Q(legal_reference_number__icontains=search)
-            | Q(applicant_name__icontains=search)
-        )
+        qs = qs.filter(case_search_q(search))
 
     # Helper: financial year string from a date (Apr->Mar, e.g., 24.25)
     def fy_str(d: date | None) -> str:
@@ -500,27 +497,19 @@ def case_search_api(request):
     """AJAX: search cases by query string. Returns JSON array of {id, label}.
     Search across case_number, legal_reference_number, applicant_name.
     Optional bank/branch filters via query to constrain results if desired.
+    Top 25 ranked matches from the case search index, cached briefly per query.
     """
     q = (request.GET.get('q') or '').strip()
     bank_id = request.GET.get('bank')
     branch_id = request.GET.get('branch')
-    qs = Case.objects.all().order_by('-created_at')[:50]
-    if bank_id:
-        qs = qs.filter(bank_id=bank_id)
-    if branch_id:
-        qs = qs.filter(branch_id=branch_id)
-    if q:
-        qs = qs.filter(
-            Q(case_number__icontains=q)
-            | Q(legal_reference_number__icontains=q)
-            | Q(applicant_name__icontains=q)
-        )
+    if (bank_id and not bank_id.isdigit()) or (branch_id and not branch_id.isdigit()):
+        return JsonResponse({'results': []})
     data = [
         {
-            'id': c.id,
-            'label': f"{c.case_number} — {c.applicant_name or ''} ({c.bank.name if c.bank_id else ''})"
+            'id': c['id'],
+            'label': f"{c['case_number']} — {c['applicant_name'] or ''} ({c['bank_name'] or ''})"
         }
-        for c in qs[:25]
+        for c in autocomplete_cases(q, bank_id=bank_id, branch_id=branch_id)
     ]
     return JsonResponse({'results': data})
 
@@ -0,0 +1,105 @@
+"""Shared cache helpers for case-derived pages (dashboards and similar fragments).
+
+Cached fragments include the "case data generation" in their key. Any write to case data
+bumps the generation, so the next render misses the cache and picks up the change at once.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject
+
+CASE_GENERATION_KEY = 'cases:data-generation'
+ROLE_GENERATION_KEY = 'cases:role-generation'
+SRO_SCOPE_GENERATION_KEY = 'cases:sro-scope-generation'
+LOCATION_GENERATION_KEY = 'cases:location-generation'
+
+
+def _fresh_generation():
+	# Seed from the clock so a lost counter never comes back as a value used before
+	return int(time.time() * 1000)
+
+
+def _generation(key):
+	gen = cache.get(key)
+	if gen is None:
+		cache.add(key, _fresh_generation(), None)
+		gen = cache.get(key) or _fresh_generation()
+	return gen
+
+
+def _incr_generation(key=CASE_GENERATION_KEY):
+	try:
+		cache.incr(key)
+	except ValueError:
+		cache.set(key, _fresh_generation(), None)
+
+
+def case_data_generation():
+	"""Return the current case data generation (an int that only ever grows)."""
+	return _generation(CASE_GENERATION_KEY)
+
+
+def bump_case_data_generation():
+	"""Invalidate every generation-keyed fragment.
+
+	Bumps immediately and again when the current transaction commits, so a render that
+	slips in before the commit cannot pin stale data under the new generation.
+	"""
+	_incr_generation()
+	transaction.on_commit(_incr_generation)
+
+
+def role_generation():
+	"""Return the current role generation; it changes whenever a user's role may have."""
+	return _generation(ROLE_GENERATION_KEY)
+
+
+def bump_role_generation():
+	"""Invalidate every role cached in a session (group, superuser or employee change)."""
+	_incr_generation(ROLE_GENERATION_KEY)
+	transaction.on_commit(lambda: _incr_generation(ROLE_GENERATION_KEY))
+
+
+def sro_scope_generation():
+	return _generation(SRO_SCOPE_GENERATION_KEY)
+
+
+def bump_sro_scope_generation():
+	"""Invalidate every compiled SRO scope (allowed locations or a location name changed)."""
+	_incr_generation(SRO_SCOPE_GENERATION_KEY)
+	transaction.on_commit(lambda: _incr_generation(SRO_SCOPE_GENERATION_KEY))
+
+
+def location_generation():
+	return _generation(LOCATION_GENERATION_KEY)
+
+
+def bump_location_generation():
+	"""Invalidate the location suggestion index of every process (a State/District/Tehsil changed)."""
+	_incr_generation(LOCATION_GENERATION_KEY)
+	transaction.on_commit(lambda: _incr_generation(LOCATION_GENERATION_KEY))
+
+
+def dashboard_cache_seconds():
+	return getattr(settings, 'DASHBOARD_CACHE_SECONDS', 600)
+
+
+def dashboard_cache_context(variant):
+	"""Template context used by {% cache %} blocks on the dashboards."""
+	return {
+		'case_gen': case_data_generation(),
+		'dashboard_cache_ttl': dashboard_cache_seconds(),
+		'dashboard_variant': variant,
+	}
+
+
+def lazy_context(builder, keys):
+	"""Expose the entries of ``builder()``'s dict as lazy template context values.
+
+	``builder`` runs at most once, on first access to any key, so a page whose cached
+	fragments cover every key never runs it.
+	"""
+	data = SimpleLazyObject(builder)
+	return {key: SimpleLazyObject(lambda key=key: data[key]) for key in keys}
@@ -0,0 +1,96 @@
+"""Case change feed behind the live dashboard counters.
+
+Every status change, assignment change, creation or deletion of a case writes one
+CaseEvent row inside the same transaction. Open dashboards poll the cheap case data
+generation in the cache and only read new CaseEvent rows when it moves, turning them into
+per-user status count deltas and new-assignment notices.
+"""
+from datetime import timedelta
+
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import CaseEvent
+
+EVENT_RETENTION = timedelta(days=1)
+# Prune old rows every this many events instead of on every write
+PRUNE_EVERY = 200
+
+
+def record_case_change(case, created=False, deleted=False):
+	"""Write a CaseEvent for ``case`` when its status or assigned advocate changed."""
+	loaded = getattr(case, '_loaded_values', None) or {}
+	old_status = '' if created else loaded.get('status', '')
+	new_status = '' if deleted else case.status
+	old_advocate = None if created else loaded.get('assigned_advocate_id')
+	new_advocate = None if deleted else case.assigned_advocate_id
+	if not (created or deleted) and old_status == new_status and old_advocate == new_advocate:
+		return None
+	event = CaseEvent.objects.create(
+		case_pk=case.pk,
+		case_number=case.case_number or '',
+		is_child=case.parent_case_id is not None,
+		old_status=old_status or '',
+		new_status=new_status or '',
+		old_advocate_id=old_advocate,
+		new_advocate_id=new_advocate,
+	)
+	if event.pk % PRUNE_EVERY == 0:
+		CaseEvent.objects.filter(created_at__lt=timezone.now() - EVENT_RETENTION).delete()
+	return event
+
+
+def remember_saved_values(case):
+	"""Refresh the load-time snapshot after a save so a second save compares against it."""
+	loaded = getattr(case, '_loaded_values', None)
+	if loaded is None:
+		loaded = case._loaded_values = {}
+	for field in case._meta.concrete_fields:
+		if field.attname in case.__dict__:
+			loaded[field.attname] = case.__dict__[field.attname]
+
+
+def latest_event_id():
+	last = CaseEvent.objects.order_by('-id').values_list('id', flat=True).first()
+	return last or 0
+
+
+def is_feed_gap(since):
+	"""True when events after ``since`` were already pruned (the client must reload)."""
+	if not since:
+		return False
+	oldest = CaseEvent.objects.aggregate(first=Min('id'))['first']
+	return oldest is not None and oldest > since + 1
+
+
+def events_since(since, advocate_id=None, limit=500):
+	"""Return ``(last_id, payloads)`` for events after ``since`` as seen by one user.
+
+	Admins (``advocate_id=None``) see every change. An advocate only sees the side of a
+	change that concerns their own cases: a case leaving them counts as ``from`` only,
+	a case newly assigned to them as ``to`` only and raises an assignment notice.
+	"""
+	events = CaseEvent.objects.filter(id__gt=since)
+	if advocate_id is not None:
+		events = events.filter(Q(old_advocate_id=advocate_id) | Q(new_advocate_id=advocate_id))
+	payloads = []
+	last_id = since
+	for event in events.order_by('id')[:limit]:
+		last_id = event.id
+		if advocate_id is None:
+			old_status, new_status = event.old_status, event.new_status
+			assigned = event.new_advocate_id is not None and event.new_advocate_id != event.old_advocate_id
+		else:
+			old_status = event.old_status if event.old_advocate_id == advocate_id else ''
+			new_status = event.new_status if event.new_advocate_id == advocate_id else ''
+			assigned = event.new_advocate_id == advocate_id and event.old_advocate_id != advocate_id
+		payloads.append({
+			'id': event.id,
+			'case_id': event.case_pk,
+			'case_number': event.case_number,
+			'child': event.is_child,
+			'from': old_status or None,
+			'to': new_status or None,
+			'assigned': assigned,
+		})
+	return last_id, payloads
@@ -0,0 +1,220 @@
+"""Global search across cases, banks, branches, employees and locations.
+
+Banks, branches, employees, states, districts and tehsils share one prebuilt SQLite FTS5
+table, ``cases_global_fts``: one row per object holding the display label and detail line
+plus a ``terms`` column with every searchable identifier (name, branch code, employee id,
+initials). Rows are rewritten from model signals, and renames cascade to rows whose detail
+line shows the renamed parent. Cases are answered from the case search index in
+``cases.search``. ``search_everything`` returns the top matches of each group from two
+indexed queries; off SQLite, without FTS5 or for queries shorter than a trigram it falls
+back to ORM prefix/contains filters per group.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db import connection
+from django.db.models import Q
+
+from Bank.models import Bank, BankBranch
+from .models import Case, District, Employee, State, Tehsil
+from .search import MIN_QUERY_LENGTH, ranked_search
+
+GLOBAL_FTS_TABLE = 'cases_global_fts'
+KINDS = ('bank', 'branch', 'employee', 'state', 'district', 'tehsil')
+GROUP_LIMIT = 5
+# Separates identifiers in the terms column so a prefix can be matched per identifier
+TERM_SEPARATOR = '\n'
+
+CREATE_SQL = (
+	f"CREATE VIRTUAL TABLE IF NOT EXISTS {GLOBAL_FTS_TABLE} USING fts5("
+	"kind UNINDEXED, object_id UNINDEXED, parent_id UNINDEXED, label UNINDEXED, detail UNINDEXED, "
+	"terms, tokenize='trigram')"
+)
+
+_available = {}
+
+
+def _terms(*values):
+	return TERM_SEPARATOR.join(v for v in values if v)
+
+
+def _bank_entries(queryset):
+	for pk, name in queryset.values_list('id', 'name'):
+		yield pk, None, name, 'Bank', _terms(name)
+
+
+def _branch_entries(queryset):
+	for pk, bank_id, name, code, bank in queryset.values_list('id', 'bank_id', 'name', 'branch_code', 'bank__name'):
+		detail = f'{bank} · {code}' if code else bank
+		yield pk, bank_id, name, detail, _terms(name, code)
+
+
+def _employee_entries(queryset):
+	types = dict(Employee.EMPLOYEE_TYPE_CHOICES)
+	for pk, name, employee_id, initials, employee_type in queryset.values_list(
+		'id', 'name', 'employee_id', 'initials', 'employee_type'
+	):
+		yield pk, None, name, f'{employee_id} · {types.get(employee_type, employee_type)}', _terms(name, employee_id, initials)
+
+
+def _state_entries(queryset):
+	for pk, name in queryset.values_list('id', 'name'):
+		yield pk, None, name, 'State', _terms(name)
+
+
+def _district_entries(queryset):
+	for pk, state_id, name, state in queryset.values_list('id', 'state_id', 'name', 'state__name'):
+		yield pk, state_id, name, state, _terms(name)
+
+
+def _tehsil_entries(queryset):
+	for pk, district_id, name, district, state in queryset.values_list(
+		'id', 'district_id', 'name', 'district__name', 'district__state__name'
+	):
+		yield pk, district_id, name, f'{district}, {state}', _terms(name)
+
+
+# kind -> (model, fields searched by the ORM fallback, ordering, entry builder)
+SOURCES = {
+	'bank': (Bank, ('name',), ('name',), _bank_entries),
+	'branch': (BankBranch, ('name', 'branch_code'), ('name',), _branch_entries),
+	'employee': (Employee, ('name', 'employee_id', 'initials'), ('name',), _employee_entries),
+	'state': (State, ('name',), ('name',), _state_entries),
+	'district': (District, ('name',), ('name',), _district_entries),
+	'tehsil': (Tehsil, ('name',), ('name',), _tehsil_entries),
+}
+
+
+def global_fts_available():
+	if connection.vendor != 'sqlite':
+		return False
+	key = connection.settings_dict['NAME']
+	if key not in _available:
+		with connection.cursor() as cursor:
+			cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [GLOBAL_FTS_TABLE])
+			_available[key] = cursor.fetchone() is not None
+	return _available[key]
+
+
+def _rowid(kind, pk):
+	# One integer key per (kind, pk) so rows can be replaced by rowid
+	return pk * len(KINDS) + KINDS.index(kind)
+
+
+def _insert(cursor, kind, entries):
+	cursor.executemany(
+		f'INSERT INTO {GLOBAL_FTS_TABLE} (rowid, kind, object_id, parent_id, label, detail, terms) '
+		'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+		[(_rowid(kind, pk), kind, pk, parent_id, label or '', detail or '', terms) for pk, parent_id, label, detail, terms in entries],
+	)
+
+
+def index_objects(kind, pks):
+	"""Write (or replace) the index rows of the ``kind`` objects with the given pks."""
+	pks = list(pks)
+	if not pks or not global_fts_available():
+		return
+	model, _, _, build = SOURCES[kind]
+	entries = list(build(model.objects.filter(pk__in=pks)))
+	with connection.cursor() as cursor:
+		cursor.executemany(f'DELETE FROM {GLOBAL_FTS_TABLE} WHERE rowid = %s', [(_rowid(kind, pk),) for pk in pks])
+		_insert(cursor, kind, entries)
+
+
+def index_object(kind, obj, created=False):
+	"""Index one saved object and refresh the rows that show its name in their detail line."""
+	index_objects(kind, [obj.pk])
+	if created:
+		return
+	if kind == 'bank':
+		index_objects('branch', BankBranch.objects.filter(bank=obj).values_list('pk', flat=True))
+	elif kind == 'state':
+		index_objects('district', District.objects.filter(state=obj).values_list('pk', flat=True))
+		index_objects('tehsil', Tehsil.objects.filter(district__state=obj).values_list('pk', flat=True))
+	elif kind == 'district':
+		index_objects('tehsil', Tehsil.objects.filter(district=obj).values_list('pk', flat=True))
+
+
+def unindex_object(kind, pk):
+	if not global_fts_available():
+		return
+	with connection.cursor() as cursor:
+		cursor.execute(f'DELETE FROM {GLOBAL_FTS_TABLE} WHERE rowid = %s', [_rowid(kind, pk)])
+
+
+def rebuild_global_index():
+	"""Recreate the global index; returns the number of rows written, or None off SQLite."""
+	if connection.vendor != 'sqlite':
+		return None
+	count = 0
+	with connection.cursor() as cursor:
+		cursor.execute(CREATE_SQL)
+		cursor.execute(f'DELETE FROM {GLOBAL_FTS_TABLE}')
+		for kind, (model, _, _, build) in SOURCES.items():
+			entries = list(build(model.objects.all()))
+			_insert(cursor, kind, entries)
+			count += len(entries)
+		cursor.execute(f"INSERT INTO {GLOBAL_FTS_TABLE} ({GLOBAL_FTS_TABLE}) VALUES ('optimize')")
+	_available[connection.settings_dict['NAME']] = True
+	return count
+
+
+def _result(kind, pk, parent_id, label, detail):
+	return {'kind': kind, 'id': pk, 'parent_id': parent_id, 'label': label, 'detail': detail}
+
+
+def _indexed_objects(query, limit):
+	"""Top ``limit`` matches per kind from the FTS table in one query."""
+	match = '{terms} : "' + query.replace('"', '""') + '"'
+	# Exact label first, then a prefix of any identifier, then shorter labels
+	sql = (
+		'SELECT kind, object_id, parent_id, label, detail FROM ('
+		'SELECT kind, object_id, parent_id, label, detail, ROW_NUMBER() OVER ('
+		'PARTITION BY kind ORDER BY '
+		'CASE WHEN lower(label) = lower(%s) THEN 0 '
+		"WHEN instr(char(10) || lower(terms), char(10) || lower(%s)) > 0 THEN 1 ELSE 2 END, "
+		'length(label), label) AS position '
+		f'FROM {GLOBAL_FTS_TABLE} WHERE {GLOBAL_FTS_TABLE} MATCH %s'
+		') WHERE position <= %s ORDER BY kind, position'
+	)
+	groups = {kind: [] for kind in KINDS}
+	with connection.cursor() as cursor:
+		cursor.execute(sql, [query, query, match, limit])
+		for kind, pk, parent_id, label, detail in cursor.fetchall():
+			groups[kind].append(_result(kind, pk, parent_id, label, detail))
+	return groups
+
+
+def _orm_objects(query, limit):
+	# Short input only matches prefixes (employee initials are two letters)
+	lookup = 'istartswith' if len(query) < MIN_QUERY_LENGTH else 'icontains'
+	groups = {}
+	for kind, (model, fields, ordering, build) in SOURCES.items():
+		condition = reduce(or_, [Q(**{f'{field}__{lookup}': query}) for field in fields])
+		queryset = model.objects.filter(condition).order_by(*ordering)[:limit]
+		groups[kind] = [_result(kind, *entry[:4]) for entry in build(queryset)]
+	return groups
+
+
+def search_everything(query, limit=GROUP_LIMIT):
+	"""Return ``{'case': [...], 'bank': [...], ...}`` with up to ``limit`` ranked results each."""
+	query = ' '.join((query or '').split())
+	if not query:
+		return {kind: [] for kind in ('case',) + KINDS}
+	if len(query) >= MIN_QUERY_LENGTH and global_fts_available():
+		groups = _indexed_objects(query, limit)
+	else:
+		groups = _orm_objects(query, limit)
+	if len(query) >= MIN_QUERY_LENGTH:
+		cases = ranked_search(Case.objects.all(), query)
+	else:
+		cases = Case.objects.filter(
+			Q(case_number__istartswith=query) | Q(legal_reference_number__istartswith=query)
+		).order_by('-created_at')
+	groups['case'] = [
+		_result('case', pk, None, number, ' · '.join(v for v in (applicant, lrn) if v))
+		for pk, number, applicant, lrn in cases.values_list(
+			'id', 'case_number', 'applicant_name', 'legal_reference_number'
+		)[:limit]
+	]
+	return groups
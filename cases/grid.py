@@ -0,0 +1,183 @@
+"""JSON case grid: filtered, sorted, cursor-paginated case rows with sparse fields.
+
+The grid answers ``GET /cases/api/cases/grid/`` for list pages that load rows incrementally.
+Every knob is whitelisted so each request maps onto an indexed query:
+
+* ``sort`` is one of ``SORTS`` (the keyset indexes on created_at/updated_at, read in
+  either direction); pages are cut with ``keyset_paginate`` (``after``/``before`` cursors,
+  ``per_page``).
+* filters: ``status`` (comma separated), ``bank``, ``branch``, ``advocate`` (an id or
+  ``none``), ``from``/``to`` (inclusive local dates on the sort field), ``kind``
+  (``parent`` or ``child``) and ``q`` (the case search index).
+* ``fields`` picks columns from ``FIELDS``; only those columns and relations are loaded.
+
+Scoping is the caller's job: pass the queryset the user may see (``Case.objects.visible_to``).
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Case
+from .pagination import keyset_paginate
+from .queries import child_count_subquery
+from .search import case_search_q
+
+# sort parameter -> (timestamp field, descending)
+SORTS = {
+	'-updated_at': ('updated_at', True),
+	'updated_at': ('updated_at', False),
+	'-created_at': ('created_at', True),
+	'created_at': ('created_at', False),
+}
+DEFAULT_SORT = '-updated_at'
+
+
+def _when(value):
+	return timezone.localtime(value).isoformat() if value else None
+
+
+def _name(related):
+	return related.name if related else None
+
+
+# field -> (columns to load, value from the case)
+FIELDS = {
+	'id': ((), lambda c: c.id),
+	'case_number': (('case_number',), lambda c: c.case_number),
+	'applicant_name': (('applicant_name',), lambda c: c.applicant_name),
+	'legal_reference_number': (('legal_reference_number',), lambda c: c.legal_reference_number),
+	'status': (('status',), lambda c: c.status),
+	'status_label': (('status',), lambda c: c.get_status_display()),
+	'bank': (('bank', 'bank__name'), lambda c: _name(c.bank)),
+	'branch': (('branch', 'branch__name'), lambda c: _name(c.branch)),
+	'case_type': (('case_type', 'case_type__name'), lambda c: _name(c.case_type)),
+	'advocate': (('assigned_advocate', 'assigned_advocate__name'), lambda c: _name(c.assigned_advocate)),
+	'state': (('state',), lambda c: c.state),
+	'district': (('district',), lambda c: c.district),
+	'tehsil': (('tehsil',), lambda c: c.tehsil),
+	'parent_id': (('parent_case',), lambda c: c.parent_case_id),
+	'child_count': ((), lambda c: c.child_count),
+	'created_at': (('created_at',), lambda c: _when(c.created_at)),
+	'updated_at': (('updated_at',), lambda c: _when(c.updated_at)),
+	'completed_at': (('completed_at',), lambda c: _when(c.completed_at)),
+	'url': ((), lambda c: reverse('case_detail', args=[c.id])),
+}
+DEFAULT_FIELDS = (
+	'id', 'case_number', 'applicant_name', 'status', 'status_label', 'bank', 'advocate',
+	'parent_id', 'child_count', 'updated_at', 'url',
+)
+
+
+class GridError(ValueError):
+	"""A grid parameter outside its whitelist; the message is safe to show."""
+
+
+def _int_param(params, name):
+	value = (params.get(name) or '').strip()
+	if not value:
+		return None
+	if not value.isdigit():
+		raise GridError(f'{name} must be an id')
+	return int(value)
+
+
+def _date_param(params, name):
+	value = (params.get(name) or '').strip()
+	if not value:
+		return None
+	try:
+		day = date.fromisoformat(value)
+	except ValueError:
+		raise GridError(f'{name} must be a date (YYYY-MM-DD)')
+	return day
+
+
+def _fields(params):
+	raw = (params.get('fields') or '').strip()
+	if not raw:
+		return DEFAULT_FIELDS
+	names = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+	unknown = [name for name in names if name not in FIELDS]
+	if unknown:
+		raise GridError(f"Unknown field(s): {', '.join(unknown)}")
+	return names
+
+
+def filter_grid(queryset, params, field):
+	"""Apply the grid filters in ``params`` to ``queryset``; ``field`` takes the date range."""
+	statuses = [s.strip() for s in (params.get('status') or '').split(',') if s.strip()]
+	if statuses:
+		known = dict(Case.STATUS_CHOICES)
+		unknown = [s for s in statuses if s not in known]
+		if unknown:
+			raise GridError(f"Unknown status(es): {', '.join(unknown)}")
+		queryset = queryset.filter(status__in=statuses)
+
+	bank = _int_param(params, 'bank')
+	if bank:
+		queryset = queryset.filter(bank_id=bank)
+	branch = _int_param(params, 'branch')
+	if branch:
+		queryset = queryset.filter(branch_id=branch)
+	if (params.get('advocate') or '').strip() == 'none':
+		queryset = queryset.filter(assigned_advocate__isnull=True)
+	else:
+		advocate = _int_param(params, 'advocate')
+		if advocate:
+			queryset = queryset.filter(assigned_advocate_id=advocate)
+
+	# Inclusive local dates -> half-open range on the (indexed) sort field
+	start, end = _date_param(params, 'from'), _date_param(params, 'to')
+	if start:
+		queryset = queryset.filter(**{f'{field}__gte': timezone.make_aware(datetime.combine(start, time.min))})
+	if end:
+		queryset = queryset.filter(**{f'{field}__lt': timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))})
+
+	kind = (params.get('kind') or '').strip()
+	if kind == 'parent':
+		queryset = queryset.filter(parent_case__isnull=True)
+	elif kind == 'child':
+		queryset = queryset.filter(parent_case__isnull=False)
+	elif kind:
+		raise GridError('kind must be parent or child')
+
+	q = (params.get('q') or '').strip()
+	if q:
+		queryset = queryset.filter(case_search_q(q, include_children=kind != 'child'))
+	return queryset
+
+
+def case_grid(request, queryset):
+	"""Build the grid payload for ``request`` over the cases in ``queryset``.
+
+	Raises GridError for parameters outside the whitelists.
+	"""
+	params = request.GET
+	sort = (params.get('sort') or DEFAULT_SORT).strip()
+	if sort not in SORTS:
+		raise GridError(f"sort must be one of: {', '.join(SORTS)}")
+	field, descending = SORTS[sort]
+	names = _fields(params)
+
+	queryset = filter_grid(queryset, params, field)
+	columns = {'id', field}
+	for name in names:
+		columns.update(FIELDS[name][0])
+	related = sorted({column.split('__')[0] for column in columns if '__' in column})
+	queryset = queryset.select_related(*related).only(*columns)
+	if 'child_count' in names:
+		queryset = queryset.annotate(child_count=child_count_subquery())
+
+	page = keyset_paginate(request, queryset, field=field, descending=descending)
+	return {
+		'ok': True,
+		'sort': sort,
+		'fields': list(names),
+		'per_page': page.per_page,
+		'results': [{name: FIELDS[name][1](case) for name in names} for case in page.object_list],
+		'has_next': page.has_next,
+		'has_previous': page.has_previous,
+		'next_cursor': page.next_cursor,
+		'previous_cursor': page.previous_cursor,
+	}
@@ -0,0 +1,324 @@
+"""In-process index behind the location suggestion endpoints.
+
+The State/District/Tehsil tables rarely change, but the suggestion endpoints are hit on
+every keystroke. ``location_index()`` loads the three tables once per process (three
+queries, no joins) into name-sorted tuples, and keeps them until the location generation
+moves. Saving or deleting a location bumps it (see cases.signals). A lookup then runs in
+pure Python: a bisect on the lower-cased names finds prefix matches, and a scan finds
+word and substring matches only when the prefix matches do not fill the page.
+
+Results are ranked exact, prefix, word prefix, then substring, and ties go by name. A
+list narrowed to one state or district is returned whole, because the cascading
+dropdowns need every child. Any other list is capped at LOCATION_SUGGEST_LIMIT.
+
+The case forms skip the endpoints altogether. They load the whole tree once as a bundle
+(``{"State": {"District": ["Tehsil", ...]}}``) and filter it in the browser. The bundle
+is written to LOCATION_BUNDLE_DIR under a content-hashed name and served with a
+far-future, immutable Cache-Control (``location_bundle`` view). ``location_bundle_url()``
+re-exports it from the index after a location change. ``export_locations`` writes it
+ahead of time, for example on deploy.
+
+``link_case_locations`` points a case's state/district/tehsil references at the rows its
+free-text fields name. It tries an exact (trimmed, case-insensitive) match first, then
+ignores punctuation and spacing. Only ``backfill_case_locations``, whose matches can be
+reviewed with --dry-run/--report, also accepts a close spelling under the same parent:
+on save, a new name spelt like a neighbouring row ("Chandausi", "Chandauli") must not be
+linked to it, because SRO scopes trust the links.
+"""
+import difflib
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from .caching import location_generation
+from .models import District, State, Tehsil
+from .scopes import normalize_location
+
+# ``key`` is the normalized name; ``state_id``/``district_id`` locate the row (its own id
+# for the row's level, None below it)
+Location = namedtuple('Location', 'id name key label state_id district_id')
+
+MAX_SUGGEST_LIMIT = 100
+BUNDLE_PREFIX = 'locations.'
+BUNDLE_MAX_AGE = 365 * 24 * 60 * 60
+# Older bundles stay on disk for pages rendered before a change
+KEEP_BUNDLES = 5
+# How alike (difflib ratio) a misspelt name must be to the canonical one to match it
+FUZZY_CUTOFF = 0.85
+# Digests are keyed by generation, so this only bounds how long a stale entry lingers
+BUNDLE_DIGEST_SECONDS = 24 * 60 * 60
+
+
+def suggest_limit():
+	return getattr(settings, 'LOCATION_SUGGEST_LIMIT', 20)
+
+
+def suggest_max_age():
+	"""Seconds a browser may reuse a suggestion response before revalidating its ETag."""
+	return getattr(settings, 'LOCATION_SUGGEST_MAX_AGE', 300)
+
+
+def _sorted(entries):
+	return tuple(sorted(entries, key=lambda e: (e.key, e.name)))
+
+
+def _squash(key):
+	"""``key`` without punctuation or spacing differences ("Sri Ganganagar" == "sri-ganga nagar")."""
+	return re.sub(r'[^0-9a-z]+', '', key.replace('&', 'and'))
+
+
+def _rank(key, q):
+	if key.startswith(q):
+		return 0 if key == q else 1
+	if f' {q}' in key or f'-{q}' in key:
+		return 2
+	return 3
+
+
+class LocationIndex:
+	"""Every State, District and Tehsil of one location generation, ready for lookups."""
+
+	def __init__(self, generation, states, districts, tehsils):
+		self.generation = generation
+		state_names = dict(states)
+		district_rows = {pk: (name, state_id) for pk, name, state_id in districts}
+		self.entries = {
+			'state': _sorted(
+				Location(pk, name, normalize_location(name) or '', name, pk, None)
+				for pk, name in states
+			),
+			'district': _sorted(
+				Location(pk, name, normalize_location(name) or '', f"{name} ({state_names.get(state_id, '')})", state_id, pk)
+				for pk, name, state_id in districts
+			),
+			'tehsil': _sorted(
+				Location(
+					pk, name, normalize_location(name) or '',
+					f"{name} ({district_rows[district_id][0]}, {state_names.get(district_rows[district_id][1], '')})",
+					district_rows[district_id][1], district_id,
+				)
+				for pk, name, district_id in tehsils if district_id in district_rows
+			),
+		}
+		self.keys = {kind: tuple(e.key for e in entries) for kind, entries in self.entries.items()}
+		# normalized name -> ids, for the state_name/district_name parameters
+		self.ids_by_name = {}
+		for kind in ('state', 'district'):
+			names = self.ids_by_name[kind] = {}
+			for entry in self.entries[kind]:
+				names.setdefault(entry.key, set()).add(entry.id)
+		# (kind, parent id) -> {normalized name: id}; the parent of a district is its state,
+		# of a tehsil its district, and states sit under None
+		self.names_under = {}
+		for kind, parent in (('state', None), ('district', 'state_id'), ('tehsil', 'district_id')):
+			for entry in self.entries[kind]:
+				parent_id = getattr(entry, parent) if parent else None
+				self.names_under.setdefault((kind, parent_id), {})[entry.key] = entry.id
+		self._squashed = {}
+
+	@classmethod
+	def load(cls, generation):
+		return cls(
+			generation,
+			list(State.objects.values_list('id', 'name')),
+			list(District.objects.values_list('id', 'name', 'state_id')),
+			list(Tehsil.objects.values_list('id', 'name', 'district_id')),
+		)
+
+	def tree(self):
+		"""The nested ``{state: {district: [tehsil, ...]}}`` mapping exported in the bundle."""
+		tree, states, districts = {}, {}, {}
+		for entry in self.entries['state']:
+			states[entry.id] = tree[entry.name] = {}
+		# The tables are read one after another, so skip rows whose parent was not seen
+		for entry in self.entries['district']:
+			if entry.state_id in states:
+				districts[entry.id] = states[entry.state_id][entry.name] = []
+		for entry in self.entries['tehsil']:
+			if entry.district_id in districts:
+				districts[entry.district_id].append(entry.name)
+		return tree
+
+	def resolve(self, kind, value):
+		"""Ids of the ``kind`` rows ``value`` refers to: an id, or a case-insensitive name."""
+		try:
+			return {int(value)}
+		except (TypeError, ValueError):
+			return self.ids_by_name[kind].get(normalize_location(value), set())
+
+	def match(self, kind, name, parent_id=None, fuzzy=False):
+		"""Id of the ``kind`` row under ``parent_id`` that ``name`` refers to, or None.
+
+		With ``fuzzy`` a close spelling (difflib ratio of at least FUZZY_CUTOFF) also matches.
+		"""
+		key = normalize_location(name)
+		names = self.names_under.get((kind, parent_id))
+		if not key or not names:
+			return None
+		if key in names:
+			return names[key]
+		squashed = self._squashed.get((kind, parent_id))
+		if squashed is None:
+			squashed = self._squashed[(kind, parent_id)] = {_squash(k): pk for k, pk in names.items()}
+		target = _squash(key)
+		if target in squashed:
+			return squashed[target]
+		if not fuzzy:
+			return None
+		close = difflib.get_close_matches(target, list(squashed), n=1, cutoff=FUZZY_CUTOFF)
+		return squashed[close[0]] if close else None
+
+	def _prefixed(self, kind, q):
+		keys = self.keys[kind]
+		return self.entries[kind][bisect_left(keys, q):bisect_left(keys, q + '\uffff')]
+
+	def suggest(self, kind, q='', state_ids=None, district_ids=None, limit=None):
+		"""The ``kind`` entries matching ``q``, best first; at most ``limit`` when given.
+
+		``district_ids`` (or else ``state_ids``) keeps only entries under those parents.
+		"""
+		q = normalize_location(q)
+		entries = self.entries[kind]
+		if district_ids is not None:
+			entries = [e for e in entries if e.district_id in district_ids]
+		elif state_ids is not None:
+			entries = [e for e in entries if e.state_id in state_ids]
+		elif q:
+			# Exact and prefix matches are one contiguous slice, already in order
+			matches = list(self._prefixed(kind, q))
+			if limit is not None and len(matches) >= limit:
+				return matches[:limit]
+			entries = [e for e in entries if q in e.key and not e.key.startswith(q)]
+			return (matches + sorted(entries, key=lambda e: (_rank(e.key, q), e.key, e.name)))[:limit]
+		if q:
+			entries = sorted((e for e in entries if q in e.key), key=lambda e: (_rank(e.key, q), e.key, e.name))
+		return list(entries[:limit])
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def location_index():
+	"""The index of the current location generation, loading it on first use or after a change."""
+	global _index
+	generation = location_generation()
+	index = _index
+	if index is None or index.generation != generation:
+		with _index_lock:
+			index = _index
+			if index is None or index.generation != generation:
+				index = _index = LocationIndex.load(generation)
+	return index
+
+
+def match_locations(state, district, tehsil, index=None, fuzzy=False):
+	"""(state id, district id, tehsil id) named by the given texts; None from the first miss on."""
+	index = index or location_index()
+	state_id = index.match('state', state, fuzzy=fuzzy)
+	district_id = index.match('district', district, state_id, fuzzy=fuzzy) if state_id else None
+	tehsil_id = index.match('tehsil', tehsil, district_id, fuzzy=fuzzy) if district_id else None
+	return state_id, district_id, tehsil_id
+
+
+def link_case_locations(case, index=None):
+	"""Set ``case.state_ref``/``district_ref``/``tehsil_ref`` from its text fields (not saved).
+
+	Exact and punctuation/spacing-insensitive matches only; see backfill_case_locations
+	for close spellings.
+	"""
+	case.state_ref_id, case.district_ref_id, case.tehsil_ref_id = match_locations(
+		case.state, case.district, case.tehsil, index=index,
+	)
+
+
+def location_etag(request, *args, **kwargs):
+	"""ETag of a suggestion response: every response changes with the location generation."""
+	return f'locations-{location_generation()}'
+
+
+def suggestion_limit(params, narrowed):
+	"""How many suggestions to return: ``limit`` if given, else none or the configured cap."""
+	try:
+		limit = int(params.get('limit') or 0)
+	except (TypeError, ValueError):
+		limit = 0
+	if limit > 0:
+		return min(limit, MAX_SUGGEST_LIMIT)
+	return None if narrowed else suggest_limit()
+
+
+def bundle_dir():
+	return getattr(settings, 'LOCATION_BUNDLE_DIR', os.path.join(settings.BASE_DIR, '.location_bundle'))
+
+
+def bundle_path(digest):
+	return os.path.join(bundle_dir(), f'{BUNDLE_PREFIX}{digest}.json')
+
+
+def export_location_bundle(index=None):
+	"""Write the location tree to its content-hashed file; returns the digest.
+
+	An unchanged tree keeps its file and digest, so browsers keep their cached copy.
+	"""
+	index = index or location_index()
+	content = json.dumps(index.tree(), ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode()
+	digest = hashlib.sha256(content).hexdigest()[:16]
+	path = bundle_path(digest)
+	if not os.path.exists(path):
+		directory = bundle_dir()
+		os.makedirs(directory, exist_ok=True)
+		fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+		with os.fdopen(fd, 'wb') as f:
+			f.write(content)
+		os.replace(tmp, path)
+		_prune_bundles(directory)
+	return digest
+
+
+def _prune_bundles(directory):
+	bundles = [
+		os.path.join(directory, name) for name in os.listdir(directory)
+		if name.startswith(BUNDLE_PREFIX) and name.endswith('.json')
+	]
+	bundles.sort(key=os.path.getmtime, reverse=True)
+	for path in bundles[KEEP_BUNDLES:]:
+		try:
+			os.remove(path)
+		except FileNotFoundError:
+			pass
+
+
+def location_bundle_digest():
+	"""Digest of the bundle for the current location generation, exporting it on first use."""
+	index = location_index()
+	key = f'cases:location-bundle:{index.generation}'
+	digest = cache.get(key)
+	if digest is None or not os.path.exists(bundle_path(digest)):
+		digest = export_location_bundle(index)
+		cache.set(key, digest, BUNDLE_DIGEST_SECONDS)
+	return digest
+
+
+def open_location_bundle(digest):
+	"""Open the bundle file of ``digest`` for reading; None if there is no such bundle."""
+	if not os.path.exists(bundle_path(digest)):
+		# Re-exports the current bundle if its file went missing
+		location_bundle_digest()
+	try:
+		return open(bundle_path(digest), 'rb')
+	except FileNotFoundError:
+		return None
+
+
+def location_bundle_url():
+	return reverse('location_bundle', args=[location_bundle_digest()])
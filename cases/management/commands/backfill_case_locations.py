@@ -0,0 +1,90 @@
+import csv
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from cases.caching import bump_case_data_generation
+from cases.locations import location_index, match_locations
+from cases.models import Case
+
+REF_FIELDS = ('state_ref', 'district_ref', 'tehsil_ref')
+TEXT_FIELDS = ('state', 'district', 'tehsil')
+
+
+class Command(BaseCommand):
+    help = (
+        "Link cases to the State/District/Tehsil rows their location text names (Case.state_ref, "
+        "district_ref, tehsil_ref). Names match exactly (case-insensitively), then ignoring punctuation "
+        "and spacing, then by close spelling under the same parent (saves only link the first two, so "
+        "review close-spelling links with --dry-run/--report). Saves keep the links current; run this once "
+        "for existing cases, again after importing locations (seed_locations), and with --all after "
+        "saves that changed location text through update_fields without the ref fields. Cases whose "
+        "text matches nothing are summarized, and listed in full with --report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Cases per batch (default 500)')
+        parser.add_argument('--all', action='store_true', help='Re-match every case, not just those with a missing link')
+        parser.add_argument('--dry-run', action='store_true', help='Match and report without saving')
+        parser.add_argument('--report', type=str, help='Write the unmatched cases to this CSV file')
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        index = location_index()
+        cases = Case.objects.only('id', 'case_number', *TEXT_FIELDS, *REF_FIELDS).order_by('id')
+        if not options['all']:
+            missing = Q()
+            for text, ref in zip(TEXT_FIELDS, REF_FIELDS):
+                missing |= Q(**{f'{ref}__isnull': True}) & ~Q(**{f'{text}__isnull': True}) & ~Q(**{text: ''})
+            cases = cases.filter(missing)
+
+        scanned = linked = 0
+        unmatched = []
+        last_id = 0
+        while True:
+            batch = list(cases.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            changed = []
+            for case in batch:
+                scanned += 1
+                refs = match_locations(case.state, case.district, case.tehsil, index=index, fuzzy=True)
+                if refs != (case.state_ref_id, case.district_ref_id, case.tehsil_ref_id):
+                    case.state_ref_id, case.district_ref_id, case.tehsil_ref_id = refs
+                    changed.append(case)
+                # The first level that names no row while it or a level below has text (a
+                # blank state leaves the district unmatched as well)
+                texts = [(getattr(case, field) or '').strip() for field in TEXT_FIELDS]
+                for level, (field, ref_id) in enumerate(zip(TEXT_FIELDS, refs)):
+                    if ref_id is None:
+                        if any(texts[level:]):
+                            unmatched.append((case, field))
+                        break
+            if changed and not options['dry_run']:
+                with transaction.atomic():
+                    Case.objects.bulk_update(changed, REF_FIELDS)
+            linked += len(changed)
+
+        if linked and not options['dry_run']:
+            # bulk_update sends no signals; SRO lists and dashboards read the links
+            bump_case_data_generation()
+
+        verb = 'would change' if options['dry_run'] else 'updated'
+        self.stdout.write(self.style.SUCCESS(
+            f'Scanned {scanned} case(s): {verb} the links of {linked}, {len(unmatched)} with unmatched location text.'
+        ))
+        if unmatched:
+            counts = Counter((field, (getattr(case, field) or '').strip()) for case, field in unmatched)
+            self.stdout.write(self.style.WARNING('Most frequent unmatched values:'))
+            for (field, value), count in counts.most_common(20):
+                self.stdout.write(f'  {field} "{value}": {count} case(s)')
+        if options['report']:
+            with open(options['report'], 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['case_id', 'case_number', 'unmatched', 'state', 'district', 'tehsil'])
+                for case, field in unmatched:
+                    writer.writerow([case.id, case.case_number, field, case.state, case.district, case.tehsil])
+            self.stdout.write(f'Unmatched cases written to {options["report"]}')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from cases.locations import bundle_path, location_bundle_digest, location_bundle_url
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the State -> District -> Tehsil tree as the content-hashed JSON bundle the "
+        "case forms filter locally. Pages re-export it on their own after a location "
+        "changes; run this on deploy or after bulk imports (seed_locations) so the first "
+        "page view does not have to."
+    )
+
+    def handle(self, *args, **options):
+        digest = location_bundle_digest()
+        self.stdout.write(self.style.SUCCESS(
+            f'Location bundle {location_bundle_url()} written to {bundle_path(digest)}'
+        ))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.utils import OperationalError
+
+from cases.global_search import rebuild_global_index
+from cases.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the SQLite FTS5 search indexes: the case search index and the global "
+        "search index over banks, branches, employees and locations. Both are kept up to "
+        "date on every save and delete; run this after bulk imports (seed_locations), raw "
+        "SQL edits or restoring a database copy."
+    )
+
+    def handle(self, *args, **options):
+        try:
+            count = rebuild_index()
+            others = rebuild_global_index()
+        except OperationalError as exc:
+            raise CommandError(f'Could not build the FTS5 index (is SQLite compiled with FTS5?): {exc}')
+        if count is None:
+            self.stdout.write('Not an SQLite database; search uses the ORM filters, nothing to rebuild.')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {count} case(s) and {others} bank/branch/employee/location record(s) for search.'
+        ))
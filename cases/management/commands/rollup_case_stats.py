@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from cases.models import Case, CaseDailyStat
+from cases.rollups import rebuild_range
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the CaseDailyStat daily rollup used by the dashboard trend API. "
+        "By default recomputes yesterday and today; use --since or --all for a backfill."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2, help='Number of recent days to rebuild, ending today (default 2)')
+        parser.add_argument('--since', type=str, help='Rebuild from this date (YYYY-MM-DD) up to today')
+        parser.add_argument('--all', action='store_true', help='Rebuild the full history starting at the oldest case')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options['all']:
+            oldest = Case.objects.aggregate(first=Min('created_at'))['first']
+            if not oldest:
+                CaseDailyStat.objects.all().delete()
+                self.stdout.write('No cases found; rollup cleared.')
+                return
+            start = timezone.localtime(oldest).date()
+        elif options['since']:
+            try:
+                start = datetime.strptime(options['since'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--since must be in YYYY-MM-DD format')
+        else:
+            start = today - timedelta(days=max(options['days'], 1) - 1)
+        if start > today:
+            raise CommandError('Start date is in the future.')
+
+        written = rebuild_range(start, today)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt daily rollup for {start} .. {today}: {written} row(s).'))
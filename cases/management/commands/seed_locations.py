@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from cases.caching import bump_location_generation
+from cases.global_search import rebuild_global_index
 from cases.models import State, District, Tehsil
 import csv
 from pathlib import Path
@@ -10,25 +12,49 @@ STATES = [
     'Sikkim','Tamil Nadu','Telangana','Tripura','Uttar Pradesh','Uttarakhand','West Bengal',
     'Andaman and Nicobar Islands','Chandigarh','Dadra and Nagar Haveli and Daman and Diu','Delhi','Jammu and Kashmir','Ladakh','Lakshadweep','Puducherry'
 ]
+# Unknown parents are listed one by one up to this many per file, then only counted
+MAX_WARNINGS = 20
+
+
+def _key(name):
+    return name.strip().lower()
+
 
 class Command(BaseCommand):
-    help = "Seed States, Districts, and Tehsils from CSV files in cases/data. Files: districts.csv (state,district), tehsils.csv (state,district,tehsil)"
+    help = (
+        "Seed States, Districts, and Tehsils from CSV files in cases/data. Files: districts.csv (state,district), "
+        "tehsils.csv (state,district,tehsil). Rows are streamed, parents are resolved from in-memory maps "
+        "(names match case-insensitively) and new rows are inserted in batches; rows already present are skipped, "
+        "so re-running after the CSVs gain rows only adds those."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument('--reset', action='store_true', help='Delete existing District/Tehsil and reseed (States preserved)')
         parser.add_argument('--data-dir', type=str, default='cases/data', help='Directory containing CSVs')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT (default 1000)')
 
     def handle(self, *args, **options):
         data_dir = Path(options['data_dir'])
         districts_csv = data_dir / 'districts.csv'
         tehsils_csv = data_dir / 'tehsils.csv'
+        self.batch_size = max(options['batch_size'], 1)
 
         with transaction.atomic():
             # Seed States
             self.stdout.write(self.style.NOTICE('Seeding States...'))
+            states = self.state_map()
+            new_states, skipped = [], 0
             for name in STATES:
-                State.objects.get_or_create(name=name)
-            self.stdout.write(self.style.SUCCESS(f'Seeded {State.objects.count()} states.'))
+                if _key(name) in states:
+                    skipped += 1
+                    continue
+                states[_key(name)] = None
+                new_states.append(State(name=name))
+            before = State.objects.count()
+            self.insert(State, new_states)
+            inserted = State.objects.count() - before
+            self.report('States', inserted, skipped + len(new_states) - inserted)
+            states = self.state_map()
 
             if options['reset']:
                 self.stdout.write(self.style.WARNING('Reset mode: deleting all Districts and Tehsils...'))
@@ -36,50 +62,115 @@ class Command(BaseCommand):
                 District.objects.all().delete()
 
             # Seed Districts
-            if districts_csv.exists():
-                self.stdout.write(self.style.NOTICE(f'Seeding Districts from {districts_csv}...'))
-                count = 0
-                with districts_csv.open(newline='', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        state_name = (row.get('state') or '').strip()
-                        district_name = (row.get('district') or '').strip()
-                        if not state_name or not district_name:
-                            continue
-                        state = State.objects.filter(name__iexact=state_name).first()
-                        if not state:
-                            self.stdout.write(self.style.WARNING(f'State not found for district: {state_name} / {district_name}'))
-                            continue
-                        District.objects.get_or_create(name=district_name, state=state)
-                        count += 1
-                self.stdout.write(self.style.SUCCESS(f'District seed processed {count} rows. Current Districts: {District.objects.count()}'))
-            else:
+            if not districts_csv.exists():
                 self.stdout.write(self.style.WARNING('districts.csv not found; skipping District seed.'))
+            else:
+                self.stdout.write(self.style.NOTICE(f'Seeding Districts from {districts_csv}...'))
+                self.seed_districts(districts_csv, states)
 
             # Seed Tehsils
-            if tehsils_csv.exists():
-                self.stdout.write(self.style.NOTICE(f'Seeding Tehsils from {tehsils_csv}...'))
-                count = 0
-                with tehsils_csv.open(newline='', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        state_name = (row.get('state') or '').strip()
-                        district_name = (row.get('district') or '').strip()
-                        tehsil_name = (row.get('tehsil') or '').strip()
-                        if not state_name or not district_name or not tehsil_name:
-                            continue
-                        state = State.objects.filter(name__iexact=state_name).first()
-                        if not state:
-                            self.stdout.write(self.style.WARNING(f'State not found for tehsil: {state_name} / {district_name} / {tehsil_name}'))
-                            continue
-                        district = District.objects.filter(name__iexact=district_name, state=state).first()
-                        if not district:
-                            self.stdout.write(self.style.WARNING(f'District not found for tehsil: {state_name} / {district_name} / {tehsil_name}'))
-                            continue
-                        Tehsil.objects.get_or_create(name=tehsil_name, district=district)
-                        count += 1
-                self.stdout.write(self.style.SUCCESS(f'Tehsil seed processed {count} rows. Current Tehsils: {Tehsil.objects.count()}'))
-            else:
+            if not tehsils_csv.exists():
                 self.stdout.write(self.style.WARNING('tehsils.csv not found; skipping Tehsil seed.'))
+            else:
+                self.stdout.write(self.style.NOTICE(f'Seeding Tehsils from {tehsils_csv}...'))
+                self.seed_tehsils(tehsils_csv, states)
 
+            # bulk_create sends no signals: invalidate the location index/bundle and refresh
+            # the global search entries for the new rows
+            bump_location_generation()
+            rebuild_global_index()
         self.stdout.write(self.style.SUCCESS('Location seeding complete.'))
+
+    def state_map(self):
+        return {_key(name): pk for pk, name in State.objects.values_list('id', 'name')}
+
+    def insert(self, model, objs):
+        """Insert ``objs`` in batches, ignoring rows that already exist."""
+        for start in range(0, len(objs), self.batch_size):
+            model.objects.bulk_create(objs[start:start + self.batch_size], ignore_conflicts=True)
+
+    def report(self, label, inserted, skipped, unknown=0, blank=0):
+        self.stdout.write(self.style.SUCCESS(
+            f'{label}: {inserted} inserted, {skipped} skipped (already present), {unknown} unknown parent, {blank} blank row(s).'
+        ))
+
+    def warn_unknown(self, unknown, message):
+        if unknown <= MAX_WARNINGS:
+            self.stdout.write(self.style.WARNING(message))
+        elif unknown == MAX_WARNINGS + 1:
+            self.stdout.write(self.style.WARNING('Further unknown parents are only counted.'))
+
+    def seed_districts(self, path, states):
+        existing = {(state_id, _key(name)) for state_id, name in District.objects.values_list('state_id', 'name')}
+        new, skipped, unknown, blank, sent = [], 0, 0, 0, 0
+        before = District.objects.count()
+        with path.open(newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                state_name = (row.get('state') or '').strip()
+                district_name = (row.get('district') or '').strip()
+                if not state_name or not district_name:
+                    blank += 1
+                    continue
+                state_id = states.get(_key(state_name))
+                if state_id is None:
+                    unknown += 1
+                    self.warn_unknown(unknown, f'State not found for district: {state_name} / {district_name}')
+                    continue
+                key = (state_id, _key(district_name))
+                if key in existing:
+                    skipped += 1
+                    continue
+                existing.add(key)
+                new.append(District(state_id=state_id, name=district_name))
+                if len(new) >= self.batch_size:
+                    sent += len(new)
+                    self.insert(District, new)
+                    new = []
+        sent += len(new)
+        self.insert(District, new)
+        # bulk_create(ignore_conflicts=True) does not say which rows it kept, so count once
+        inserted = District.objects.count() - before
+        # Rows another writer added in the meantime were ignored as conflicts
+        self.report('Districts', inserted, skipped + sent - inserted, unknown, blank)
+
+    def seed_tehsils(self, path, states):
+        districts = {
+            (state_id, _key(name)): pk for pk, state_id, name in District.objects.values_list('id', 'state_id', 'name')
+        }
+        existing = {(district_id, _key(name)) for district_id, name in Tehsil.objects.values_list('district_id', 'name')}
+        new, skipped, unknown, blank, sent = [], 0, 0, 0, 0
+        before = Tehsil.objects.count()
+        with path.open(newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                state_name = (row.get('state') or '').strip()
+                district_name = (row.get('district') or '').strip()
+                tehsil_name = (row.get('tehsil') or '').strip()
+                if not state_name or not district_name or not tehsil_name:
+                    blank += 1
+                    continue
+                state_id = states.get(_key(state_name))
+                if state_id is None:
+                    unknown += 1
+                    self.warn_unknown(unknown, f'State not found for tehsil: {state_name} / {district_name} / {tehsil_name}')
+                    continue
+                district_id = districts.get((state_id, _key(district_name)))
+                if district_id is None:
+                    unknown += 1
+                    self.warn_unknown(unknown, f'District not found for tehsil: {state_name} / {district_name} / {tehsil_name}')
+                    continue
+                key = (district_id, _key(tehsil_name))
+                if key in existing:
+                    skipped += 1
+                    continue
+                existing.add(key)
+                new.append(Tehsil(district_id=district_id, name=tehsil_name))
+                if len(new) >= self.batch_size:
+                    sent += len(new)
+                    self.insert(Tehsil, new)
+                    new = []
+        sent += len(new)
+        self.insert(Tehsil, new)
+        # bulk_create(ignore_conflicts=True) does not say which rows it kept, so count once
+        inserted = Tehsil.objects.count() - before
+        # Rows another writer added in the meantime were ignored as conflicts
+        self.report('Tehsils', inserted, skipped + sent - inserted, unknown, blank)
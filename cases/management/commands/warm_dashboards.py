@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.db.models import Q
+from django.test import RequestFactory
+
+from accounts.views import dashboard
+from cases.models import Employee
+from cases.roles import get_role
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every active employee's dashboard once so the cached dashboard fragments "
+        "(admin statistics, advocate trays, SRO queues) are warm. The fragments live in the "
+        "default cache, so run it where the web processes read that cache: on the web host "
+        "(the file-based cache is per host), or anywhere once CACHES points at a shared "
+        "backend. Run it after migrations on a deploy and from a scheduler just after "
+        "midnight, when the date-keyed fragments roll over."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Dashboards rendered in parallel (default 4; use 1 for SQLite under write load)')
+
+    def handle(self, *args, **options):
+        # Admins first: their fragments are shared, so later admin renders are cache hits.
+        employees = list(
+            Employee.objects.filter(is_active=True, user__is_active=True)
+            .select_related('user')
+            .order_by('-user__is_superuser', 'employee_type', 'id')
+        )
+        users = [emp.user for emp in employees]
+        # Admins without an Employee profile get their own dashboard variant
+        profileless_admin = (
+            User.objects.filter(is_active=True, employee__isnull=True)
+            .filter(Q(is_superuser=True) | Q(groups__name__in=['ADMIN', 'CO-ADMIN']))
+            .order_by('id').first()
+        )
+        if profileless_admin:
+            users.insert(0, profileless_admin)
+        if not users:
+            self.stdout.write('No active employees; nothing to warm.')
+            return
+
+        # Shared fragments are rendered serially up front so the parallel pass does not
+        # compute the same admin statistics several times over.
+        head = [u for u in users if self._is_admin(u)][:1]
+        if profileless_admin and profileless_admin not in head:
+            head.insert(0, profileless_admin)
+        rest = [u for u in users if u not in head]
+        failures = [err for err in map(self._warm, head) if err]
+
+        workers = max(options['workers'], 1)
+        if workers == 1:
+            failures += [err for err in map(self._warm, rest) if err]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                failures += [err for err in pool.map(self._warm_in_thread, rest) if err]
+
+        for err in failures:
+            self.stderr.write(self.style.WARNING(err))
+        self.stdout.write(self.style.SUCCESS(
+            f'Warmed {len(users) - len(failures)} of {len(users)} dashboard(s).'
+        ))
+
+    @staticmethod
+    def _is_admin(user):
+        return get_role(user).is_admin
+
+    def _warm(self, user):
+        request = RequestFactory().get('/accounts/dashboard/')
+        request.user = user
+        request.session = SessionBase()
+        request.role = get_role(user, request.session)
+        request._messages = FallbackStorage(request)
+        try:
+            response = dashboard(request)
+        except Exception as exc:
+            return f'{user.username}: {exc}'
+        if response.status_code != 200:
+            return f'{user.username}: HTTP {response.status_code}'
+        return None
+
+    def _warm_in_thread(self, user):
+        close_old_connections()
+        try:
+            return self._warm(user)
+        finally:
+            connections.close_all()
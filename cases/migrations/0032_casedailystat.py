@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 22:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Bank', '0005_bankdocument'),
+        ('cases', '0031_alter_case_case_number_alter_case_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('quotation', 'Quotation'), ('positive', 'Positive'), ('negative', 'Negative'), ('on_hold', 'On Hold'), ('on_query', 'On Query'), ('query', 'Query'), ('document_pending', 'Document Pending'), ('sro_document_pending', 'SRO Document Pending'), ('positive_subject_tosearch', 'Positive Subject to Search'), ('draft_positive_subject_tosearch', 'Draft Positive Subject to Search'), ('pending_assignment', 'Pending Assignment'), ('pending', 'Pending')], max_length=50)),
+                ('new_cases', models.PositiveIntegerField(default=0)),
+                ('completed_cases', models.PositiveIntegerField(default=0)),
+                ('bank', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='Bank.bank')),
+            ],
+            options={
+                'verbose_name': 'Case Daily Stat',
+                'verbose_name_plural': 'Case Daily Stats',
+                'ordering': ['date', 'bank', 'status'],
+                'unique_together': {('date', 'bank', 'status')},
+            },
+        ),
+    ]
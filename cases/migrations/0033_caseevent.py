@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 23:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0032_casedailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('case_pk', models.PositiveIntegerField()),
+                ('case_number', models.CharField(blank=True, max_length=100)),
+                ('is_child', models.BooleanField(default=False)),
+                ('old_status', models.CharField(blank=True, max_length=50)),
+                ('new_status', models.CharField(blank=True, max_length=50)),
+                ('old_advocate_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('new_advocate_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Case Event',
+                'verbose_name_plural': 'Case Events',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Bank', '0005_bankdocument'),
+        ('cases', '0033_caseevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['-updated_at', '-id'], name='case_updated_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['-created_at', '-id'], name='case_created_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+FTS_TABLE = 'cases_case_fts'
+
+
+def create_fts_index(apps, schema_editor):
+    # SQLite only; other databases keep using the ORM search filters
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "applicant_name, case_number, legal_reference_number, tokenize='trigram')"
+        )
+    except OperationalError:
+        # SQLite built without FTS5 (or older than 3.34): search falls back to the ORM
+        return
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, applicant_name, case_number, legal_reference_number) "
+        "SELECT id, COALESCE(applicant_name, ''), COALESCE(case_number, ''), COALESCE(legal_reference_number, '') "
+        "FROM cases_case"
+    )
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0034_case_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+FTS_TABLE = 'cases_case_fts'
+
+
+def add_family_column(apps, schema_editor):
+    # FTS5 tables cannot be altered: recreate with the family column and refill
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "applicant_name, case_number, legal_reference_number, family, tokenize='trigram')"
+        )
+    except OperationalError:
+        return
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, applicant_name, case_number, legal_reference_number, family) "
+        "SELECT p.id, COALESCE(p.applicant_name, ''), COALESCE(p.case_number, ''), COALESCE(p.legal_reference_number, ''), "
+        "CASE WHEN p.parent_case_id IS NULL THEN COALESCE(("
+        "SELECT group_concat(COALESCE(c.applicant_name, '') || char(10) || COALESCE(c.case_number, '') || char(10) "
+        "|| COALESCE(c.legal_reference_number, ''), char(10)) "
+        "FROM (SELECT * FROM cases_case WHERE parent_case_id = p.id ORDER BY id) c), '') ELSE '' END "
+        "FROM cases_case p"
+    )
+
+
+def drop_family_column(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "applicant_name, case_number, legal_reference_number, tokenize='trigram')"
+        )
+    except OperationalError:
+        return
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, applicant_name, case_number, legal_reference_number) "
+        "SELECT id, COALESCE(applicant_name, ''), COALESCE(case_number, ''), COALESCE(legal_reference_number, '') "
+        "FROM cases_case"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0035_case_search_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_family_column, drop_family_column),
+    ]
@@ -0,0 +1,72 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+GLOBAL_FTS_TABLE = 'cases_global_fts'
+KINDS = ('bank', 'branch', 'employee', 'state', 'district', 'tehsil')
+EMPLOYEE_TYPES = {'advocate': 'Advocate', 'sro': 'SRO', 'admin': 'Admin'}
+
+
+def _terms(*values):
+    return '\n'.join(v for v in values if v)
+
+
+def create_global_index(apps, schema_editor):
+    # SQLite only; other databases use the ORM fallback of the global search
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {GLOBAL_FTS_TABLE} USING fts5("
+            "kind UNINDEXED, object_id UNINDEXED, parent_id UNINDEXED, label UNINDEXED, detail UNINDEXED, "
+            "terms, tokenize='trigram')"
+        )
+    except OperationalError:
+        return
+    Bank = apps.get_model('Bank', 'Bank')
+    BankBranch = apps.get_model('Bank', 'BankBranch')
+    Employee = apps.get_model('cases', 'Employee')
+    State = apps.get_model('cases', 'State')
+    District = apps.get_model('cases', 'District')
+    Tehsil = apps.get_model('cases', 'Tehsil')
+
+    rows = []
+
+    def add(kind, pk, parent_id, label, detail, terms):
+        rows.append((pk * len(KINDS) + KINDS.index(kind), kind, pk, parent_id, label or '', detail or '', terms))
+
+    for pk, name in Bank.objects.values_list('id', 'name'):
+        add('bank', pk, None, name, 'Bank', _terms(name))
+    for pk, bank_id, name, code, bank in BankBranch.objects.values_list('id', 'bank_id', 'name', 'branch_code', 'bank__name'):
+        add('branch', pk, bank_id, name, f'{bank} · {code}' if code else bank, _terms(name, code))
+    for pk, name, employee_id, initials, employee_type in Employee.objects.values_list('id', 'name', 'employee_id', 'initials', 'employee_type'):
+        add('employee', pk, None, name, f'{employee_id} · {EMPLOYEE_TYPES.get(employee_type, employee_type)}', _terms(name, employee_id, initials))
+    for pk, name in State.objects.values_list('id', 'name'):
+        add('state', pk, None, name, 'State', _terms(name))
+    for pk, state_id, name, state in District.objects.values_list('id', 'state_id', 'name', 'state__name'):
+        add('district', pk, state_id, name, state, _terms(name))
+    for pk, district_id, name, district, state in Tehsil.objects.values_list('id', 'district_id', 'name', 'district__name', 'district__state__name'):
+        add('tehsil', pk, district_id, name, f'{district}, {state}', _terms(name))
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {GLOBAL_FTS_TABLE} (rowid, kind, object_id, parent_id, label, detail, terms) '
+            'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+def drop_global_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {GLOBAL_FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Bank', '0005_bankdocument'),
+        ('cases', '0036_case_search_family'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_global_index, drop_global_index),
+    ]
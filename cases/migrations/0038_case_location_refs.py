@@ -0,0 +1,29 @@
+# Generated by Django 5.2 on 2026-10-19 00:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0037_global_search_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='district_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cases', to='cases.district'),
+        ),
+        migrations.AddField(
+            model_name='case',
+            name='state_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cases', to='cases.state'),
+        ),
+        migrations.AddField(
+            model_name='case',
+            name='tehsil_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cases', to='cases.tehsil'),
+        ),
+    ]
@@ -97,6 +97,27 @@ class EmployeeDocument(models.Model):
 		return f"{self.name} for {self.employee.name}"
 
 
+class CaseQuerySet(models.QuerySet):
+	def visible_to(self, role):
+		"""The cases ``role`` (a cases.roles.Role, e.g. ``request.role``) may see.
+
+		The one scoping rule for list and detail views: admins and admin employees see every
+		case, SROs the cases in their location scope (all of them when none is configured),
+		advocates the cases assigned to them and those cases' children, anyone else nothing.
+		Built from the role alone, so scoping a lookup adds no query.
+		"""
+		if role.is_admin or role.employee_type == Employee.ADMIN:
+			return self
+		if role.is_sro:
+			return role.sro_scope.filter(self)
+		if role.is_advocate:
+			return self.filter(
+				models.Q(assigned_advocate_id=role.employee_id) |
+				models.Q(parent_case__assigned_advocate_id=role.employee_id)
+			)
+		return self.none()
+
+
 class Case(models.Model):
 	STATUS_CHOICES = [
 		('draft', 'Draft'),
@@ -141,6 +162,11 @@ class Case(models.Model):
 	state = models.CharField(max_length=100, blank=True, null=True)
 	tehsil = models.CharField(max_length=100, blank=True, null=True)
 	district = models.CharField(max_length=100, blank=True, null=True)
+	# The State/District/Tehsil rows the text above names (cases.locations.link_case_locations,
+	# run on every save that changes the text; backfill_case_locations for older rows)
+	state_ref = models.ForeignKey(State, on_delete=models.SET_NULL, related_name='cases', blank=True, null=True)
+	district_ref = models.ForeignKey(District, on_delete=models.SET_NULL, related_name='cases', blank=True, null=True)
+	tehsil_ref = models.ForeignKey(Tehsil, on_delete=models.SET_NULL, related_name='cases', blank=True, null=True)
 	is_school_case = models.BooleanField(default=False, help_text="Mark if this is a school case for duplicate checks")
 	branch = models.ForeignKey(BankBranch, on_delete=models.PROTECT, related_name='meta_data_cases', blank=True, null=True)
 	receipt_number = models.CharField(max_length=50, blank=True, null=True)
@@ -162,6 +188,15 @@ class Case(models.Model):
 	# Relationship to original (parent) case when created as an additional property case
 	parent_case = models.ForeignKey('self', on_delete=models.CASCADE, related_name='child_cases', blank=True, null=True)
 
+	objects = CaseQuerySet.as_manager()
+
+	@classmethod
+	def from_db(cls, db, field_names, values):
+		"""Keep the values as loaded so save hooks can see what changed without re-querying."""
+		instance = super().from_db(db, field_names, values)
+		instance._loaded_values = dict(zip(field_names, values))
+		return instance
+
 	def has_complete_details(self):
 		"""Return True if all key working details (post-refactor) are present to allow final actions.
 		Updated requirement: property_address, state, district, tehsil, branch.
@@ -185,6 +220,8 @@ class Case(models.Model):
 		"""Ensure all child cases have the same status as this parent case."""
 		if self.pk:
 			self.child_cases.update(status=self.status)
+			from .caching import bump_case_data_generation
+			bump_case_data_generation()
 
 	def generate_legal_reference_number(self):
 		"""Generate and assign LRN if not set.
@@ -270,6 +307,11 @@ class Case(models.Model):
 		verbose_name = "Case"
 		verbose_name_plural = "Cases"
 		unique_together = [['case_number', 'case_type']]
+		indexes = [
+			# Keyset pagination keys for case lists (cases.pagination)
+			models.Index(fields=['-updated_at', '-id'], name='case_updated_keyset_idx'),
+			models.Index(fields=['-created_at', '-id'], name='case_created_keyset_idx'),
+		]
 
 
 ## CaseCharge removed (legacy extra charges application deprecated)
@@ -347,3 +389,47 @@ class Remark(models.Model):
 		return f"Remark for {self.case.case_name} on {self.created_at.date()}"
 
 
+
+
+class CaseDailyStat(models.Model):
+	"""Daily rollup of case activity, one row per (date, bank, status).
+	new_cases counts cases created on that local date; completed_cases counts cases whose
+	completed_at falls on it. Rows are rebuilt by cases.rollups (signals + rollup_case_stats).
+	"""
+	date = models.DateField()
+	bank = models.ForeignKey(ExternalBank, on_delete=models.CASCADE, related_name='daily_stats')
+	status = models.CharField(max_length=50, choices=Case.STATUS_CHOICES)
+	new_cases = models.PositiveIntegerField(default=0)
+	completed_cases = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		unique_together = [['date', 'bank', 'status']]
+		ordering = ['date', 'bank', 'status']
+		verbose_name = "Case Daily Stat"
+		verbose_name_plural = "Case Daily Stats"
+
+	def __str__(self):
+		return f"{self.date} {self.bank_id} {self.status}: +{self.new_cases} / done {self.completed_cases}"
+
+
+class CaseEvent(models.Model):
+	"""Append-only feed of case status and assignment changes.
+	Written in the same transaction as the case change (cases.events) and streamed to open
+	dashboards by the server-sent events endpoint; old rows are pruned as new ones arrive.
+	"""
+	case_pk = models.PositiveIntegerField()
+	case_number = models.CharField(max_length=100, blank=True)
+	is_child = models.BooleanField(default=False)
+	old_status = models.CharField(max_length=50, blank=True)
+	new_status = models.CharField(max_length=50, blank=True)
+	old_advocate_id = models.PositiveIntegerField(blank=True, null=True)
+	new_advocate_id = models.PositiveIntegerField(blank=True, null=True)
+	created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+	class Meta:
+		ordering = ['id']
+		verbose_name = "Case Event"
+		verbose_name_plural = "Case Events"
+
+	def __str__(self):
+		return f"{self.case_number}: {self.old_status or '-'} -> {self.new_status or '-'}"
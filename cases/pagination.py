@@ -0,0 +1,143 @@
+"""Keyset (cursor) pagination for case lists.
+
+Pages are cut on a ``(<timestamp field>, id)`` key instead of OFFSET, so every page is one
+indexed range read however deep the user goes. Lists run newest first unless asked for
+ascending order. Cursors are opaque tokens for the first/last row of the current page;
+``?after=`` walks forward through the list (to older rows by default), ``?before=`` back,
+and ``?per_page=`` picks the page size. Several lists on one page each take a ``prefix``
+for their cursor parameters (``?today_after=``) so they page independently.
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+PAGE_SIZE_CHOICES = [25, 50, 100, 200]
+DEFAULT_PAGE_SIZE = 50
+
+
+def encode_cursor(value, pk):
+	raw = f'{value.isoformat()}|{pk}'.encode()
+	return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+	"""Return ``(datetime, pk)`` for a cursor token, or None when it is malformed."""
+	try:
+		padded = token + '=' * (-len(token) % 4)
+		value, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+		return datetime.fromisoformat(value), int(pk)
+	except (ValueError, TypeError, UnicodeDecodeError):
+		return None
+
+
+class KeysetPage:
+	"""One page of a keyset-paginated queryset; iterate it like the queryset it replaces."""
+
+	def __init__(self, object_list, field, per_page, has_next, has_previous, params, prefix=''):
+		self.object_list = object_list
+		self.field = field
+		self.per_page = per_page
+		self.has_next = has_next
+		self.has_previous = has_previous
+		self.page_size_choices = PAGE_SIZE_CHOICES
+		self.prefix = prefix
+		self._params = params
+
+	def __iter__(self):
+		return iter(self.object_list)
+
+	def __len__(self):
+		return len(self.object_list)
+
+	def __bool__(self):
+		return bool(self.object_list)
+
+	def __getitem__(self, index):
+		return self.object_list[index]
+
+	@property
+	def has_other_pages(self):
+		return self.has_next or self.has_previous
+
+	def _cursor(self, obj):
+		return encode_cursor(getattr(obj, self.field), obj.pk)
+
+	def _query(self, **extra):
+		params = self._params.copy()
+		for key, value in extra.items():
+			params[key] = value
+		return params.urlencode()
+
+	@property
+	def next_cursor(self):
+		return self._cursor(self.object_list[-1]) if self.has_next else None
+
+	@property
+	def previous_cursor(self):
+		return self._cursor(self.object_list[0]) if self.has_previous else None
+
+	@property
+	def next_query(self):
+		"""Query string for the next (older) page, keeping filters and page size."""
+		if not self.has_next:
+			return ''
+		return self._query(**{f'{self.prefix}after': self._cursor(self.object_list[-1])})
+
+	@property
+	def previous_query(self):
+		"""Query string for the previous (newer) page."""
+		if not self.has_previous:
+			return ''
+		return self._query(**{f'{self.prefix}before': self._cursor(self.object_list[0])})
+
+	@property
+	def first_query(self):
+		return self._query()
+
+
+def keyset_paginate(request, queryset, field='updated_at', per_page=None, descending=True, prefix=''):
+	"""Return the KeysetPage of ``queryset`` selected by the request's cursor parameters.
+
+	``queryset`` may carry any filters; its ordering is replaced by ``-field, -id`` (or
+	``field, id`` with ``descending=False``). Only the rows of the page (plus one probe row)
+	are fetched. ``prefix`` names the cursor parameters (``<prefix>after``/``<prefix>before``).
+	"""
+	try:
+		per_page = int(request.GET.get('per_page') or per_page or DEFAULT_PAGE_SIZE)
+	except ValueError:
+		per_page = DEFAULT_PAGE_SIZE
+	if per_page not in PAGE_SIZE_CHOICES:
+		per_page = DEFAULT_PAGE_SIZE
+
+	params = request.GET.copy()
+	for key in (f'{prefix}after', f'{prefix}before', 'page'):
+		params.pop(key, None)
+	params['per_page'] = per_page
+
+	after = decode_cursor(request.GET.get(f'{prefix}after') or '')
+	before = None if after else decode_cursor(request.GET.get(f'{prefix}before') or '')
+
+	# Lookups and orderings that move forward / back through the list
+	ahead, behind = ('lt', 'gt') if descending else ('gt', 'lt')
+	forward = (f'-{field}', '-id') if descending else (field, 'id')
+	backward = (field, 'id') if descending else (f'-{field}', '-id')
+
+	if before:
+		value, pk = before
+		rows = list(
+			queryset.filter(Q(**{f'{field}__{behind}': value}) | Q(**{field: value, f'pk__{behind}': pk}))
+			.order_by(*backward)[:per_page + 1]
+		)
+		has_previous = len(rows) > per_page
+		rows = rows[:per_page][::-1]
+		return KeysetPage(rows, field, per_page, has_next=True, has_previous=has_previous, params=params, prefix=prefix)
+
+	if after:
+		value, pk = after
+		queryset = queryset.filter(Q(**{f'{field}__{ahead}': value}) | Q(**{field: value, f'pk__{ahead}': pk}))
+	rows = list(queryset.order_by(*forward)[:per_page + 1])
+	has_next = len(rows) > per_page
+	return KeysetPage(
+		rows[:per_page], field, per_page, has_next=has_next, has_previous=bool(after), params=params, prefix=prefix,
+	)
@@ -0,0 +1,79 @@
+"""Reusable case list querysets shared by the dashboards and list views."""
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Case
+
+CASE_LIST_RELATED = ('bank', 'branch', 'case_type', 'assigned_advocate')
+
+SRO_ELIGIBLE_STATUSES = ['positive_subject_tosearch', 'negative', 'positive']
+SRO_DASHBOARD_KEYS = (
+	'sro_all_cases', 'sro_total_cases', 'sro_pss_cases', 'sro_pss_count',
+	'sro_negative_cases', 'sro_negative_count', 'sro_positive_cases', 'sro_positive_count',
+)
+
+
+def child_count_subquery():
+	"""Number of child cases of the outer row, as a correlated subquery.
+
+	Unlike ``Count('child_cases')`` this adds no join or GROUP BY to the list query, and
+	SQLite only evaluates it for the rows actually returned (a page, not the whole filter).
+	"""
+	counts = (
+		Case.objects.filter(parent_case=OuterRef('pk')).order_by()
+		.values('parent_case').annotate(n=Count('id')).values('n')
+	)
+	return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def case_list(queryset=None, related=CASE_LIST_RELATED, with_children=False):
+	"""Prepare ``queryset`` (default: all cases) for a rendered case list.
+
+	Joins ``related``, annotates ``child_count`` for the "N linked" badges and, with
+	``with_children``, prefetches the child cases for templates that list them. Rendering
+	any number of rows then costs one query (two with children) instead of one or two
+	COUNT queries per row.
+	"""
+	if queryset is None:
+		queryset = Case.objects.all()
+	queryset = queryset.select_related(*related).annotate(child_count=child_count_subquery())
+	if with_children:
+		queryset = queryset.prefetch_related('child_cases')
+	return queryset
+
+
+def sro_eligible_cases():
+	"""Cases an SRO works on: PSTS, or Positive/Negative explicitly forwarded to SRO.
+
+	Rows come from ``case_list`` with bank, case type and advocate joined, ``child_count``
+	annotated and their children prefetched, so listing them never issues per-row queries.
+	"""
+	return case_list(
+		Case.objects.filter(
+			Q(forwarded_to_sro=True) | Q(status='positive_subject_tosearch'),
+			status__in=SRO_ELIGIBLE_STATUSES,
+		),
+		related=('bank', 'case_type', 'assigned_advocate'),
+		with_children=True,
+	)
+
+
+def split_sro_cases(cases):
+	"""Evaluate ``cases`` once and split it into the SRO dashboard lists and counters."""
+	cases = list(cases)
+	pss, negative, positive = [], [], []
+	buckets = {'positive_subject_tosearch': pss, 'negative': negative, 'positive': positive}
+	for case in cases:
+		bucket = buckets.get(case.status)
+		if bucket is not None:
+			bucket.append(case)
+	return {
+		'sro_all_cases': cases,
+		'sro_total_cases': len(cases),
+		'sro_pss_cases': pss,
+		'sro_pss_count': len(pss),
+		'sro_negative_cases': negative,
+		'sro_negative_count': len(negative),
+		'sro_positive_cases': positive,
+		'sro_positive_count': len(positive),
+	}
@@ -0,0 +1,116 @@
+"""The signed-in user's role, resolved once per request.
+
+``RoleMiddleware`` puts a lazy ``request.role`` on every request. On first use it works
+out whether the user is an admin (ADMIN/CO-ADMIN group or superuser) and which Employee
+profile (and employee type) they have; the decorators, ``get_user_employee``,
+``check_case_access`` and the views all read that instead of querying groups and
+Employee again. The role is memoized on the user object, so helpers that only receive
+``request.user`` share it.
+
+The facts are also kept in the session, tagged with the role generation; a request with a
+current entry resolves the role without touching the database (the Employee row itself
+is only loaded when a view asks for it). Group membership, superuser, group and
+employee changes bump the generation (see cases.signals), so the next request of every
+session re-resolves its role.
+"""
+from django.utils.functional import SimpleLazyObject, cached_property
+
+from .caching import role_generation
+from .models import Employee
+from .scopes import sro_scope
+
+ADMIN_GROUPS = ('ADMIN', 'CO-ADMIN')
+ROLE_SESSION_KEY = '_case_role'
+
+
+class Role:
+	"""What ``user`` may do: ``is_admin``, ``employee`` and the employee type flags."""
+
+	def __init__(self, user, session=None):
+		self.user = user
+		self._session = session
+
+	@cached_property
+	def _facts(self):
+		if not self.user.is_authenticated:
+			return {'is_admin': False, 'employee_id': None, 'employee_type': None, 'is_super_sro': False}
+		session = self._session
+		generation = role_generation()
+		if session is not None:
+			facts = session.get(ROLE_SESSION_KEY)
+			if facts and facts.get('generation') == generation and facts.get('user_id') == self.user.pk:
+				return facts
+		employee = Employee.objects.filter(user=self.user).first()
+		# Prime the employee property so this request does not load it again
+		self.__dict__['employee'] = employee
+		facts = {
+			'generation': generation,
+			'user_id': self.user.pk,
+			'is_admin': self.user.is_superuser or self.user.groups.filter(name__in=ADMIN_GROUPS).exists(),
+			'employee_id': employee.pk if employee else None,
+			'employee_type': employee.employee_type if employee else None,
+			'is_super_sro': bool(employee and employee.is_super_sro),
+		}
+		if session is not None:
+			session[ROLE_SESSION_KEY] = facts
+		return facts
+
+	@property
+	def is_admin(self):
+		return self._facts['is_admin']
+
+	@property
+	def employee_id(self):
+		return self._facts['employee_id']
+
+	@property
+	def employee_type(self):
+		return self._facts['employee_type']
+
+	@property
+	def is_advocate(self):
+		return self.employee_type == Employee.ADVOCATE
+
+	@property
+	def is_sro(self):
+		return self.employee_type == Employee.SRO
+
+	@property
+	def is_super_sro(self):
+		return self._facts['is_super_sro']
+
+	@cached_property
+	def sro_scope(self):
+		"""The compiled location scope (cases.scopes); unrestricted unless a plain SRO."""
+		facts = self._facts
+		return sro_scope(facts['employee_id'], facts['employee_type'], facts['is_super_sro'])
+
+	@cached_property
+	def employee(self):
+		"""The user's Employee profile, or None."""
+		employee_id = self._facts['employee_id']
+		if 'employee' in self.__dict__:
+			return self.__dict__['employee']
+		return Employee.objects.filter(pk=employee_id).first() if employee_id else None
+
+
+def get_role(user, session=None):
+	"""Return the Role of ``user``, resolved at most once per user object."""
+	role = getattr(user, '_case_role', None)
+	if role is None:
+		role = Role(user, session)
+		user._case_role = role
+	elif role._session is None:
+		role._session = session
+	return role
+
+
+class RoleMiddleware:
+	"""Attach a lazy ``request.role``; place it after AuthenticationMiddleware."""
+
+	def __init__(self, get_response):
+		self.get_response = get_response
+
+	def __call__(self, request):
+		request.role = SimpleLazyObject(lambda: get_role(request.user, getattr(request, 'session', None)))
+		return self.get_response(request)
@@ -0,0 +1,120 @@
+"""Daily case rollups backing the dashboard trend charts.
+
+CaseDailyStat holds one row per (date, bank, status). Rows are recomputed from the Case
+table for a date span, so rebuilding is idempotent and safe to run at any time.
+"""
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Case, CaseDailyStat
+
+# The Case fields a rollup row depends on
+ROLLUP_FIELDS = ('created_at', 'completed_at', 'status', 'bank_id')
+
+
+def rebuild_range(start, end, bank_ids=None):
+	"""Recompute rollup rows for local dates start..end (inclusive). Returns rows written."""
+	base = Case.objects.all()
+	if bank_ids is not None:
+		base = base.filter(bank_id__in=list(bank_ids))
+	counts = {}
+	created = (
+		base.filter(created_at__date__gte=start, created_at__date__lte=end)
+		.annotate(day=TruncDate('created_at'))
+		.values('day', 'bank_id', 'status')
+		.annotate(n=Count('id'))
+		.order_by()
+	)
+	for row in created:
+		counts.setdefault((row['day'], row['bank_id'], row['status']), [0, 0])[0] = row['n']
+	completed = (
+		base.filter(completed_at__date__gte=start, completed_at__date__lte=end)
+		.annotate(day=TruncDate('completed_at'))
+		.values('day', 'bank_id', 'status')
+		.annotate(n=Count('id'))
+		.order_by()
+	)
+	for row in completed:
+		counts.setdefault((row['day'], row['bank_id'], row['status']), [0, 0])[1] = row['n']
+
+	with transaction.atomic():
+		stale = CaseDailyStat.objects.filter(date__gte=start, date__lte=end)
+		if bank_ids is not None:
+			stale = stale.filter(bank_id__in=list(bank_ids))
+		stale.delete()
+		CaseDailyStat.objects.bulk_create([
+			CaseDailyStat(date=day, bank_id=bank_id, status=status, new_cases=n_new, completed_cases=n_done)
+			for (day, bank_id, status), (n_new, n_done) in counts.items()
+		], batch_size=500)
+	return len(counts)
+
+
+def rebuild_day(day, bank_ids=None):
+	"""Recompute rollup rows for a single local date."""
+	return rebuild_range(day, day, bank_ids=bank_ids)
+
+
+def _local_date(value):
+	if not isinstance(value, datetime):
+		return None
+	if timezone.is_aware(value):
+		return timezone.localtime(value).date()
+	return value.date()
+
+
+def affected_days(case):
+	"""Return {(date, bank_id)} pairs whose rollup rows a save/delete of `case` may change."""
+	loaded = getattr(case, '_loaded_values', {}) or {}
+	pairs = set()
+	bank_ids = {case.bank_id, loaded.get('bank_id')}
+	days = {
+		_local_date(case.created_at),
+		_local_date(case.completed_at),
+		_local_date(loaded.get('created_at')),
+		_local_date(loaded.get('completed_at')),
+	}
+	for day in days:
+		if day is None:
+			continue
+		for bank_id in bank_ids:
+			if isinstance(bank_id, int):
+				pairs.add((day, bank_id))
+	return pairs
+
+
+def rollup_inputs_changed(case):
+	"""True when a save of ``case`` changes a field its rollup rows are computed from."""
+	loaded = getattr(case, '_loaded_values', None)
+	if loaded is None:
+		return True
+	# A deferred field is not in __dict__ and is not written by the save
+	return any(
+		name in case.__dict__ and (name not in loaded or loaded[name] != case.__dict__[name])
+		for name in ROLLUP_FIELDS
+	)
+
+
+def refresh_for_case(case, created=False, deleted=False):
+	"""Rebuild the rollup rows touched by one case once the surrounding transaction commits.
+
+	A save that leaves created_at, completed_at, status and bank alone changes no row and
+	is skipped.
+	"""
+	if not (created or deleted) and not rollup_inputs_changed(case):
+		return
+	pairs = affected_days(case)
+	if not pairs:
+		return
+
+	def _apply():
+		by_day = {}
+		for day, bank_id in pairs:
+			by_day.setdefault(day, set()).add(bank_id)
+		for day, bank_ids in by_day.items():
+			rebuild_day(day, bank_ids=bank_ids)
+
+	transaction.on_commit(_apply)
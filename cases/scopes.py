@@ -0,0 +1,97 @@
+"""Compiled SRO location scopes.
+
+An SRO who is not a super SRO only works on cases whose state, district or tehsil is one
+of their allowed locations. ``sro_scope`` compiles an employee's allowed
+State/District/Tehsil rows once into frozen id sets plus the equivalent ``Q``, and keeps
+the result in the cache. A case is matched on its state_ref/district_ref/tehsil_ref ids.
+A case whose location text is not linked to a row (not backfilled yet, or unmatched) is
+compared by normalized (trimmed, lower-cased) name instead. Checking a case is then a
+set lookup and filtering a list adds one WHERE clause, with no query against the
+allowed_* tables. Cached scopes are keyed by the SRO scope generation, which the
+``m2m_changed`` handlers of the allowed_* fields and Employee/location saves bump (see
+cases.signals).
+"""
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Lower, Trim
+from django.db.models.lookups import In
+
+from .caching import sro_scope_generation
+from .models import Employee
+
+SCOPE_FIELDS = ('state', 'district', 'tehsil')
+# Scopes are keyed by generation, so this only bounds how long a stale entry lingers
+SCOPE_CACHE_SECONDS = 24 * 60 * 60
+
+
+def normalize_location(name):
+	return name.strip().lower() if name else None
+
+
+class SroScope:
+	"""Where an SRO may work; ``unrestricted`` for super SROs and everyone who is not an SRO."""
+
+	def __init__(self, unrestricted=False, states=(), districts=(), tehsils=()):
+		"""``states``, ``districts`` and ``tehsils`` are the allowed rows as (id, name) pairs."""
+		self.unrestricted = unrestricted
+		self.ids = {}
+		self.names = {}
+		for field, rows in zip(SCOPE_FIELDS, (states, districts, tehsils)):
+			rows = list(rows)
+			self.ids[field] = frozenset(pk for pk, _ in rows)
+			self.names[field] = frozenset(filter(None, (normalize_location(name) for _, name in rows)))
+		# Same test as allows(), for querysets; None when no location is configured
+		conditions = [
+			Q(**{f'{field}_ref__in': sorted(self.ids[field])})
+			| Q(**{f'{field}_ref__isnull': True}) & Q(In(Lower(Trim(field)), sorted(self.names[field])))
+			for field in SCOPE_FIELDS if self.ids[field]
+		]
+		self.q = None
+		for condition in conditions:
+			self.q = condition if self.q is None else self.q | condition
+
+	@property
+	def configured(self):
+		return self.q is not None
+
+	def allows(self, case):
+		"""True when ``case`` lies in one of the allowed locations.
+
+		Always true when unrestricted or when no location is configured, like ``filter``.
+		"""
+		if self.unrestricted or not self.configured:
+			return True
+		for field in SCOPE_FIELDS:
+			ref_id = getattr(case, f'{field}_ref_id')
+			if ref_id is not None:
+				if ref_id in self.ids[field]:
+					return True
+			elif normalize_location(getattr(case, field)) in self.names[field]:
+				return True
+		return False
+
+	def filter(self, queryset):
+		"""Limit a case listing to the scope; an SRO without configured locations sees all."""
+		if self.unrestricted or not self.configured:
+			return queryset
+		return queryset.filter(self.q)
+
+
+UNRESTRICTED = SroScope(unrestricted=True)
+
+
+def sro_scope(employee_id, employee_type, is_super_sro):
+	"""The compiled scope of one employee, from the cache when it is current."""
+	if employee_id is None or employee_type != Employee.SRO or is_super_sro:
+		return UNRESTRICTED
+	key = f'cases:sro-scope:v2:{sro_scope_generation()}:{employee_id}'
+	scope = cache.get(key)
+	if scope is None:
+		employee = Employee(pk=employee_id)
+		scope = SroScope(
+			states=employee.allowed_states.values_list('id', 'name'),
+			districts=employee.allowed_districts.values_list('id', 'name'),
+			tehsils=employee.allowed_tehsils.values_list('id', 'name'),
+		)
+		cache.set(key, scope, SCOPE_CACHE_SECONDS)
+	return scope
@@ -0,0 +1,241 @@
+"""Full-text case search backed by an SQLite FTS5 index.
+
+``cases_case_fts`` holds one row per case (rowid = case id) with the three searchable
+columns: applicant name, case number and legal reference number. A root case's row also
+carries ``family``, the same identifiers of all its child cases, so "this case or any of
+its children" is one lookup with no join or DISTINCT. The table uses the trigram
+tokenizer, so a query phrase matches any case whose fields contain it, case-insensitively,
+exactly like the ``icontains`` filters it replaces, including prefixes and the middle of
+LRN serials, but through the index instead of a full table scan. Rows are written from the
+Case save/delete signals (a child's change also rewrites its parent's row);
+``manage.py rebuild_case_search`` recreates the whole index.
+
+On other databases, when FTS5 is unavailable, or for queries shorter than a trigram, the
+same helpers fall back to the plain ORM filters.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case as CaseWhen, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from .caching import case_data_generation
+from .models import Case
+
+FTS_TABLE = 'cases_case_fts'
+# The trigram tokenizer cannot match anything shorter than this
+MIN_QUERY_LENGTH = 3
+AUTOCOMPLETE_LIMIT = 25
+
+SEARCH_FIELDS = ('applicant_name', 'case_number', 'legal_reference_number')
+# Joins the identifiers in the family column; queries never contain it, so a phrase cannot
+# match across two fields
+FAMILY_SEPARATOR = '\n'
+
+CREATE_SQL = (
+	f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+	"applicant_name, case_number, legal_reference_number, family, tokenize='trigram')"
+)
+
+_available = {}
+
+
+def fts_available():
+	"""True when the current database is SQLite and the FTS index table exists."""
+	if connection.vendor != 'sqlite':
+		return False
+	key = connection.settings_dict['NAME']
+	if key not in _available:
+		with connection.cursor() as cursor:
+			cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+			_available[key] = cursor.fetchone() is not None
+	return _available[key]
+
+
+def match_expression(query, include_children=False):
+	"""FTS5 MATCH string for ``query`` as one quoted phrase, or None when it cannot be used.
+
+	Without ``include_children`` the phrase is limited to the case's own columns.
+	"""
+	query = (query or '').strip()
+	if len(query) < MIN_QUERY_LENGTH or not fts_available():
+		return None
+	phrase = '"' + query.replace('"', '""') + '"'
+	if include_children:
+		return phrase
+	return '{' + ' '.join(SEARCH_FIELDS) + '} : ' + phrase
+
+
+def _orm_q(query):
+	return (
+		Q(applicant_name__icontains=query) |
+		Q(case_number__icontains=query) |
+		Q(legal_reference_number__icontains=query)
+	)
+
+
+def case_search_q(query, include_children=False):
+	"""Q matching cases whose name, case number or LRN contains ``query``.
+
+	With ``include_children`` a parent also matches when one of its child cases does; the
+	index answers that from the parent's family column. The ORM fallback finds the parents
+	through a subquery rather than a join, so callers never need ``distinct()``.
+	"""
+	match = match_expression(query, include_children=include_children)
+	if match:
+		return Q(id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]))
+	matched = _orm_q(query)
+	if include_children:
+		parents = Case.objects.filter(matched, parent_case__isnull=False).values('parent_case_id')
+		matched |= Q(id__in=parents)
+	return matched
+
+
+def _match_tier(query):
+	"""Rank of a row's best match: exact case/LRN number, case/LRN prefix, name prefix, other."""
+	return CaseWhen(
+		When(Q(case_number__iexact=query) | Q(legal_reference_number__iexact=query), then=Value(0)),
+		When(Q(case_number__istartswith=query) | Q(legal_reference_number__istartswith=query), then=Value(1)),
+		When(applicant_name__istartswith=query, then=Value(2)),
+		default=Value(3),
+		output_field=IntegerField(),
+	)
+
+
+def ranked_search(queryset, query):
+	"""Filter ``queryset`` by ``query`` and order it best match first, newest first within a tier.
+
+	The tiers are computed only for the rows the index matched. (BM25 is not used: a
+	trigram phrase scores nearly the same in every row, and a per-row bm25() subquery
+	re-runs the MATCH for each candidate.)
+	"""
+	return (
+		queryset.filter(case_search_q(query))
+		.annotate(match_tier=_match_tier(query))
+		.order_by('match_tier', '-created_at')
+	)
+
+
+def autocomplete_cache_seconds():
+	return getattr(settings, 'CASE_SEARCH_CACHE_SECONDS', 30)
+
+
+def autocomplete_cases(query, bank_id=None, branch_id=None, limit=AUTOCOMPLETE_LIMIT):
+	"""Top ``limit`` matches for partial input such as "SBI-2510" or "ramesh", cached briefly.
+
+	Returns dicts with ``id``, ``case_number``, ``applicant_name`` and ``bank_name``. Input
+	shorter than a trigram only matches field prefixes. Results are cached per normalized
+	query and filters for CASE_SEARCH_CACHE_SECONDS; the key includes the case data
+	generation, so a new or edited case shows up on the next keystroke.
+	"""
+	query = ' '.join((query or '').split())
+	digest = hashlib.md5(f'{query.lower()}|{bank_id or ""}|{branch_id or ""}|{limit}'.encode()).hexdigest()
+	key = f'cases:autocomplete:{case_data_generation()}:{digest}'
+	rows = cache.get(key)
+	if rows is not None:
+		return rows
+
+	queryset = Case.objects.all()
+	if bank_id:
+		queryset = queryset.filter(bank_id=bank_id)
+	if branch_id:
+		queryset = queryset.filter(branch_id=branch_id)
+	if not query:
+		queryset = queryset.order_by('-created_at')
+	elif len(query) < MIN_QUERY_LENGTH:
+		queryset = queryset.filter(
+			Q(case_number__istartswith=query) |
+			Q(legal_reference_number__istartswith=query) |
+			Q(applicant_name__istartswith=query)
+		).annotate(match_tier=_match_tier(query)).order_by('match_tier', '-created_at')
+	else:
+		queryset = ranked_search(queryset, query)
+	rows = [
+		{'id': row['id'], 'case_number': row['case_number'], 'applicant_name': row['applicant_name'], 'bank_name': row['bank__name']}
+		for row in queryset.values('id', 'case_number', 'applicant_name', 'bank__name')[:limit]
+	]
+	cache.set(key, rows, autocomplete_cache_seconds())
+	return rows
+
+
+def _family_text(case_pk):
+	rows = Case.objects.filter(parent_case_id=case_pk).order_by('id').values_list(*SEARCH_FIELDS)
+	return FAMILY_SEPARATOR.join(value or '' for row in rows for value in row)
+
+
+def _write_row(cursor, case_pk, values, family):
+	cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [case_pk])
+	cursor.execute(
+		f'INSERT INTO {FTS_TABLE} (rowid, applicant_name, case_number, legal_reference_number, family) '
+		'VALUES (%s, %s, %s, %s, %s)',
+		[case_pk, *(value or '' for value in values), family],
+	)
+
+
+def _reindex_parent(cursor, parent_pk):
+	values = Case.objects.filter(pk=parent_pk).values_list(*SEARCH_FIELDS).first()
+	if values is None:
+		# Parent deleted in the same cascade
+		cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [parent_pk])
+	else:
+		_write_row(cursor, parent_pk, values, _family_text(parent_pk))
+
+
+def index_case(case):
+	"""Write (or replace) the index row for one case, and its parent's family text.
+
+	Saves that leave the searchable fields and the parent untouched (status changes,
+	assignments) write nothing.
+	"""
+	if not fts_available():
+		return
+	loaded = getattr(case, '_loaded_values', None)
+	old_parent = loaded.get('parent_case_id') if loaded else None
+	# Deferred fields were not part of this save, so they cannot have changed
+	deferred = case.get_deferred_fields()
+	if loaded and old_parent == case.parent_case_id and all(
+		loaded.get(field) == getattr(case, field) for field in SEARCH_FIELDS if field not in deferred
+	):
+		return
+	values = [getattr(case, field) for field in SEARCH_FIELDS]
+	with connection.cursor() as cursor:
+		family = _family_text(case.pk) if case.parent_case_id is None else ''
+		_write_row(cursor, case.pk, values, family)
+		for parent_pk in {case.parent_case_id, old_parent} - {None}:
+			_reindex_parent(cursor, parent_pk)
+
+
+def unindex_case(case):
+	"""Drop a deleted case's row and remove it from its parent's family text."""
+	if not fts_available():
+		return
+	with connection.cursor() as cursor:
+		cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [case.pk])
+		if case.parent_case_id:
+			_reindex_parent(cursor, case.parent_case_id)
+
+
+def rebuild_index():
+	"""Recreate the index from the cases table; returns the number of rows indexed."""
+	if connection.vendor != 'sqlite':
+		return None
+	table = Case._meta.db_table
+	with connection.cursor() as cursor:
+		cursor.execute(CREATE_SQL)
+		cursor.execute(f'DELETE FROM {FTS_TABLE}')
+		cursor.execute(
+			f'INSERT INTO {FTS_TABLE} (rowid, applicant_name, case_number, legal_reference_number, family) '
+			"SELECT p.id, COALESCE(p.applicant_name, ''), COALESCE(p.case_number, ''), COALESCE(p.legal_reference_number, ''), "
+			"CASE WHEN p.parent_case_id IS NULL THEN COALESCE(("
+			"SELECT group_concat(COALESCE(c.applicant_name, '') || char(10) || COALESCE(c.case_number, '') || char(10) "
+			"|| COALESCE(c.legal_reference_number, ''), char(10)) "
+			f"FROM (SELECT * FROM {table} WHERE parent_case_id = p.id ORDER BY id) c), '') ELSE '' END "
+			f'FROM {table} p'
+		)
+		cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+		cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+		count = cursor.fetchone()[0]
+	_available[connection.settings_dict['NAME']] = True
+	return count
@@ -0,0 +1,150 @@
+"""Model signal handlers for the cases app (connected in CasesConfig.ready)."""
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from Bank.models import Bank, BankBranch
+from .models import Case, District, Employee, State, Tehsil
+from . import events, global_search, rollups, search
+from .caching import (
+	bump_case_data_generation, bump_location_generation, bump_role_generation, bump_sro_scope_generation,
+)
+from .locations import link_case_locations
+
+
+LOCATION_TEXT_FIELDS = ('state', 'district', 'tehsil')
+LOCATION_REF_FIELDS = ('state_ref', 'district_ref', 'tehsil_ref')
+
+
+@receiver(pre_save, sender=Case)
+def case_locations(sender, instance, raw=False, update_fields=None, **kwargs):
+	"""Keep state_ref/district_ref/tehsil_ref on the rows the location text names."""
+	if raw:
+		return
+	if update_fields is not None:
+		saved = {name[:-3] if name.endswith('_ref_id') else name for name in update_fields}
+		if not saved & set(LOCATION_TEXT_FIELDS):
+			return
+		if not saved >= set(LOCATION_REF_FIELDS):
+			# The refs would not be written; relink on this instance's next full save (or
+			# with backfill_case_locations --all) instead of letting them disagree silently
+			instance._location_refs_stale = True
+			return
+	loaded = getattr(instance, '_loaded_values', None)
+	# Deferred fields are not in __dict__ and cannot have changed
+	current = {field: instance.__dict__[field] for field in LOCATION_TEXT_FIELDS if field in instance.__dict__}
+	stale = instance.__dict__.pop('_location_refs_stale', False)
+	if loaded is not None and not stale and all(loaded.get(field) == value for field, value in current.items()):
+		return
+	if any(current.values()):
+		link_case_locations(instance)
+	else:
+		instance.state_ref_id = instance.district_ref_id = instance.tehsil_ref_id = None
+
+
+@receiver(post_save, sender=Case)
+def case_saved(sender, instance, created=False, raw=False, **kwargs):
+	if raw:
+		return
+	rollups.refresh_for_case(instance, created=created)
+	search.index_case(instance)
+	events.record_case_change(instance, created=created)
+	events.remember_saved_values(instance)
+	bump_case_data_generation()
+
+
+@receiver(post_delete, sender=Case)
+def case_deleted(sender, instance, **kwargs):
+	rollups.refresh_for_case(instance, deleted=True)
+	search.unindex_case(instance)
+	events.record_case_change(instance, deleted=True)
+	bump_case_data_generation()
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def employee_changed(sender, instance, raw=False, **kwargs):
+	# Dashboards show advocate names and active advocates
+	if raw:
+		return
+	bump_case_data_generation()
+	bump_role_generation()
+	# is_super_sro / employee_type decide whether a scope applies at all
+	bump_sro_scope_generation()
+
+
+@receiver(m2m_changed, sender=Employee.allowed_states.through)
+@receiver(m2m_changed, sender=Employee.allowed_districts.through)
+@receiver(m2m_changed, sender=Employee.allowed_tehsils.through)
+def sro_locations_changed(sender, action, **kwargs):
+	if action in ('post_add', 'post_remove', 'post_clear'):
+		bump_sro_scope_generation()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+	# Every login saves last_login alone; that cannot change a role
+	if raw or created or (update_fields and set(update_fields) <= {'last_login'}):
+		return
+	bump_role_generation()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, action, **kwargs):
+	if action in ('post_add', 'post_remove', 'post_clear'):
+		bump_role_generation()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, raw=False, **kwargs):
+	if not raw:
+		bump_role_generation()
+
+
+GLOBAL_SEARCH_KINDS = {
+	Bank: 'bank',
+	BankBranch: 'branch',
+	Employee: 'employee',
+	State: 'state',
+	District: 'district',
+	Tehsil: 'tehsil',
+}
+
+SCOPE_LOCATIONS = (State, District, Tehsil)
+# Dashboards list cases by bank and show bank and branch names
+DASHBOARD_BANK_MODELS = (Bank, BankBranch)
+
+
+@receiver(post_save, sender=Bank)
+@receiver(post_save, sender=BankBranch)
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=District)
+@receiver(post_save, sender=Tehsil)
+def searchable_saved(sender, instance, created=False, raw=False, **kwargs):
+	if raw:
+		return
+	global_search.index_object(GLOBAL_SEARCH_KINDS[sender], instance, created=created)
+	if sender in DASHBOARD_BANK_MODELS:
+		bump_case_data_generation()
+	if sender in SCOPE_LOCATIONS:
+		# The suggestion index lists every location; compiled SRO scopes only hold names
+		bump_location_generation()
+		if not created:
+			bump_sro_scope_generation()
+
+
+@receiver(post_delete, sender=Bank)
+@receiver(post_delete, sender=BankBranch)
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=State)
+@receiver(post_delete, sender=District)
+@receiver(post_delete, sender=Tehsil)
+def searchable_deleted(sender, instance, **kwargs):
+	global_search.unindex_object(GLOBAL_SEARCH_KINDS[sender], instance.pk)
+	if sender in DASHBOARD_BANK_MODELS:
+		bump_case_data_generation()
+	if sender in SCOPE_LOCATIONS:
+		bump_location_generation()
+		bump_sro_scope_generation()
@@ -1,5 +1,7 @@
 from django import template
 
+from cases.locations import location_bundle_url as _location_bundle_url
+
 register = template.Library()
 
 @register.filter
@@ -9,31 +11,7 @@ def dict_get(d, key):
         return d.get(key, 0)
     return 0
 
-@register.filter
-def count_by_status(cases, status):
-    """Count cases by status."""
-    return len([c for c in cases if c.status == status])
-
-@register.filter
-def count_by_advocate(cases, has_advocate=True):
-    """Count cases by whether they have an assigned advocate."""
-    if has_advocate:
-        return len([c for c in cases if c.assigned_advocate is not None])
-    else:
-        return len([c for c in cases if c.assigned_advocate is None])
-        
-@register.filter
-def filter_by_status(cases, status):
-    """Filter cases by status."""
-    return [c for c in cases if c.status == status]
-
-@register.filter
-def dictsortbykey(value, key):
-    """
-    Takes a list of dictionaries and returns that list sorted by the property given in the argument.
-    For cases, allows checking if any cases have a particular status.
-    """
-    if isinstance(value, list):
-        filtered_items = [item for item in value if hasattr(item, 'status') and item.status == key]
-        return filtered_items
-    return value
+@register.simple_tag
+def location_bundle_url():
+    """URL of the current State/District/Tehsil bundle (see cases.locations)."""
+    return _location_bundle_url()
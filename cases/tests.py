@@ -0,0 +1,391 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from Bank.models import Bank, BankBranch
+
+from .global_search import rebuild_global_index
+from .locations import location_bundle_url
+from .models import Case, CaseDailyStat, CaseType, District, Employee, State, Tehsil
+from .search import case_search_q, fts_available, ranked_search, rebuild_index
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'}})
+class CacheIsolatedTestCase(TestCase):
+    """TestCase on a private in-memory cache, emptied before every test.
+
+    The project cache is shared by every process on the host, so tests must neither
+    wipe it nor read users, roles or scopes another test (or the running site) left there.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+
+def create_employee(username, employee_id, name, employee_type='advocate', user=None, **fields):
+    """An Employee with its own login (``user`` when given, else a new User named ``username``)."""
+    return Employee.objects.create(
+        user=user or User.objects.create_user(username, password='pw'), name=name, employee_id=employee_id,
+        mobile='9999999999', email=f'{username}@example.com', employee_type=employee_type, **fields,
+    )
+
+
+class CaseRollupTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.bank = Bank.objects.create(name='Test Bank')
+        self.other_bank = Bank.objects.create(name='Other Bank')
+        self.case_type = CaseType.objects.create(name='LAP')
+
+    def rows(self):
+        return set(CaseDailyStat.objects.values_list('date', 'bank_id', 'status', 'new_cases', 'completed_cases'))
+
+    def test_rows_follow_create_status_change_and_delete(self):
+        today = timezone.localdate()
+        with self.captureOnCommitCallbacks(execute=True):
+            case = Case.objects.create(
+                applicant_name='Applicant', case_number='RU-1', bank=self.bank, case_type=self.case_type, status='pending',
+            )
+            Case.objects.create(
+                applicant_name='Other', case_number='RU-2', bank=self.other_bank, case_type=self.case_type, status='pending',
+            )
+        other = (today, self.other_bank.id, 'pending', 1, 0)
+        self.assertEqual(self.rows(), {(today, self.bank.id, 'pending', 1, 0), other})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            case.status, case.completed_at = 'positive', timezone.now()
+            case.save()
+        self.assertEqual(self.rows(), {(today, self.bank.id, 'positive', 1, 1), other})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            case.delete()
+        self.assertEqual(self.rows(), {other})
+
+    def test_saves_that_leave_rollup_fields_alone_skip_the_refresh(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            case = Case.objects.create(
+                applicant_name='Applicant', case_number='RU-1', bank=self.bank, case_type=self.case_type, status='pending',
+            )
+        CaseDailyStat.objects.all().delete()
+        case = Case.objects.get(pk=case.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            case.applicant_name = 'Renamed'
+            case.save()
+        self.assertEqual(self.rows(), set())
+        with self.captureOnCommitCallbacks(execute=True):
+            case.status = 'query'
+            case.save()
+        self.assertEqual(self.rows(), {(timezone.localdate(), self.bank.id, 'query', 1, 0)})
+
+
+class SroScopeTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        bank = Bank.objects.create(name='Test Bank')
+        case_type = CaseType.objects.create(name='LAP')
+        places = [('Rajasthan', 'Jaipur', 'Sanganer'), ('rajasthan ', 'Kota', 'Ladpura'), ('Uttar Pradesh', 'Agra', 'Etmadpur'), (None, None, None)]
+        self.cases = [
+            Case.objects.create(
+                applicant_name=f'Applicant {n}', case_number=f'SC-{n}', bank=bank, case_type=case_type,
+                status='positive_subject_tosearch', state=state, district=district, tehsil=tehsil,
+            )
+            for n, (state, district, tehsil) in enumerate(places)
+        ]
+        self.rajasthan = State.objects.create(name='Rajasthan')
+        self.agra = District.objects.create(state=State.objects.create(name='Uttar Pradesh'), name='Agra')
+        self.sro = create_employee('scoped-sro', 'SSRO', 'Scoped SRO', 'sro')
+        self.client.force_login(self.sro.user)
+
+    def allowed(self):
+        return [self.client.get(f'/cases/sro/update/{case.pk}/').status_code == 200 for case in self.cases]
+
+    def listed(self):
+        return sorted(case.pk for case in self.client.get('/cases/sro/').context['cases'])
+
+    def test_scope_checks_follow_location_changes(self):
+        ids = [case.pk for case in self.cases]
+        # Nothing configured: the dashboard lists every case and each one can be updated
+        self.assertEqual(self.allowed(), [True] * 4)
+        self.assertEqual(self.listed(), ids)
+        self.sro.allowed_states.add(self.rajasthan)
+        self.assertEqual(self.allowed(), [True, True, False, False])
+        self.assertEqual(self.listed(), ids[:2])
+        self.assertEqual(self.client.get(f'/cases/sro/update-group/{ids[2]}/').status_code, 404)
+        self.sro.allowed_districts.add(self.agra)
+        self.assertEqual(self.allowed(), [True, True, True, False])
+        self.rajasthan.name = 'Rajputana'
+        self.rajasthan.save()
+        self.assertEqual(self.listed(), ids[2:3])
+        self.sro.is_super_sro = True
+        self.sro.save()
+        self.assertEqual(self.allowed(), [True] * 4)
+
+    def test_compiled_scope_needs_no_location_queries(self):
+        self.sro.allowed_states.add(self.rajasthan)
+        self.allowed()
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.allowed(), [True, True, False, False])
+        self.assertFalse([q for q in ctx.captured_queries if 'allowed_' in q['sql']])
+
+
+class LocationSuggestTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        up = State.objects.create(name='Uttar Pradesh')
+        State.objects.create(name='Punjab')
+        self.agra = District.objects.create(state=up, name='Agra')
+        District.objects.create(state=up, name='Bagpat')
+        District.objects.create(state=State.objects.create(name='Bihar'), name='Agra Road')
+        for name in ('Etmadpur', 'Kheragarh', 'Agra Sadar'):
+            Tehsil.objects.create(district=self.agra, name=name)
+
+    def labels(self, url):
+        return [row['label'] for row in self.client.get(url).json()['results']]
+
+    def test_suggestions_are_ranked_capped_and_served_from_the_index(self):
+        self.assertEqual(self.labels('/cases/api/locations/districts/?q=agra'), ['Agra (Uttar Pradesh)', 'Agra Road (Bihar)'])
+        self.assertEqual(self.labels('/cases/api/locations/states/?q=p'), ['Punjab', 'Uttar Pradesh'])
+        self.assertEqual(self.labels('/cases/api/locations/districts/?q=ag'), ['Agra (Uttar Pradesh)', 'Agra Road (Bihar)', 'Bagpat (Uttar Pradesh)'])
+        with override_settings(LOCATION_SUGGEST_LIMIT=2), self.assertNumQueries(0):
+            self.assertEqual(len(self.labels('/cases/api/locations/tehsils/')), 2)
+            # A list narrowed to one district (or state) is returned whole
+            self.assertEqual(
+                self.labels('/cases/api/locations/tehsils/?state_name=uttar+pradesh&district_name=AGRA'),
+                ['Agra Sadar (Agra, Uttar Pradesh)', 'Etmadpur (Agra, Uttar Pradesh)', 'Kheragarh (Agra, Uttar Pradesh)'],
+            )
+            self.assertEqual(len(self.labels(f'/cases/api/locations/districts/?state={self.agra.state_id}')), 2)
+            self.assertEqual(len(self.labels('/cases/api/locations/districts/?limit=1')), 1)
+
+    def test_etag_changes_when_a_location_changes(self):
+        response = self.client.get('/cases/api/locations/states/')
+        self.assertIn('max-age=300', response['Cache-Control'])
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/cases/api/locations/states/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        State.objects.filter(name='Punjab').get().delete()
+        response = self.client.get('/cases/api/locations/states/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['label'] for row in response.json()['results']], ['Bihar', 'Uttar Pradesh'])
+
+    def test_location_bundle_is_content_hashed_and_cached_for_good(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(LOCATION_BUNDLE_DIR=directory):
+            url = location_bundle_url()
+            response = self.client.get(url)
+            self.assertIn('immutable', response['Cache-Control'])
+            tree = json.loads(b''.join(response.streaming_content))
+            self.assertEqual(tree['Uttar Pradesh'], {'Agra': ['Agra Sadar', 'Etmadpur', 'Kheragarh'], 'Bagpat': []})
+            self.assertEqual(tree['Punjab'], {})
+            # A save that changes nothing keeps the URL; a new tehsil gets a new one
+            self.agra.save()
+            self.assertEqual(location_bundle_url(), url)
+            Tehsil.objects.create(district=self.agra, name='Fatehabad')
+            new_url = location_bundle_url()
+            self.assertNotEqual(new_url, url)
+            self.assertIn('Fatehabad', self.client.get(new_url).getvalue().decode())
+            self.assertEqual(self.client.get(url).status_code, 200)  # pages rendered earlier keep working
+            self.assertEqual(self.client.get('/cases/api/locations/bundle/0123456789abcdef.json').status_code, 404)
+
+    def test_seed_locations_bulk_inserts_new_rows_and_reports_the_rest(self):
+        self.labels('/cases/api/locations/tehsils/')  # load the index before seeding
+        with tempfile.TemporaryDirectory() as directory:
+            with open(f'{directory}/districts.csv', 'w') as f:
+                f.write('state,district\nuttar pradesh,AGRA\nUttar Pradesh,Mathura\nAtlantis,Poseidonia\n,\n')
+            with open(f'{directory}/tehsils.csv', 'w') as f:
+                f.write('state,district,tehsil\nUttar Pradesh,Agra,etmadpur\nUttar Pradesh,Mathura,Chhata\nUttar Pradesh,Mathura,Chhata\n')
+            out = StringIO()
+            call_command('seed_locations', data_dir=directory, stdout=out)
+            self.assertIn('Districts: 1 inserted, 1 skipped (already present), 1 unknown parent, 1 blank row(s).', out.getvalue())
+            self.assertIn('Tehsils: 1 inserted, 2 skipped (already present), 0 unknown parent, 0 blank row(s).', out.getvalue())
+            self.assertEqual(self.labels('/cases/api/locations/tehsils/?q=chhata'), ['Chhata (Mathura, Uttar Pradesh)'])
+            # A second run only finds rows that are already there
+            out = StringIO()
+            call_command('seed_locations', data_dir=directory, stdout=out)
+            self.assertIn('Tehsils: 0 inserted, 3 skipped (already present), 0 unknown parent, 0 blank row(s).', out.getvalue())
+
+    def test_cases_link_to_location_rows_and_the_backfill_reports_the_rest(self):
+        bank = Bank.objects.create(name='Test Bank')
+        case_type = CaseType.objects.create(name='LAP')
+
+        def create(n, state, district, tehsil):
+            return Case.objects.create(
+                applicant_name=f'Applicant {n}', case_number=f'LOC-{n}', bank=bank, case_type=case_type,
+                state=state, district=district, tehsil=tehsil,
+            )
+
+        case = create(1, 'uttar pradesh ', 'Agra', 'Etmadpur')
+        self.assertEqual((case.state_ref.name, case.district_ref, case.tehsil_ref.name), ('Uttar Pradesh', self.agra, 'Etmadpur'))
+        case.tehsil = 'Kheragarh'
+        case.save()
+        self.assertEqual(Case.objects.get(pk=case.pk).tehsil_ref.name, 'Kheragarh')
+        others = [create(2, 'Utar Pradesh', 'agra', 'Agra-Sadar'), create(3, 'Uttar Pradesh', 'Agraa Cantt', 'X'), create(4, 'Atlantis', '', '')]
+        Case.objects.filter(pk__in=[c.pk for c in others]).update(state_ref=None, district_ref=None, tehsil_ref=None)
+        out = StringIO()
+        call_command('backfill_case_locations', stdout=out)
+        self.assertIn('Scanned 3 case(s): updated the links of 2, 2 with unmatched location text.', out.getvalue())
+        self.assertIn('district "Agraa Cantt": 1 case(s)', out.getvalue())
+        fuzzy = Case.objects.get(pk=others[0].pk)
+        self.assertEqual((fuzzy.state_ref.name, fuzzy.district_ref, fuzzy.tehsil_ref.name), ('Uttar Pradesh', self.agra, 'Agra Sadar'))
+
+    def test_saves_link_only_exact_names_and_never_leave_refs_unwritten(self):
+        bank = Bank.objects.create(name='Test Bank')
+        case_type = CaseType.objects.create(name='LAP')
+        case = Case.objects.create(
+            applicant_name='Applicant', case_number='LOC-1', bank=bank, case_type=case_type,
+            state='Uttar Pradesh', district='Agra', tehsil='Kheragarh',
+        )
+        # A close spelling is not a match on save (only the reviewed backfill accepts it)
+        case.tehsil = 'Kheragarhh'
+        case.save()
+        self.assertIsNone(Case.objects.get(pk=case.pk).tehsil_ref)
+        case.tehsil = 'kheragarh '
+        case.save()
+        self.assertEqual(Case.objects.get(pk=case.pk).tehsil_ref.name, 'Kheragarh')
+
+        # update_fields without the ref fields cannot write the refs, so they are left alone ...
+        case.district, case.tehsil = 'Bagpat', ''
+        case.save(update_fields=['district', 'tehsil'])
+        stored = Case.objects.get(pk=case.pk)
+        self.assertEqual((stored.district, stored.district_ref, stored.tehsil_ref.name), ('Bagpat', self.agra, 'Kheragarh'))
+        # ... until the next full save of the instance relinks them
+        case.save()
+        stored = Case.objects.get(pk=case.pk)
+        self.assertEqual((stored.district_ref.name, stored.tehsil_ref), ('Bagpat', None))
+        # Callers that pass the ref fields too get them written at once
+        case.district = 'Agra'
+        case.save(update_fields=['district', 'state_ref', 'district_ref', 'tehsil_ref'])
+        self.assertEqual(Case.objects.get(pk=case.pk).district_ref, self.agra)
+
+
+class CaseSearchIndexTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        bank = Bank.objects.create(name='Test Bank')
+        case_type = CaseType.objects.create(name='LAP')
+        names = ['Ram Kumar', 'Sita Devi', 'Kumari Ram', 'Mohan Lal']
+        cls.cases = [
+            Case.objects.create(
+                applicant_name=name, case_number=f'FT-{n:03d}', bank=bank, case_type=case_type,
+                legal_reference_number=f'NX-AP-OK-00{1700 + n}-25.26', status='pending',
+            )
+            for n, name in enumerate(names)
+        ]
+        cls.child = Case.objects.create(
+            applicant_name='Gopal Das', case_number='FT-000-2', bank=bank, case_type=case_type,
+            parent_case=cls.cases[3], status='pending',
+        )
+
+    def search(self, query, **kwargs):
+        return set(Case.objects.filter(case_search_q(query, **kwargs)).values_list('pk', flat=True))
+
+    def test_matches_the_icontains_filters(self):
+        self.assertTrue(fts_available())
+        for query in ['kumar', 'RAM', 'ram kumar', '1702', 'ok-0017', 'ft-000', 'nobody', 'Ra']:
+            expected = set(Case.objects.filter(
+                Q(applicant_name__icontains=query) | Q(case_number__icontains=query) |
+                Q(legal_reference_number__icontains=query)
+            ).values_list('pk', flat=True))
+            self.assertEqual(self.search(query), expected, query)
+
+    def test_children_match_their_parent(self):
+        self.assertEqual(self.search('gopal'), {self.child.pk})
+        self.assertEqual(self.search('gopal', include_children=True), {self.child.pk, self.cases[3].pk})
+        rebuild_index()
+        self.assertEqual(self.search('gopal', include_children=True), {self.child.pk, self.cases[3].pk})
+        self.assertEqual(self.search('gopal'), {self.child.pk})
+
+    def test_family_text_follows_child_changes(self):
+        parent = self.cases[3]
+        self.child.applicant_name = 'Hari Prasad'
+        self.child.save()
+        self.assertEqual(self.search('hari', include_children=True), {self.child.pk, parent.pk})
+        self.assertEqual(self.search('gopal', include_children=True), set())
+        self.child.parent_case = self.cases[0]
+        self.child.save()
+        self.assertEqual(self.search('hari', include_children=True), {self.child.pk, self.cases[0].pk})
+        self.child.delete()
+        self.assertEqual(self.search('hari', include_children=True), set())
+        self.assertEqual(rebuild_index(), Case.objects.count())
+
+    def test_index_follows_saves_and_deletes(self):
+        case = self.cases[1]
+        case.applicant_name = 'Sita Sharma'
+        case.save()
+        self.assertEqual(self.search('sharma'), {case.pk})
+        self.assertEqual(self.search('devi'), set())
+        case.delete()
+        self.assertEqual(self.search('sharma'), set())
+        self.assertEqual(rebuild_index(), Case.objects.count())
+        self.assertEqual(self.search('kumar'), {self.cases[0].pk, self.cases[2].pk})
+
+    def test_ranked_search_orders_by_match_tier(self):
+        ranked = list(ranked_search(Case.objects.all(), 'ft-000'))
+        self.assertEqual([c.pk for c in ranked], [self.cases[0].pk, self.child.pk])
+        self.assertEqual([c.match_tier for c in ranked], sorted(c.match_tier for c in ranked))
+
+    def test_case_picker_autocomplete(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        url = '/billing/api/case-search/'
+        response = self.client.get(url, {'q': 'ram'})
+        ids = [row['id'] for row in response.json()['results']]
+        # Applicant name prefix beats a match in the middle of the name
+        self.assertEqual(ids, [self.cases[0].pk, self.cases[2].pk])
+        # Input shorter than a trigram only matches prefixes
+        self.assertEqual([row['id'] for row in self.client.get(url, {'q': 'ku'}).json()['results']], [self.cases[2].pk])
+        with self.assertNumQueries(0):  # session, user and role all come from the cache
+            self.client.get(url, {'q': 'ram'})
+        Case.objects.create(
+            applicant_name='Ramesh', case_number='FT-900', bank=self.cases[0].bank,
+            case_type=self.cases[0].case_type, status='pending',
+        )
+        self.assertEqual(len(self.client.get(url, {'q': 'ram'}).json()['results']), 3)
+
+
+class GlobalSearchTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        cls.bank = Bank.objects.create(name='State Bank of India')
+        cls.branch = BankBranch.objects.create(bank=cls.bank, name='Connaught Place', branch_code='SBIN0001')
+        cls.employee = create_employee('rahul', 'ADV77', 'Rahul Verma', initials='RV')
+        state = State.objects.create(name='Rajasthan')
+        cls.district = District.objects.create(state=state, name='Jaipur')
+        cls.tehsil = Tehsil.objects.create(district=cls.district, name='Sanganer')
+        Case.objects.create(
+            applicant_name='Rahul Sharma', case_number='GS-001', bank=cls.bank,
+            case_type=CaseType.objects.create(name='LAP'), status='pending',
+        )
+
+    def search(self, q):
+        response = self.client.get('/cases/api/search/', {'q': q})
+        return {g['kind']: [(r['label'], r['detail']) for r in g['results']] for g in response.json()['groups']}
+
+    def test_grouped_results_from_the_index(self):
+        self.client.force_login(self.admin)
+        self.search('rahul')
+        with self.assertNumQueries(2):  # index and cases; session and user are cached
+            found = self.search('rahul')
+        self.assertEqual(found, {
+            'case': [('GS-001', 'Rahul Sharma')],
+            'employee': [('Rahul Verma', 'ADV77 · Advocate')],
+        })
+        self.assertEqual(self.search('sbin0001'), {'branch': [('Connaught Place', 'State Bank of India · SBIN0001')]})
+        self.assertEqual(self.search('RV'), {'employee': [('Rahul Verma', 'ADV77 · Advocate')]})
+
+    def test_index_follows_renames_and_deletes(self):
+        self.client.force_login(self.admin)
+        self.district.name = 'Jaipur Rural'
+        self.district.save()
+        self.assertEqual(self.search('sanganer'), {'tehsil': [('Sanganer', 'Jaipur Rural, Rajasthan')]})
+        self.branch.delete()
+        self.assertEqual(self.search('connaught'), {})
+        self.assertEqual(rebuild_global_index(), 5)
+        self.assertEqual(self.search('jaipur'), {'district': [('Jaipur Rural', 'Rajasthan')]})
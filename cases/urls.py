@@ -43,6 +43,9 @@ urlpatterns = [
     path('api/locations/states/', views.suggest_states, name='suggest_states'),
     path('api/locations/districts/', views.suggest_districts, name='suggest_districts'),
     path('api/locations/tehsils/', views.suggest_tehsils, name='suggest_tehsils'),
+    path('api/locations/bundle/<slug:digest>.json', views.location_bundle, name='location_bundle'),
+    path('api/search/', views.global_search_api, name='global_search_api'),
+    path('api/cases/grid/', views.case_grid_api, name='case_grid_api'),
     path('bank-detail/<int:pk>/', views.view_bank_detail, name='view_bank_detail'),
     path('edit-bank/<int:pk>/', views.edit_bank, name='edit_bank'),
     path('delete-bank/<int:pk>/', views.delete_bank, name='delete_bank'),
@@ -8,9 +8,11 @@ from datetime import timedelta
 from django.db.models import Count, Q
 from django.forms import modelformset_factory
 from collections import defaultdict
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, JsonResponse
 from django import forms
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import etag
 
 from .models import (
 	CaseType,
@@ -24,8 +26,16 @@ from .forms import (
 )
 from .decorators import (
 	admin_required, advocate_or_admin_required, sro_or_admin_required,
-	get_user_employee, check_case_access
+	get_user_employee
 )
+from .pagination import keyset_paginate
+from .queries import case_list, sro_eligible_cases
+from .grid import GridError, case_grid
+from .locations import (
+	BUNDLE_MAX_AGE, location_etag, location_index, open_location_bundle, suggest_max_age, suggestion_limit,
+)
+from .global_search import search_everything
+from .search import case_search_q
 
 # =========================
 # BANK CREATION
@@ -45,58 +55,85 @@ def search_banks(request):
 # =========================
 # LOCATION SUGGESTIONS (JSON)
 # =========================
+def _location_suggestions(request, kind, state_ids=None, district_ids=None):
+	narrowed = state_ids is not None or district_ids is not None
+	entries = location_index().suggest(
+		kind, request.GET.get('q') or '', state_ids=state_ids, district_ids=district_ids,
+		limit=suggestion_limit(request.GET, narrowed),
+	)
+	response = JsonResponse({'results': [{'id': e.id, 'label': e.label} for e in entries]})
+	patch_cache_control(response, public=True, max_age=suggest_max_age())
+	return response
+
+def location_bundle(request, digest):
+	"""The exported location tree (cases.locations); a new tree gets a new URL, so it is cached for good."""
+	bundle = open_location_bundle(digest)
+	if bundle is None:
+		raise Http404('Unknown location bundle')
+	response = FileResponse(bundle, content_type='application/json')
+	patch_cache_control(response, public=True, max_age=BUNDLE_MAX_AGE, immutable=True)
+	return response
+
+@etag(location_etag)
 def suggest_states(request):
-	q = (request.GET.get('q') or '').strip()
-	qs = State.objects.all()
-	if q:
-		qs = qs.filter(name__icontains=q)
-	data = [{'id': s.id, 'label': s.name} for s in qs.order_by('name')]
-	return JsonResponse({'results': data})
+	return _location_suggestions(request, 'state')
 
+@etag(location_etag)
 def suggest_districts(request):
-	q = (request.GET.get('q') or '').strip()
-	state_param = (request.GET.get('state') or '').strip()
-	state_name = (request.GET.get('state_name') or '').strip()
-	qs = District.objects.select_related('state').all()
-	# Filter by state id if numeric, otherwise by state name if provided
-	if state_param:
-		try:
-			qs = qs.filter(state_id=int(state_param))
-		except (TypeError, ValueError):
-			# Not an int; treat as state name
-			qs = qs.filter(state__name__iexact=state_param)
-	elif state_name:
-		qs = qs.filter(state__name__iexact=state_name)
-	if q:
-		qs = qs.filter(name__icontains=q)
-	data = [{'id': d.id, 'label': f"{d.name} ({d.state.name})"} for d in qs.order_by('name')]
-	return JsonResponse({'results': data})
+	index = location_index()
+	# State id if numeric, otherwise a state name
+	state = (request.GET.get('state') or request.GET.get('state_name') or '').strip()
+	state_ids = index.resolve('state', state) if state else None
+	return _location_suggestions(request, 'district', state_ids=state_ids)
 
+@etag(location_etag)
 def suggest_tehsils(request):
+	index = location_index()
+	district = (request.GET.get('district') or request.GET.get('district_name') or '').strip()
+	state = (request.GET.get('state') or request.GET.get('state_name') or '').strip()
+	if district:
+		return _location_suggestions(request, 'tehsil', district_ids=index.resolve('district', district))
+	state_ids = index.resolve('state', state) if state else None
+	return _location_suggestions(request, 'tehsil', state_ids=state_ids)
+
+# =========================
+# GLOBAL SEARCH (JSON)
+# =========================
+GLOBAL_SEARCH_GROUPS = [
+	('case', 'Cases', lambda r: reverse('case_detail', args=[r['id']])),
+	('bank', 'Banks', lambda r: reverse('Bank:bank_detail', args=[r['id']])),
+	('branch', 'Branches', lambda r: reverse('Bank:edit_bank_branch', args=[r['parent_id'], r['id']])),
+	('employee', 'Employees', lambda r: reverse('view_employee_detail', args=[r['id']])),
+	('state', 'States', lambda r: reverse('locations_state_edit', args=[r['id']])),
+	('district', 'Districts', lambda r: reverse('locations_district_edit', args=[r['id']])),
+	('tehsil', 'Tehsils', lambda r: reverse('locations_tehsil_edit', args=[r['id']])),
+]
+
+
+@admin_required
+def global_search_api(request):
+	"""Header search box: ranked matches grouped by kind, from the prebuilt search indexes."""
 	q = (request.GET.get('q') or '').strip()
-	district_param = (request.GET.get('district') or '').strip()
-	district_name = (request.GET.get('district_name') or '').strip()
-	state_param = (request.GET.get('state') or '').strip()
-	state_name = (request.GET.get('state_name') or '').strip()
-	qs = Tehsil.objects.select_related('district', 'district__state').all()
-	if district_param:
-		try:
-			qs = qs.filter(district_id=int(district_param))
-		except (TypeError, ValueError):
-			qs = qs.filter(district__name__iexact=district_param)
-	elif district_name:
-		qs = qs.filter(district__name__iexact=district_name)
-	elif state_param:
-		try:
-			qs = qs.filter(district__state_id=int(state_param))
-		except (TypeError, ValueError):
-			qs = qs.filter(district__state__name__iexact=state_param)
-	elif state_name:
-		qs = qs.filter(district__state__name__iexact=state_name)
-	if q:
-		qs = qs.filter(name__icontains=q)
-	data = [{'id': t.id, 'label': f"{t.name} ({t.district.name}, {t.district.state.name})"} for t in qs.order_by('name')]
-	return JsonResponse({'results': data})
+	found = search_everything(q)
+	groups = []
+	for kind, title, url in GLOBAL_SEARCH_GROUPS:
+		results = [
+			{'label': r['label'], 'detail': r['detail'], 'url': url(r)}
+			for r in found.get(kind, [])
+		]
+		if results:
+			groups.append({'kind': kind, 'title': title, 'results': results})
+	return JsonResponse({'ok': True, 'query': q, 'groups': groups})
+
+
+@advocate_or_admin_required
+def case_grid_api(request):
+	"""Case rows as JSON for incrementally loaded lists, scoped by Case.objects.visible_to (see cases.grid)."""
+	try:
+		payload = case_grid(request, Case.objects.visible_to(request.role))
+	except GridError as exc:
+		return JsonResponse({'ok': False, 'error': str(exc)}, status=400)
+	return JsonResponse(payload)
 
 # =========================
 # CASE MANAGEMENT
@@ -186,7 +223,7 @@ def create_case(request):
 @advocate_or_admin_required
 def view_cases(request):
 	employee = get_user_employee(request.user)
-	is_admin = request.user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists() or request.user.is_superuser
+	is_admin = request.role.is_admin
 
 	search_query = request.GET.get('search', '').strip()
 	completed_search = request.GET.get('completed_search', '').strip()
@@ -195,27 +232,14 @@ def view_cases(request):
 		cases_qs = Case.objects.select_related('bank', 'case_type', 'assigned_advocate').all()
 		if search_query:
 			# Search across all case fields
-			cases_qs = cases_qs.filter(
-				Q(applicant_name__icontains=search_query) |
-				Q(case_number__icontains=search_query) |
-				Q(legal_reference_number__icontains=search_query)
-			).distinct()
+			cases_qs = cases_qs.filter(case_search_q(search_query))
 		cases = cases_qs.order_by('-created_at')
-	elif employee and employee.employee_type == 'advocate':
+	elif request.role.is_advocate:
 		# Advocate view: show all assigned cases (parents and children). Include children whose parent is assigned to advocate.
-		qs = Case.objects.select_related('bank', 'case_type', 'assigned_advocate').filter(
-			Q(assigned_advocate=employee) | Q(parent_case__assigned_advocate=employee)
-		).order_by('-updated_at')
+		qs = Case.objects.visible_to(request.role).select_related('bank', 'case_type', 'assigned_advocate').order_by('-updated_at')
 		# Advocate search across their cases (including child fields)
 		if search_query:
-			qs = qs.filter(
-				Q(applicant_name__icontains=search_query) |
-				Q(case_number__icontains=search_query) |
-				Q(legal_reference_number__icontains=search_query) |
-				Q(child_cases__applicant_name__icontains=search_query) |
-				Q(child_cases__case_number__icontains=search_query) |
-				Q(child_cases__legal_reference_number__icontains=search_query)
-			).distinct()
+			qs = qs.filter(case_search_q(search_query, include_children=True))
 		active_statuses = ['pending','on_hold','on_query','query','document_pending','sro_document_pending']
 		# Remove deprecated on_hold/on_query from advocate buckets and keep Draft out of Pending
 		active_statuses = ['pending','query','document_pending','sro_document_pending']
@@ -230,15 +254,15 @@ def view_cases(request):
 		).exclude(status__in=['positive','positive_subject_tosearch','draft_positive_subject_tosearch','negative']).order_by('-reassigned_at')[:50]
 		# Build Pending Today/Overall and include reassigned (we will mark with a badge in UI)
 		reassigned_ids = list(reassigned_cases.values_list('id', flat=True))
-		pending_today = pending_all.filter(updated_at__date=today)
-		pending_overall = pending_all.exclude(id__in=pending_today.values('id'))
+		# Each tray is its own keyset page (today_after=/overall_after= cursors)
+		pending_total = pending_all.count()
+		pending_today = keyset_paginate(request, pending_all.filter(updated_at__date=today), prefix='today_')
+		pending_overall = keyset_paginate(request, pending_all.exclude(updated_at__date=today), prefix='overall_')
 		completed_results = []
 		# Keep completed-specific search for those who want to narrow to final statuses
 		if completed_search:
 			completed_results = qs.filter(status__in=completed_statuses).filter(
-				Q(applicant_name__icontains=completed_search) |
-				Q(case_number__icontains=completed_search) |
-				Q(legal_reference_number__icontains=completed_search)
+				case_search_q(completed_search)
 			).order_by('-updated_at')
 		# Keep cases for status counts, but primary rendering uses pending_today/pending_overall
 		cases = qs
@@ -260,48 +284,31 @@ def view_cases(request):
 
 	all_buckets = draft_buckets + quotation_buckets + pending_assignment_buckets + pending_buckets + active_buckets + completed_positive_buckets + completed_pss_buckets + completed_draft_pss_buckets + completed_negative_buckets
 	status_counts = {s: 0 for s in [b[1] for b in all_buckets]}
-	# For advocate view, derive counts from categorized querysets to avoid misclassifying drafts as pending
-	if not is_admin:
-		try:
-			# Pending count should reflect active pending statuses only
-			active_statuses = ['pending','query','document_pending','sro_document_pending']
-			status_counts['pending'] = cases.filter(status__in=['pending']).count()
-			status_counts['query'] = cases.filter(status='query').count()
-			status_counts['sro_document_pending'] = cases.filter(status='sro_document_pending').count()
-			status_counts['draft'] = cases.filter(status='draft').count()
-			status_counts['positive'] = cases.filter(status='positive').count()
-			status_counts['positive_subject_tosearch'] = cases.filter(status='positive_subject_tosearch').count()
-			status_counts['draft_positive_subject_tosearch'] = cases.filter(status='draft_positive_subject_tosearch').count()
-			status_counts['negative'] = cases.filter(status='negative').count()
-			# Quotation and pending_assignment if present
-			status_counts['quotation'] = cases.filter(status='quotation').count()
-			status_counts['pending_assignment'] = cases.filter(status='pending_assignment').count()
-		except Exception:
-			# Fallback to naive counts if anything goes wrong
-			for c in cases:
-				if c.status in status_counts:
-					status_counts[c.status] += 1
+	if is_admin:
+		# Admin view: count the listed cases plus their children, without materializing ids
+		listed_ids = cases.values('id')
+		counted = Case.objects.filter(Q(id__in=listed_ids) | Q(parent_case_id__in=listed_ids))
 	else:
-		# Admin view: count parent cases + their children for accurate totals
-		# Get all parent case IDs from the filtered set
-		parent_ids = list(cases.values_list('id', flat=True))
-		# Query all cases: parents in the filtered set + children of those parents
-		all_cases_qs = Case.objects.filter(Q(id__in=parent_ids) | Q(parent_case_id__in=parent_ids))
-		# Count by status
-		status_counts['pending'] = all_cases_qs.filter(status='pending').count()
-		status_counts['query'] = all_cases_qs.filter(status='query').count()
-		status_counts['sro_document_pending'] = all_cases_qs.filter(status='sro_document_pending').count()
-		status_counts['draft'] = all_cases_qs.filter(status='draft').count()
-		status_counts['positive'] = all_cases_qs.filter(status='positive').count()
-		status_counts['positive_subject_tosearch'] = all_cases_qs.filter(status='positive_subject_tosearch').count()
-		status_counts['draft_positive_subject_tosearch'] = all_cases_qs.filter(status='draft_positive_subject_tosearch').count()
-		status_counts['negative'] = all_cases_qs.filter(status='negative').count()
-		status_counts['quotation'] = all_cases_qs.filter(status='quotation').count()
-		status_counts['pending_assignment'] = all_cases_qs.filter(status='pending_assignment').count()
+		counted = cases
+	# One GROUP BY for every bucket
+	for row in counted.values('status').annotate(n=Count('id', distinct=True)).order_by():
+		if row['status'] in status_counts:
+			status_counts[row['status']] = row['n']
+
+	# Status counts cover the whole list; the columns render one keyset page of it
+	page = keyset_paginate(request, cases, field='created_at' if is_admin else 'updated_at')
+	# Group the page by status in one pass; each column renders only its own list
+	case_buckets = {status: [] for status in status_counts}
+	for case in page:
+		bucket = case_buckets.get(case.status)
+		if bucket is not None:
+			bucket.append(case)
 
 	# Build base context
 	context = {
-		'cases': cases,
+		'cases': page,
+		'page': page,
+		'case_buckets': case_buckets,
 		'quotation_buckets': quotation_buckets,
 		'pending_assignment_buckets': pending_assignment_buckets,
 		'pending_buckets': pending_buckets,
@@ -311,27 +318,25 @@ def view_cases(request):
 		'completed_pss_buckets': completed_pss_buckets,
 		'completed_draft_pss_buckets': completed_draft_pss_buckets,
 		'completed_negative_buckets': completed_negative_buckets,
-		# Include SRO document pending cases
-		# Admin: show all; Advocate: show only those assigned to them (parents or children)
-		'sro_document_pending_list': Case.objects.select_related('bank','case_type','assigned_advocate').filter(status='sro_document_pending').order_by('-updated_at'),
+		# SRO document pending cases: admins see the ones on this page of the list
+		'sro_document_pending_list': case_buckets['sro_document_pending'],
 		'status_counts': status_counts,
 		'is_admin': is_admin,
 		'search_query': search_query,
 	}
 	# Advocate-specific context additions
 	if not is_admin and employee and employee.employee_type == 'advocate':
-		debug_sro_ids = list(qs.filter(status='sro_document_pending').values_list('id', flat=True))
-		# Narrow SRO Document Pending to advocate's cases
+		# Narrow SRO Document Pending to advocate's cases, paged on its own (sro_after=)
 		# Use the advocate-scoped queryset to avoid any mismatch and ensure distinct results
-		context['sro_document_pending_list'] = qs.filter(status='sro_document_pending').order_by('-updated_at')
+		context['sro_document_pending_list'] = keyset_paginate(request, qs.filter(status='sro_document_pending'), prefix='sro_')
 		context.update({
+			'pending_total': pending_total,
 			'pending_today': pending_today,
 			'pending_overall': pending_overall,
 			'reassigned_cases': reassigned_cases,
 			'reassigned_ids': reassigned_ids,
 			'completed_results': completed_results,
 			'completed_search_query': completed_search,
-			'debug_sro_ids': debug_sro_ids,
 			'debug_advocate': getattr(employee, 'name', str(employee)),
 		})
 	return render(request, 'cases/view_cases.html', context)
@@ -340,7 +345,7 @@ def view_cases(request):
 @advocate_or_admin_required
 def advocate_cases_filtered(request, filter_type):
 	employee = get_user_employee(request.user)
-	is_admin = request.user.groups.filter(name__in=['ADMIN','CO-ADMIN']).exists() or request.user.is_superuser
+	is_admin = request.role.is_admin
 	# Only parent cases in filtered listings
 	# Admin: parent-only; Advocates: all their assigned cases
 	qs = Case.objects.all()
@@ -385,12 +390,14 @@ def advocate_cases_filtered(request, filter_type):
 
 	all_buckets = draft_buckets + quotation_buckets + pending_assignment_buckets + pending_buckets + active_buckets + completed_positive_buckets + completed_negative_buckets
 	status_counts = {s: 0 for s in [b[1] for b in all_buckets]}
-	for c in cases:
-		if c.status in status_counts:
-			status_counts[c.status] += 1
+	for row in cases.values('status').annotate(n=Count('id')).order_by():
+		if row['status'] in status_counts:
+			status_counts[row['status']] = row['n']
+	page = keyset_paginate(request, cases, field='updated_at')
 
 	context = {
-		'cases': cases,
+		'cases': page,
+		'page': page,
 		'list_title': title,
 		'quotation_buckets': quotation_buckets,
 		'pending_assignment_buckets': pending_assignment_buckets,
@@ -465,8 +472,18 @@ def view_pending_cases(request):
 	pending_cases = Case.objects.filter(
 		parent_case__isnull=True,
 		status__in=['pending_assignment', 'document_pending', 'sro_document_pending']
-	).select_related('bank','case_type','assigned_advocate').order_by('-created_at')
-	return render(request, 'cases/view_pending_cases.html', {'cases': pending_cases})
+	).select_related('bank','case_type','assigned_advocate')
+	counts = pending_cases.aggregate(
+		assigned=Count('id', filter=Q(assigned_advocate__isnull=False)),
+		unassigned=Count('id', filter=Q(assigned_advocate__isnull=True)),
+	)
+	page = keyset_paginate(request, pending_cases, field='created_at')
+	return render(request, 'cases/view_pending_cases.html', {
+		'cases': page,
+		'page': page,
+		'assigned_count': counts['assigned'],
+		'unassigned_count': counts['unassigned'],
+	})
 
 
 @admin_required
@@ -540,14 +557,11 @@ def reassign_case_advocate(request, case_id):
 
 @advocate_or_admin_required
 def case_detail(request, case_id):
-	case = get_object_or_404(Case, id=case_id)
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	# Child cases can now be viewed independently; no redirect
 	
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to view this case.")
-		return redirect('view_cases')
 	# Role flag for template logic (e.g., hiding receipt amount for employees)
-	is_admin = request.user.is_superuser or request.user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists()
+	is_admin = request.role.is_admin
 	
 	# Check if user is SRO
 	is_sro = False
@@ -640,32 +654,20 @@ def case_detail(request, case_id):
 
 def sro_case_detail(request, case_id):
 	"""SRO-specific case detail view with orange theme."""
-	case = get_object_or_404(Case, id=case_id)
-	
+	# Verify user is SRO or Admin
+	is_admin = request.role.is_admin
+	if not is_admin and not request.role.is_sro:
+		messages.error(request, "Access denied. This page is only for SRO users.")
+		return redirect('dashboard')
+
+	# SROs only see the cases in their allowed locations, as on the SRO dashboard
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
+
 	# If this is a child case, redirect to parent case detail
 	if case.parent_case:
 		messages.info(request, f"Viewing parent case. The requested case ({case.case_number}) is a linked property case shown below.")
 		return redirect('sro_case_detail', case_id=case.parent_case.id)
 	
-	# Verify user is SRO or Admin
-	is_admin = request.user.is_superuser or request.user.groups.filter(name__in=['ADMIN', 'CO-ADMIN']).exists()
-	
-	try:
-		employee = get_user_employee(request.user)
-		if not is_admin and (not employee or employee.employee_type != 'sro'):
-			messages.error(request, "Access denied. This page is only for SRO users.")
-			return redirect('dashboard')
-	except Exception:
-		if not is_admin:
-			messages.error(request, "Access denied.")
-			return redirect('dashboard')
-	
-	# Check if case is in SRO's allowed districts (skip for admins)
-	if not is_admin and case.district and employee and employee.allowed_districts.exists():
-		if not employee.allowed_districts.filter(id=case.district.id).exists():
-			messages.error(request, "You don't have permission to view this case (district restriction).")
-			return redirect('sro_dashboard')
-	
 	# Fetch all updates for this case
 	updates = CaseUpdate.objects.filter(case=case).order_by('update_date')
 	
@@ -714,14 +716,11 @@ def sro_case_detail(request, case_id):
 @advocate_or_admin_required
 def add_case_work(request, case_id):
 	"""Attach an additional work (case type) to a case with a required document upload."""
-	case = get_object_or_404(Case, id=case_id)
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	# Disallow adding new work if case is finalized
 	if hasattr(case, 'is_final_status') and case.is_final_status():
 		messages.error(request, 'This case is closed. New work cannot be added after finalization. You can still replace the final document.')
 		return redirect('case_detail', case_id=case.id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to edit this case.")
-		return redirect('view_cases')
 	if request.method == 'POST':
 		form = CaseWorkCreateForm(request.POST, request.FILES)
 		# Restrict selectable case types to those configured for this case's bank
@@ -744,7 +743,7 @@ def add_case_work(request, case_id):
 
 @advocate_or_admin_required
 def work_on_case(request, case_id):
-	case = get_object_or_404(Case, id=case_id)
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	
 	# Query and draft cases must be reopened before working on them
 	if case.status in ['query', 'draft']:
@@ -755,9 +754,6 @@ def work_on_case(request, case_id):
 	if hasattr(case, 'is_final_status') and case.is_final_status():
 		messages.error(request, 'Case is finalized. Details can no longer be edited. You may replace the final document if needed.')
 		return redirect('case_detail', case_id=case.id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to edit this case.")
-		return redirect('view_cases')
 
 	# Safety: if existing branch FK points to a non-existent BankBranch (from legacy data),
 	# clear it in-memory before binding the form to avoid FK violations on save.
@@ -922,16 +918,13 @@ def work_on_case(request, case_id):
 @advocate_or_admin_required
 def case_action(request, case_id):
 	"""Handle case action workflow including finalization, additional property creation, and document upload."""
-	case = get_object_or_404(Case, id=case_id)
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	# Allow actions on child cases (independent lifecycle)
 	
 	# Disallow taking action if the case is already finalized
 	if hasattr(case, 'is_final_status') and case.is_final_status():
 		messages.info(request, 'This case is already finalized. You can upload/replace the final document from the case page.')
 		return redirect('case_detail', case_id=case.id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to act on this case.")
-		return redirect('view_cases')
 
 	if request.method == 'POST':
 		form = CaseActionForm(request.POST, case=case)
@@ -1020,11 +1013,8 @@ def case_put_on_hold(request, case_id):
 @advocate_or_admin_required
 def case_upload_document(request, case_id):
 	"""Mandatory step after finalization to upload supporting document. Shows the LRN and enforces single-document policy."""
-	case = get_object_or_404(Case, id=case_id)
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to upload for this case.")
-		return redirect('view_cases')
 	# Allow upload after SRO receipt when returned to advocate
 	if case.status not in ['positive', 'positive_subject_tosearch', 'draft_positive_subject_tosearch', 'negative', 'document_pending', 'sro_document_pending']:
 		messages.info(request, 'Document upload is only required after SRO receipt or after finalizing the case.')
@@ -1074,10 +1064,7 @@ def case_upload_documents_group(request, case_id):
 	"""Upload required documents for a parent case and all its subcases in one page.
 	Each case requires an individual document; enforce single-document policy per case.
 	"""
-	parent = get_object_or_404(Case, id=case_id)
-	if not check_case_access(request.user, parent):
-		messages.error(request, "You don't have permission to upload for this case.")
-		return redirect('view_cases')
+	parent = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	# Only allow when parent is in a final status
 	if parent.status not in ['positive', 'positive_subject_tosearch', 'negative']:
 		messages.info(request, 'Group upload is only available after finalizing the parent case.')
@@ -1187,11 +1174,8 @@ class FinalizeWithDocumentForm(forms.Form):
 @advocate_or_admin_required
 def case_finalize_with_document(request, case_id):
 	"""Upload final document and set final status in one step when document is pending after SRO upload."""
-	case = get_object_or_404(Case, id=case_id)
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	# Only allow assigned advocate (or admin) to perform
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to update this case.")
-		return redirect('view_cases')
 	# Only when awaiting final doc
 	if case.status not in ['document_pending', 'sro_document_pending']:
 		messages.info(request, 'Final document can be uploaded only when the case is document pending.')
@@ -1268,10 +1252,7 @@ def case_finalize_with_document(request, case_id):
 def case_finalize_as_draft(request, case_id):
 	"""Upload a document and set status to Draft. Generates LRN if missing, does not mark completed_at.
 	Can be used multiple times; LRN is preserved once set."""
-	case = get_object_or_404(Case, id=case_id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to update this case.")
-		return redirect('view_cases')
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 
 	if request.method == 'POST':
 		form = FinalizeWithDocumentForm(request.POST, request.FILES)
@@ -1327,10 +1308,7 @@ def case_finalize_as_draft(request, case_id):
 def case_finalize_as_query(request, case_id):
 	"""Upload a document and set status to Query. Generates LRN if missing, does not mark completed_at.
 	Can be reopened later; LRN is preserved."""
-	case = get_object_or_404(Case, id=case_id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to update this case.")
-		return redirect('view_cases')
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 
 	if request.method == 'POST':
 		form = FinalizeWithDocumentForm(request.POST, request.FILES)
@@ -1389,10 +1367,7 @@ def case_finalize_as_query(request, case_id):
 @advocate_or_admin_required
 def case_reopen(request, case_id):
 	"""Allow advocate or admin to reopen a Draft or Query case back to Pending without changing LRN."""
-	case = get_object_or_404(Case, id=case_id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to update this case.")
-		return redirect('view_cases')
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	if case.status not in ['draft', 'query']:
 		messages.info(request, 'Only draft or query cases can be reopened.')
 		return redirect('case_detail', case_id=case.id)
@@ -1453,7 +1428,7 @@ def admin_change_case_status(request, case_id):
 
 @admin_required
 def delete_case(request, case_id):
-	case = get_object_or_404(Case, id=case_id)
+	case = get_object_or_404(case_list(related=('bank', 'parent_case')), id=case_id)
 	
 	# If trying to delete a child case, redirect to parent
 	if case.parent_case:
@@ -1471,10 +1446,7 @@ def delete_case(request, case_id):
 @advocate_or_admin_required
 def post_finalize_options(request, case_id):
 	"""After finalization and document upload, ask whether to add child cases one-by-one."""
-	case = get_object_or_404(Case, id=case_id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to view this case.")
-		return redirect('view_cases')
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	# Ensure parent has LRN
 	if not case.legal_reference_number:
 		case.generate_legal_reference_number(); case.save()
@@ -1490,15 +1462,12 @@ from .forms import ChildCaseForm
 @advocate_or_admin_required
 def add_child_case(request, case_id):
 	# Resolve to the top-level parent to avoid creating child-of-child
-	current = get_object_or_404(Case, id=case_id)
-	parent = current
-	while getattr(parent, 'parent_case_id', None):
-		parent = parent.parent_case
+	visible = Case.objects.visible_to(request.role)
+	parent = get_object_or_404(visible, id=case_id)
+	while parent.parent_case_id:
+		parent = get_object_or_404(visible, id=parent.parent_case_id)
 	# Allow adding child cases even if parent is finalized.
 	# This enables adding additional properties to be forwarded to SRO with the same final status.
-	if not check_case_access(request.user, parent):
-		messages.error(request, "You don't have permission to add a child case.")
-		return redirect('view_cases')
 	if request.method == 'POST':
 		form = ChildCaseForm(request.POST, request.FILES, parent_case=parent)
 		if form.is_valid():
@@ -1850,36 +1819,10 @@ def sro_dashboard(request):
 	"""
 	search = request.GET.get('search', '').strip()
 	# Independent listing: include parents and children; do not bind children to parent rows
-	eligible_statuses = ['positive_subject_tosearch', 'negative', 'positive']
-	qs = Case.objects.filter(
-		Q(forwarded_to_sro=True) | Q(status='positive_subject_tosearch'),
-		status__in=eligible_statuses
-	).select_related('bank','case_type','assigned_advocate').order_by('-updated_at')
-	# Apply SRO scoping
-	user_emp = getattr(request.user, 'employee', None)
-	if user_emp and user_emp.employee_type == Employee.SRO and not user_emp.is_super_sro:
-		state_names = list(user_emp.allowed_states.values_list('name', flat=True))
-		district_names = list(user_emp.allowed_districts.values_list('name', flat=True))
-		tehsil_names = list(user_emp.allowed_tehsils.values_list('name', flat=True))
-		conds = Q()
-		if state_names:
-			conds |= Q(state__in=state_names)
-		if district_names:
-			conds |= Q(district__in=district_names)
-		if tehsil_names:
-			conds |= Q(tehsil__in=tehsil_names)
-		# If no scopes are configured, allow all cases (do not zero out)
-		if conds:
-			qs = qs.filter(conds)
+	# Apply SRO scoping; if no scopes are configured, allow all cases (do not zero out)
+	qs = sro_eligible_cases().visible_to(request.role).order_by('-updated_at')
 	if search:
-		qs = qs.filter(
-			Q(applicant_name__icontains=search) |
-			Q(case_number__icontains=search) |
-			Q(legal_reference_number__icontains=search) |
-			Q(child_cases__applicant_name__icontains=search) |
-			Q(child_cases__case_number__icontains=search) |
-			Q(child_cases__legal_reference_number__icontains=search)
-		).distinct()
+		qs = qs.filter(case_search_q(search, include_children=True))
 	return render(request, 'cases/sro_dashboard.html', {
 		'cases': qs,
 		'search_query': search,
@@ -1889,18 +1832,8 @@ def sro_dashboard(request):
 @sro_or_admin_required
 def sro_update_case(request, case_id):
 	"""Allow SRO to upload receipt and mark case Positive (if appropriate)."""
-	case = get_object_or_404(Case, id=case_id)
-	# Enforce SRO scoping for non-super SROs
-	user_emp = getattr(request.user, 'employee', None)
-	if user_emp and user_emp.employee_type == Employee.SRO and not user_emp.is_super_sro:
-		allowed = (
-			user_emp.allowed_states.filter(name__iexact=case.state).exists() or
-			user_emp.allowed_districts.filter(name__iexact=case.district).exists() or
-			user_emp.allowed_tehsils.filter(name__iexact=case.tehsil).exists()
-		)
-		if not allowed:
-			messages.error(request, 'You do not have rights to update this case.')
-			return redirect('dashboard')
+	# Same scope as the SRO dashboard and case detail (non-super SROs: their locations)
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	# Eligibility: allow PSTS regardless of forwarded flag; for Positive/Negative require explicit forwarding
 	if case.status not in ['positive_subject_tosearch', 'negative', 'positive']:
 		messages.error(request, 'This case is not eligible for SRO update.')
@@ -1958,18 +1891,8 @@ def sro_update_group(request, case_id):
 	"""SRO uploads receipts for a parent case and all its child cases in one go.
 	After upload, set status=sro_document_pending and forwarded_to_sro=False for parent + children.
 	"""
-	parent = get_object_or_404(Case, id=case_id)
-	# Enforce SRO scoping for non-super SROs
-	user_emp = getattr(request.user, 'employee', None)
-	if user_emp and user_emp.employee_type == Employee.SRO and not user_emp.is_super_sro:
-		allowed = (
-			user_emp.allowed_states.filter(name__iexact=parent.state).exists() or
-			user_emp.allowed_districts.filter(name__iexact=parent.district).exists() or
-			user_emp.allowed_tehsils.filter(name__iexact=parent.tehsil).exists()
-		)
-		if not allowed:
-			messages.error(request, 'You do not have rights to update this case.')
-			return redirect('dashboard')
+	# Same scope as the SRO dashboard and case detail (non-super SROs: their locations)
+	parent = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	if not parent.forwarded_to_sro or parent.status not in ['positive_subject_tosearch', 'negative', 'positive']:
 		messages.error(request, 'This case is not eligible for SRO update.')
 		return redirect('dashboard')
@@ -2058,10 +1981,7 @@ def sro_update_group(request, case_id):
 @advocate_or_admin_required
 def case_add_document(request, case_id):
 	"""Upload one or more additional documents for a case. These are non-final and non-receipt."""
-	case = get_object_or_404(Case, id=case_id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to upload for this case.")
-		return redirect('view_cases')
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 
 	if request.method == 'POST':
 		files = request.FILES.getlist('documents')
@@ -2109,10 +2029,7 @@ def case_add_document(request, case_id):
 @advocate_or_admin_required
 def case_replace_final_document(request, case_id):
 	"""Replace the final document of a case."""
-	case = get_object_or_404(Case, id=case_id)
-	if not check_case_access(request.user, case):
-		messages.error(request, "You don't have permission to modify this case.")
-		return redirect('view_cases')
+	case = get_object_or_404(Case.objects.visible_to(request.role), id=case_id)
 	
 	# Get current final document
 	final_doc = case.documents.filter(is_final=True).first()
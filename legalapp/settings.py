@@ -37,6 +37,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.sessions.SessionRevocationMiddleware',
+    'cases.roles.RoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -81,6 +83,70 @@ DATABASES = {
 
 
 
+# Cache shared by all worker processes on the host (dashboard fragments are versioned
+# by a generation counter stored here, so it must not be per-process LocMem). It holds
+# the cached signed-in users, password hashes included, so it lives outside the project
+# tree (nothing deployed or backed up with the code picks it up) in a directory only
+# the app's own OS user can read.
+CACHE_DIR = os.environ.get(
+    "DJANGO_CACHE_DIR",
+    os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "legalapp"),
+)
+os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+os.chmod(CACHE_DIR, 0o700)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_DIR,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    }
+}
+
+# Upper bound on how long a dashboard fragment is reused. Case changes invalidate
+# immediately; this only limits how long date-based buckets can lag after midnight.
+DASHBOARD_CACHE_SECONDS = 600
+
+# Live dashboard counters (server-sent events, served under ASGI): how often an open
+# stream checks for case changes, and how long one stream lives before the browser
+# reconnects.
+DASHBOARD_SSE_POLL_SECONDS = 2
+DASHBOARD_SSE_MAX_SECONDS = 300
+
+# Session storage. "cached_db" (default) reads sessions from the cache and writes them
+# through to the database; "signed_cookies" keeps them in the browser only; "db" is the
+# plain database engine. Either of the first two keeps page views off django_session.
+# Logout and accounts.sessions.revoke_sessions work with all three.
+SESSION_MODE = os.environ.get("DJANGO_SESSION_MODE", "cached_db")
+SESSION_ENGINE = {
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+    "db": "django.contrib.sessions.backends.db",
+}[SESSION_MODE]
+# With signed cookies, logout clears the browser's cookie but a copied cookie stays valid
+# until it expires. Set this to also revoke the user's older sessions on logout; that
+# signs the user out on every device, not just the one logging out.
+LOGOUT_REVOKES_SIGNED_SESSIONS = False
+
+# The signed-in user is read from the cache; saving the user drops the cached copy.
+# ModelBackend stays listed because sessions created before CachedModelBackend name it as
+# their backend, and Django signs out any session whose backend is not listed here.
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+AUTH_USER_CACHE_SECONDS = 300
+
+# How long case picker autocomplete results are reused per typed prefix. Case changes
+# invalidate immediately; this just absorbs repeated keystrokes.
+CASE_SEARCH_CACHE_SECONDS = 30
+
+# Location suggestions (cases.locations): how many rows an unfiltered lookup returns, and
+# how long browsers reuse a response before revalidating its ETag.
+LOCATION_SUGGEST_LIMIT = 20
+LOCATION_SUGGEST_MAX_AGE = 300
+# Where the content-hashed location bundle for the case forms is written (export_locations)
+LOCATION_BUNDLE_DIR = os.environ.get("DJANGO_LOCATION_BUNDLE_DIR", str(BASE_DIR / ".location_bundle"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators